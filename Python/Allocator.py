@@ -0,0 +1,57 @@
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+COUNTER_WIDTH = 20
+
+
+@contextmanager
+def locked_file(path):
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass
+        yield fd
+    finally:
+        if fcntl is None:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        os.close(fd)
+
+
+class IdAllocator:
+    def __init__(self, counter_path):
+        self.counter_path = counter_path
+        self.lock = threading.Lock()
+
+    def _read(self, fd):
+        os.lseek(fd, 0, os.SEEK_SET)
+        try:
+            return int(os.read(fd, COUNTER_WIDTH) or 0)
+        except ValueError:
+            return 0
+
+    def _write(self, fd, number):
+        # A fixed-width value is rewritten in place, so the file never passes through empty.
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, f"{number:0{COUNTER_WIDTH}d}".encode('ascii'))
+        os.fsync(fd)
+
+    def allocate(self, floor=0):
+        with self.lock, locked_file(self.counter_path) as fd:
+            number = max(self._read(fd), floor) + 1
+            self._write(fd, number)
+        return number
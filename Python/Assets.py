@@ -0,0 +1,46 @@
+import os
+import customtkinter as ctk
+from PIL import Image
+from Metrics import metrics
+
+ICON_FILES = {
+    "logo": "Logo.png",
+    "banner": "Banner.png",
+    "home": "home.png",
+    "calendar": "calendar.png",
+    "add_doctor": "user-add.png",
+    "users": "users.png",
+    "add": "square-plus.png",
+    "completed": "check.png",
+    "cancelled": "cancel.png",
+    "pending": "add.png",
+    "booking": "latest.png",
+    "doctor": "doctor.png",
+    "adminAppointment": "admin appointment.png",
+    "adminPatients": "medical.png",
+    "adminCalendar": "admin calendar.png",
+    "navigationDoctor": "navigation doctor.png",
+    "income": "Income.png",
+    "dashDoctor": "first-aid-kit.png",
+    "verify": "checklist.png",
+    "xmark": "close.png",
+    "signup": "createAccount.png",
+}
+
+
+class IconRegistry:
+    def __init__(self, directory, files=ICON_FILES):
+        self.directory = directory
+        self.files = files
+        self.images = {}
+
+    def get(self, name, size=None):
+        key = (name, size)
+        if key not in self.images:
+            path = os.path.join(self.directory, self.files[name])
+            with metrics.timer("decode icon"), Image.open(path) as source:
+                source.load()
+                img = source if size is None or source.size == size else source.resize(size)
+                self.images[key] = ctk.CTkImage(img, size=size or img.size)
+            metrics.count("icons decoded")
+        return self.images[key]
@@ -0,0 +1,108 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+SLOT_HOURS = range(8, 23)
+SLOT_LABELS = [f"{hour % 12 or 12}:00 {'AM' if hour < 12 else 'PM'}" for hour in SLOT_HOURS]
+SLOT_INDEX = {label: i for i, label in enumerate(SLOT_LABELS)}
+FULL_MASK = (1 << len(SLOT_LABELS)) - 1
+MINUTES_PER_DAY = 24 * 60
+
+
+def slot_numbers(times):
+    return [SLOT_INDEX[label] for label in times if label in SLOT_INDEX]
+
+
+def slot_labels(mask):
+    return [label for i, label in enumerate(SLOT_LABELS) if mask & (1 << i)]
+
+
+def minute_stamp(moment):
+    return moment.date().toordinal() * MINUTES_PER_DAY + moment.hour * 60 + moment.minute
+
+
+def schedule_fields(day, times):
+    try:
+        ordinal = datetime.strptime(day, "%Y-%m-%d").date().toordinal()
+    except (TypeError, ValueError):
+        return {}
+
+    try:
+        minutes = [parsed.hour * 60 + parsed.minute for parsed in (datetime.strptime(t, "%I:%M %p") for t in times)]
+    except (TypeError, ValueError):
+        # Unreadable slots only expire once the whole day is over.
+        minutes = [MINUTES_PER_DAY]
+    # An appointment counts as done once its last slot has started.
+    return {
+        "day": ordinal,
+        "slots": slot_numbers(times),
+        "expires": ordinal * MINUTES_PER_DAY + max(minutes, default=0)
+    }
+
+
+def ensure_schedule(data):
+    if "expires" not in data:
+        data.update(schedule_fields(data.get("date", ""), data.get("time", [])))
+    return data
+
+
+def past_mask(day, now=None):
+    now = now or datetime.now()
+    today = now.date().isoformat()
+    if day < today:
+        return FULL_MASK
+    if day > today:
+        return 0
+
+    mask = 0
+    for i, hour in enumerate(SLOT_HOURS):
+        if hour < now.hour or (hour == now.hour and now.minute > 0):
+            mask |= 1 << i
+    return mask
+
+
+class AvailabilityIndex:
+    def __init__(self):
+        self.masks = defaultdict(dict)
+        self.counts = {}
+
+    def add(self, doctor, day, slots):
+        counts = self.counts.setdefault((doctor, day), [0] * len(SLOT_LABELS))
+        mask = self.masks[doctor].get(day, 0)
+        for slot in slots:
+            counts[slot] += 1
+            mask |= 1 << slot
+        self.masks[doctor][day] = mask
+
+    def remove(self, doctor, day, slots):
+        counts = self.counts.get((doctor, day))
+        if counts is None:
+            return
+        mask = self.masks[doctor].get(day, 0)
+        for slot in slots:
+            counts[slot] = max(0, counts[slot] - 1)
+            # Slots are refcounted so a double booking stays blocked after one cancel.
+            if counts[slot] == 0:
+                mask &= ~(1 << slot)
+
+        if mask:
+            self.masks[doctor][day] = mask
+        else:
+            self.masks[doctor].pop(day, None)
+            del self.counts[(doctor, day)]
+
+    def booked_mask(self, doctor, day):
+        return self.masks.get(doctor, {}).get(day, 0)
+
+    def free_slots(self, doctor, day, now=None):
+        return slot_labels(FULL_MASK & ~(self.booked_mask(doctor, day) | past_mask(day, now)))
+
+    def next_available(self, doctor, start, horizon=365, now=None):
+        now = now or datetime.now()
+        day = max(date.fromisoformat(start), now.date())
+        booked = self.masks.get(doctor, {})
+        for _ in range(horizon):
+            key = day.isoformat()
+            if (booked.get(key, 0) | past_mask(key, now)) != FULL_MASK:
+                return key
+            day += timedelta(days=1)
+        return None
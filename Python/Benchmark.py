@@ -0,0 +1,267 @@
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from PIL import Image
+import Thumbnails
+from Availability import SLOT_LABELS, ensure_schedule, schedule_fields
+from Journal import write_json
+from Search import DoctorIndex
+from Services import AppointmentService, DoctorService
+from Storage import open_storage
+from Thumbnails import CARD_SIZE, get_thumbnail
+
+SPECIALTIES = ["General Physician", "Gynecologist", "Dermatologist", "Pediatrician", "Neurologist", "Dentist"]
+PASSWORD = "password123"
+PAGE_SIZE = 20
+
+
+def password_hash(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def user_email(i):
+    return f"user{i}@example.com"
+
+
+def doctor_email(i):
+    return f"doctor{i}@example.com"
+
+
+def doctor_name(i):
+    return f"Dr. Synthetic {i}"
+
+
+def generate_data(base_dir, doctors, users, appointments, seed=0, portrait_size=(400, 400)):
+    rng = random.Random(seed)
+    hashed = password_hash(PASSWORD)
+    for name in ('Users', 'Admins', 'Doctors', 'Appointments'):
+        os.makedirs(os.path.join(base_dir, name), exist_ok=True)
+
+    write_json(os.path.join(base_dir, 'Admins', 'admin@example.com.json'), {
+        "Full Name": "Benchmark Admin", "Email": "admin@example.com", "Contact": "09000000000",
+        "Password": hashed, "Account Type": "Admin"})
+
+    for i in range(users):
+        write_json(os.path.join(base_dir, 'Users', f"{user_email(i)}.json"), {
+            "Full Name": f"User {i}", "Email": user_email(i), "Contact": f"09{i:09d}",
+            "Password": hashed, "Account Type": "User"})
+
+    for i in range(doctors):
+        folder = os.path.join(base_dir, 'Doctors', doctor_email(i))
+        os.makedirs(folder, exist_ok=True)
+        image_name = f"portrait{i}.png"
+        color = tuple(rng.randrange(256) for _ in range(3))
+        Image.new('RGB', portrait_size, color=color).save(os.path.join(folder, image_name))
+        write_json(os.path.join(folder, 'profile.json'), {
+            "Full Name": doctor_name(i), "Email": doctor_email(i), "Password": hashed,
+            "Experience": str(rng.randint(1, 40)), "Fee": str(rng.randrange(300, 3000, 50)),
+            "Specialty": SPECIALTIES[i % len(SPECIALTIES)], "Address": "N/A",
+            "About": f"Synthetic doctor {i} for benchmarking the dashboard.",
+            "Availability": rng.choice(["Available", "Available", "Unavailable"]), "Image": image_name})
+
+    today = date.today()
+    for i in range(1, appointments + 1):
+        day = today + timedelta(days=rng.randint(-180, 180))
+        start = rng.randrange(len(SLOT_LABELS) - 2)
+        if day < today:
+            # Some past bookings were never closed, so opening the dashboard has expiry work to do.
+            status = rng.choice(["Completed", "Completed", "Cancelled", "Ongoing"])
+        else:
+            status = rng.choice(["Ongoing", "Ongoing", "Ongoing", "Cancelled"])
+        data = {
+            "doctor": doctor_name(rng.randrange(doctors)) if doctors else "Unknown",
+            "user": user_email(rng.randrange(users)) if users else "Unknown",
+            "date": day.isoformat(),
+            "time": SLOT_LABELS[start:start + rng.randint(1, 3)],
+            "fee": str(rng.randrange(300, 3000, 50)),
+            "status": status,
+        }
+        write_json(os.path.join(base_dir, 'Appointments', f"appointment{i}.json"), ensure_schedule(data))
+
+
+def measure(func, repeat, calls=1, setup=None):
+    samples = []
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start)
+    return {
+        "calls": calls,
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "min_ms": round(min(samples) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+        "per_call_us": round(statistics.median(samples) / calls * 1e6, 3),
+    }
+
+
+def run_backend(backend, source_dir, params, repeat):
+    rng = random.Random(1)
+    results = {}
+    base_dir = tempfile.mkdtemp(prefix=f'bench-{backend}-')
+    try:
+        shutil.copytree(source_dir, base_dir, dirs_exist_ok=True)
+
+        start = time.perf_counter()
+        accounts, store = open_storage(backend, base_dir)
+        results["open_storage_first"] = {"calls": 1, "median_ms": round((time.perf_counter() - start) * 1000, 3)}
+        results["open_storage"] = measure(lambda: open_storage(backend, base_dir), repeat)
+        doctor_service = DoctorService(accounts, store, os.path.join(base_dir, 'Doctors'))
+        appointment_service = AppointmentService(store)
+
+        emails = [user_email(rng.randrange(max(params["users"], 1))) for _ in range(500)]
+        missing = [f"nobody{i}@example.com" for i in range(500)]
+        doctors = [doctor_name(rng.randrange(max(params["doctors"], 1))) for _ in range(500)]
+        days = [(date.today() + timedelta(days=rng.randint(-30, 60))).isoformat() for _ in range(500)]
+        hashed = password_hash(PASSWORD)
+
+        results["email_exists"] = measure(lambda: [accounts.email_exists(e) for e in emails + missing], repeat, 1000)
+
+        def verify_login():
+            for email in emails:
+                role, data = accounts.find_account(email)
+                assert data["Password"] == hashed
+        results["verify_login"] = measure(verify_login, repeat, len(emails))
+
+        records = [data for _, data in store.find()[:1000]]
+        results["schedule_fields"] = measure(
+            lambda: [schedule_fields(data.get("date"), data.get("time", [])) for data in records], repeat, len(records))
+
+        results["booked_mask"] = measure(
+            lambda: [store.booked_mask(d, day) for d, day in zip(doctors, days)], repeat, len(doctors))
+        results["next_available"] = measure(
+            lambda: [store.next_available(d, day) for d, day in zip(doctors[:100], days[:100])], repeat, 100)
+
+        statuses = ("Completed", "Cancelled", "Ongoing")
+        results["user_counters"] = measure(
+            lambda: [[store.count(user=e, status=s) for s in statuses] for e in emails[:100]], repeat, 100)
+        results["admin_counters"] = measure(
+            lambda: (accounts.count("Doctor"), accounts.count("User"), store.count(status="Ongoing")), repeat)
+        results["doctor_counters"] = measure(
+            lambda: [(store.sum_fees(doctor=d, status="Completed"),
+                      store.distinct_users(doctor=d, status=("Ongoing", "Completed")),
+                      store.count(doctor=d, status="Ongoing")) for d in doctors[:100]], repeat, 100)
+
+        results["user_bookings_page"] = measure(
+            lambda: [store.find(user=e, status="Ongoing", limit=PAGE_SIZE) for e in emails[:100]], repeat, 100)
+        results["admin_bookings_page"] = measure(
+            lambda: store.find(status="Ongoing", limit=PAGE_SIZE), repeat)
+        results["user_history"] = measure(lambda: [store.find(user=e) for e in emails[:100]], repeat, 100)
+        results["admin_history"] = measure(lambda: store.find(), repeat)
+
+        results["doctor_profiles"] = measure(accounts.doctor_profiles, repeat)
+        profiles = accounts.doctor_profiles()
+        results["doctor_index_build"] = measure(lambda: DoctorIndex(profiles), repeat)
+        index = DoctorIndex(profiles)
+        results["doctor_search"] = measure(
+            lambda: [index.search(q, fee=(500, 2000)) for q in ("syn", "dent", "doctor 1", "general")], repeat, 4)
+        results["compute_doctor_hash"] = measure(doctor_service.fingerprint, repeat)
+
+        images = [os.path.join(base_dir, 'Doctors', folder, profile["Image"]) for folder, profile in profiles]
+        Thumbnails._memory.clear()
+        results["thumbnails_cold"] = measure(lambda: [get_thumbnail(path, CARD_SIZE) for path in images], 1,
+                                             len(images))
+
+        def thumbnails_from_disk():
+            Thumbnails._memory.clear()
+            for path in images:
+                get_thumbnail(path, CARD_SIZE)
+        results["thumbnails_disk"] = measure(thumbnails_from_disk, repeat, len(images))
+
+        far = date.today() + timedelta(days=3650)
+
+        def book():
+            for i in range(50):
+                day = (far + timedelta(days=i // len(SLOT_LABELS))).isoformat()
+                appointment_service.book({"Full Name": "Dr. Benchmark", "Fee": "500"}, user_email(0), day,
+                                         [SLOT_LABELS[i % len(SLOT_LABELS)]])
+        results["book_appointment"] = measure(book, 1, 50)
+
+        # A sweep completes what it finds, so each repeat sweeps a fresh copy of the unswept tree.
+        sweep_dirs = []
+
+        def fresh_store():
+            sweep_dir = tempfile.mkdtemp(prefix=f'bench-{backend}-sweep-')
+            sweep_dirs.append(sweep_dir)
+            shutil.copytree(base_dir, sweep_dir, dirs_exist_ok=True)
+            return AppointmentService(open_storage(backend, sweep_dir)[1])
+
+        expired = []
+        results["expire_sweep"] = measure(lambda service: expired.append(len(service.sweep())), repeat,
+                                          setup=fresh_store)
+        results["expire_sweep"]["expired"] = expired[0]
+        for sweep_dir in sweep_dirs:
+            shutil.rmtree(sweep_dir, ignore_errors=True)
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the dashboard's data paths against a synthetic Data tree.")
+    parser.add_argument('--doctors', type=int, default=200)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--appointments', type=int, default=20000)
+    parser.add_argument('--backend', action='append', choices=('json', 'log', 'sqlite'),
+                        help="backend to measure; repeat for several (default: all)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark.json', help="where to write the JSON report")
+    parser.add_argument('--keep-data', help="also copy the generated Data tree here")
+    args = parser.parse_args()
+
+    params = {"doctors": args.doctors, "users": args.users, "appointments": args.appointments,
+              "repeat": args.repeat, "seed": args.seed}
+    source_dir = tempfile.mkdtemp(prefix='bench-data-')
+    try:
+        start = time.perf_counter()
+        generate_data(source_dir, args.doctors, args.users, args.appointments, args.seed)
+        print(f"Generated {args.doctors} doctors, {args.users} users and {args.appointments} appointments "
+              f"in {time.perf_counter() - start:.1f}s")
+        if args.keep_data:
+            shutil.copytree(source_dir, args.keep_data, dirs_exist_ok=True)
+
+        report = {
+            "created": datetime.now().isoformat(timespec='seconds'),
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "params": params,
+            "results": {},
+        }
+        for backend in args.backend or ['json', 'log', 'sqlite']:
+            results = run_backend(backend, source_dir, params, args.repeat)
+            report["results"][backend] = results
+            print(f"\n[{backend}]")
+            for name, result in results.items():
+                print(f"  {name:<22} {result['median_ms']:>10.3f} ms"
+                      + (f"  ({result['per_call_us']:.1f} us/call)" if result["calls"] > 1 else "")
+                      + (f"  ({result['expired']} expired)" if "expired" in result else ""))
+    finally:
+        shutil.rmtree(source_dir, ignore_errors=True)
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=4)
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
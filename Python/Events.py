@@ -0,0 +1,38 @@
+from collections import namedtuple
+
+BOOKED = "booked"
+CANCELLED = "cancelled"
+COMPLETED = "completed"
+STATUS_EVENTS = {"Cancelled": CANCELLED, "Completed": COMPLETED}
+
+AppointmentEvent = namedtuple('AppointmentEvent', ['kind', 'appointment_id', 'record'])
+
+
+class EventBus:
+    def __init__(self, dispatcher=None):
+        self.handlers = []
+        self.dispatcher = dispatcher
+
+    def subscribe(self, handler):
+        if handler not in self.handlers:
+            self.handlers.append(handler)
+
+    def unsubscribe(self, handler):
+        if handler in self.handlers:
+            self.handlers.remove(handler)
+
+    def clear(self):
+        self.handlers.clear()
+
+    def publish(self, event):
+        if self.dispatcher is not None:
+            self.dispatcher(self._deliver, event)
+        else:
+            self._deliver(event)
+
+    def _deliver(self, event):
+        for handler in list(self.handlers):
+            try:
+                handler(event)
+            except Exception as e:
+                print(f"Failed to handle {event.kind} event for {event.appointment_id}: {e}")
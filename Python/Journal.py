@@ -0,0 +1,181 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+
+def _fsync_dir(directory):
+    if os.name != 'posix':
+        return
+    fd = os.open(directory or '.', os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_temp(path, content):
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path
+
+
+def atomic_write(path, content):
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    tmp_path = _write_temp(path, content)
+    os.replace(tmp_path, path)
+    _fsync_dir(os.path.dirname(path))
+
+
+def write_json(path, data, indent=4):
+    atomic_write(path, json.dumps(data, indent=indent))
+
+
+def create_json(path, data, indent=4):
+    tmp_path = _write_temp(path, json.dumps(data, indent=indent).encode('utf-8'))
+    try:
+        # link() refuses to replace an existing file, unlike rename().
+        os.link(tmp_path, path)
+    finally:
+        os.remove(tmp_path)
+    _fsync_dir(os.path.dirname(path))
+
+
+def atomic_copy(src, path):
+    with open(src, 'rb') as f:
+        atomic_write(path, f.read())
+
+
+def _apply(ops):
+    for op in ops:
+        if op["op"] == "replace":
+            if os.path.exists(op["tmp"]):
+                os.replace(op["tmp"], op["path"])
+                _fsync_dir(os.path.dirname(op["path"]))
+        elif op["op"] == "remove":
+            if os.path.isdir(op["path"]):
+                shutil.rmtree(op["path"], ignore_errors=True)
+            elif os.path.exists(op["path"]):
+                os.remove(op["path"])
+
+
+def _discard(ops):
+    for op in ops:
+        if op["op"] == "replace" and os.path.exists(op["tmp"]):
+            os.remove(op["tmp"])
+
+
+class Transaction:
+    def __init__(self, journal):
+        self.journal = journal
+        self.id = uuid.uuid4().hex
+        self.contents = []
+        self.ops = []
+
+    def write_json(self, path, data, indent=4):
+        self._stage(path, json.dumps(data, indent=indent).encode('utf-8'))
+
+    def copy(self, src, path):
+        with open(src, 'rb') as f:
+            self._stage(path, f.read())
+
+    def remove(self, path):
+        self.ops.append({"op": "remove", "path": path})
+        self.contents.append(None)
+
+    def _stage(self, path, content):
+        tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{self.id}.tmp")
+        self.ops.append({"op": "replace", "tmp": tmp_path, "path": path})
+        self.contents.append(content)
+
+    def commit(self):
+        record = self.journal.record_path(self.id)
+        if record:
+            write_json(record, {"state": "prepared", "ops": self.ops}, indent=None)
+
+        try:
+            for op, content in zip(self.ops, self.contents):
+                if op["op"] == "replace":
+                    os.makedirs(os.path.dirname(op["tmp"]) or '.', exist_ok=True)
+                    with open(op["tmp"], 'wb') as f:
+                        f.write(content)
+                        f.flush()
+                        os.fsync(f.fileno())
+        except BaseException:
+            _discard(self.ops)
+            if record:
+                os.remove(record)
+            raise
+
+        # Once the committed record is on disk a crash is finished by recover().
+        if record:
+            write_json(record, {"state": "committed", "ops": self.ops}, indent=None)
+        _apply(self.ops)
+        if record:
+            os.remove(record)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        return False
+
+
+class WriteJournal:
+    def __init__(self, directory=None, grace=30):
+        self.directory = directory
+        self.grace = grace
+        self.lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def record_path(self, transaction_id):
+        if not self.directory:
+            return None
+        return os.path.join(self.directory, f"{transaction_id}.json")
+
+    def transaction(self):
+        return Transaction(self)
+
+    def recover(self):
+        if not self.directory:
+            return 0
+
+        recovered = 0
+        with self.lock:
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if not name.endswith('.json'):
+                    continue
+                # Another client may still be committing a very recent record.
+                if time.time() - os.path.getmtime(path) < self.grace:
+                    continue
+                try:
+                    with open(path, 'r') as f:
+                        record = json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    os.remove(path)
+                    continue
+
+                if record.get("state") == "committed":
+                    _apply(record["ops"])
+                else:
+                    _discard(record["ops"])
+                os.remove(path)
+                recovered += 1
+        return recovered
@@ -0,0 +1,74 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from Allocator import locked_file
+from Availability import SLOT_LABELS
+from Journal import write_json
+
+
+class SlotConflict(Exception):
+    def __init__(self, doctor, day, slots, holders=()):
+        self.doctor = doctor
+        self.day = day
+        self.slots = sorted(slots)
+        self.holders = sorted(set(holders))
+        times = ", ".join(SLOT_LABELS[slot] for slot in self.slots)
+        super().__init__(f"{doctor} is already booked on {day} at {times}.")
+
+
+class SlotReservations:
+    def __init__(self, directory, grace=30):
+        self.directory = directory
+        self.grace = grace
+        self.lock = threading.Lock()
+
+    def _paths(self, doctor, day):
+        key = hashlib.sha1((doctor or "").encode('utf-8')).hexdigest()[:16]
+        folder = os.path.join(self.directory, key)
+        os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, f"{day}.lock"), os.path.join(folder, f"{day}.json")
+
+    def _read(self, path):
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def reserve(self, doctor, day, slots, appointment_id, is_live):
+        lock_path, table_path = self._paths(doctor, day)
+        with self.lock, locked_file(lock_path):
+            table = self._read(table_path)
+            now = time.time()
+            taken = {}
+            for slot in slots:
+                holder = table.get(str(slot))
+                if holder is None or holder["id"] == appointment_id:
+                    continue
+                # A holder whose file never appeared crashed mid-booking; let the slot go.
+                live = is_live(holder["id"])
+                if live or (live is None and now - holder["at"] < self.grace):
+                    taken[slot] = holder["id"]
+
+            if taken:
+                raise SlotConflict(doctor, day, taken, taken.values())
+
+            for slot in slots:
+                table[str(slot)] = {"id": appointment_id, "at": now}
+            write_json(table_path, table, indent=None)
+
+    def release(self, doctor, day, slots, appointment_id):
+        lock_path, table_path = self._paths(doctor, day)
+        with self.lock, locked_file(lock_path):
+            table = self._read(table_path)
+            released = [str(slot) for slot in slots if table.get(str(slot), {}).get("id") == appointment_id]
+            if not released:
+                return
+            for slot in released:
+                del table[slot]
+            if table:
+                write_json(table_path, table, indent=None)
+            else:
+                os.remove(table_path)
@@ -0,0 +1,80 @@
+import bisect
+import re
+from collections import defaultdict
+
+WORD = re.compile(r"\w+")
+
+
+def parse_number(value):
+    match = re.search(r'\d+', str(value).replace(',', ''))
+    return int(match.group()) if match else None
+
+
+class DoctorIndex:
+    fields = ("Full Name", "Specialty", "About")
+
+    def __init__(self, doctors=()):
+        self.profiles = {}
+        self.texts = {}
+        self.tokens = defaultdict(set)
+        self.trigrams = defaultdict(set)
+        self.fees = []
+        self.experience = []
+        self.available = set()
+
+        for key, profile in doctors:
+            text = " ".join(str(profile.get(field, "")) for field in self.fields).lower()
+            self.profiles[key] = profile
+            self.texts[key] = text
+            for token in WORD.findall(text):
+                self.tokens[token].add(key)
+            for i in range(len(text) - 2):
+                self.trigrams[text[i:i + 3]].add(key)
+
+            fee = parse_number(profile.get("Fee", ""))
+            if fee is not None:
+                self.fees.append((fee, key))
+            years = parse_number(profile.get("Experience", ""))
+            if years is not None:
+                self.experience.append((years, key))
+            if str(profile.get("Availability", "")).lower() == "available":
+                self.available.add(key)
+
+        self.sorted_tokens = sorted(self.tokens)
+        self.fees.sort()
+        self.experience.sort()
+
+    def prefix(self, word):
+        keys = set()
+        i = bisect.bisect_left(self.sorted_tokens, word)
+        while i < len(self.sorted_tokens) and self.sorted_tokens[i].startswith(word):
+            keys |= self.tokens[self.sorted_tokens[i]]
+            i += 1
+        return keys
+
+    def substring(self, word):
+        grams = sorted((self.trigrams.get(word[i:i + 3], set()) for i in range(len(word) - 2)), key=len)
+        candidates = grams[0].intersection(*grams[1:])
+        return {key for key in candidates if word in self.texts[key]}
+
+    def in_range(self, values, low=None, high=None):
+        start = 0 if low is None else bisect.bisect_left(values, (low,))
+        end = len(values) if high is None else bisect.bisect_left(values, (high + 1,))
+        return {key for _, key in values[start:end]}
+
+    def search(self, query="", fee=(None, None), experience=(None, None), available_only=False):
+        keys = set(self.profiles)
+        for word in WORD.findall(query.lower()):
+            # One or two letters match word starts; longer terms match anywhere.
+            keys &= self.prefix(word) if len(word) < 3 else self.substring(word)
+            if not keys:
+                return []
+
+        if fee != (None, None):
+            keys &= self.in_range(self.fees, *fee)
+        if experience != (None, None):
+            keys &= self.in_range(self.experience, *experience)
+        if available_only:
+            keys &= self.available
+
+        return sorted(keys, key=lambda key: str(self.profiles[key].get("Full Name", "")).lower())
@@ -0,0 +1,268 @@
+import hashlib
+import os
+from datetime import datetime
+from Availability import past_mask, slot_numbers
+from Metrics import metrics
+from Search import DoctorIndex
+from Thumbnails import CARD_SIZE, generate_thumbnails, get_thumbnail
+
+ROLES = ("User", "Admin", "Doctor")
+DOCTOR_FIELDS = ("Full Name", "Email", "Password", "Experience", "Fee", "Specialty", "Address", "About")
+WEAK_PASSWORD = "Password must include at least one uppercase letter, one number, and one special character."
+
+
+class ServiceError(Exception):
+    title = "Error"
+
+    def __init__(self, message, title=None):
+        super().__init__(message)
+        if title:
+            self.title = title
+
+
+class InvalidInput(ServiceError):
+    title = "Input Error"
+
+
+class DuplicateAccount(ServiceError):
+    title = "Duplicate"
+
+
+class AccountNotFound(ServiceError):
+    title = "Account Not Found"
+
+
+class WrongPassword(ServiceError):
+    title = "Login Failed"
+
+
+def hash_password(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def check_password(stored_hash, entered_password):
+    return stored_hash == hash_password(entered_password)
+
+
+def is_strong_password(password):
+    return (
+        any(c.isupper() for c in password) and
+        any(c.isdigit() for c in password) and
+        any(c in "!@#$%^&*()-_=+[]{};:,<.>/?\\" for c in password)
+    )
+
+
+def is_valid_email(email):
+    return "@" in email and "." in email
+
+
+def is_bookable(profile):
+    return str(profile.get("Availability", "Unknown")).lower() != "unavailable"
+
+
+class AccountService:
+    def __init__(self, accounts):
+        self.accounts = accounts
+
+    def signup(self, name, email, contact, password, role):
+        email = email.lower()
+        if not all([name, email, contact, password, role]):
+            raise InvalidInput("All fields are required.")
+        if not is_valid_email(email):
+            raise InvalidInput("Please enter a valid email address.", "Invalid Email")
+        if not is_strong_password(password):
+            raise InvalidInput(WEAK_PASSWORD, "Weak Password")
+        if self.accounts.email_exists(email):
+            raise DuplicateAccount("This email is already registered, Please use another one.")
+        if role not in ROLES:
+            raise InvalidInput("Unknown account type.", "Role Error")
+
+        account_data = {
+            "Full Name": name,
+            "Email": email,
+            "Contact": contact,
+            "Password": hash_password(password),
+            "Account Type": role
+        }
+        try:
+            self.accounts.save_account(role, account_data)
+        except FileExistsError:
+            raise DuplicateAccount("This email is already registered, Please use another one.")
+        return account_data
+
+    def login(self, email, password):
+        email = email.lower()
+        if not all([email, password]):
+            raise InvalidInput("Both fields are required.")
+
+        account = self.accounts.find_account(email)
+        if account is None:
+            raise AccountNotFound("Email not found. Would you like to register?")
+        role, data = account
+        if not check_password(data["Password"], password):
+            raise WrongPassword("Incorrect password.")
+        return role, data
+
+    def count(self, role):
+        return self.accounts.count(role)
+
+
+class DoctorService:
+    def __init__(self, accounts, appointments, doctor_dir):
+        self.accounts = accounts
+        self.appointments = appointments
+        self.doctor_dir = doctor_dir
+
+    def add(self, fields, image_path=None):
+        fields = {key: fields.get(key, "").strip() for key in DOCTOR_FIELDS}
+        email = fields["Email"].lower()
+        if not all(fields.values()):
+            raise InvalidInput("All fields are required.")
+        if not is_valid_email(email):
+            raise InvalidInput("Enter a valid email.", "Invalid Email")
+        if not is_strong_password(fields["Password"]):
+            raise InvalidInput(WEAK_PASSWORD, "Weak Password")
+        if self.accounts.find_doctor(name=fields["Full Name"], email=email) is not None:
+            raise DuplicateAccount("This name or email is already registered.")
+
+        doctor_data = dict(fields, Email=email, Password=hash_password(fields["Password"]),
+                           Availability="Available", Image=os.path.basename(image_path) if image_path else "")
+        self.accounts.save_doctor(email, doctor_data, [image_path] if image_path else ())
+        if not image_path:
+            return False, None
+
+        # The profile is saved either way; a bad image only costs the thumbnails.
+        try:
+            generate_thumbnails(os.path.join(self.doctor_dir, email, os.path.basename(image_path)))
+        except Exception as e:
+            return True, e
+        return True, None
+
+    @metrics.timed()
+    def fingerprint(self):
+        stamps = self.accounts.doctor_stamps()
+        fingerprint = "".join(f"{folder}:{stamps[folder]};" for folder in sorted(stamps))
+        return hashlib.md5(fingerprint.encode()).hexdigest(), stamps
+
+    def find_image(self, folder):
+        folder_path = os.path.join(self.doctor_dir, folder)
+        if not os.path.isdir(folder_path):
+            return None
+        metrics.count("directories listed")
+        return next((os.path.join(folder_path, f) for f in os.listdir(folder_path)
+                     if f.lower().endswith(('.png', '.jpg', '.jpeg', '.gif'))), None)
+
+    @metrics.timed()
+    def read_cards(self, previous_stamps, force_refresh):
+        current_hash, stamps = self.fingerprint()
+
+        if force_refresh:
+            dirty = set(stamps)
+        else:
+            dirty = {folder for folder, stamp in stamps.items() if previous_stamps.get(folder) != stamp}
+
+        updates = {folder: (None, None) for folder in dirty}
+        for folder, profile in self.accounts.doctor_profiles(dirty):
+            updates[folder] = (profile, get_thumbnail(self.find_image(folder), CARD_SIZE))
+        return current_hash, stamps, updates
+
+    @metrics.timed()
+    def read_directory(self):
+        doctors = []
+        for folder, profile in self.accounts.doctor_profiles():
+            img_path = self.find_image(folder)
+            doctors.append((folder, profile, img_path, get_thumbnail(img_path, CARD_SIZE)))
+        # Unavailable doctors are hidden from the tabs, so search must not surface them either.
+        return doctors, DoctorIndex((folder, profile) for folder, profile, _, _ in doctors if is_bookable(profile))
+
+    def set_availability(self, folders, status):
+        profiles = self.accounts.doctor_profiles(folders)
+        for folder, data in profiles:
+            data['Availability'] = status
+        self.accounts.save_doctors(profiles)
+
+    def removal_candidates(self, folders):
+        candidates = []
+        blocked_doctors = []
+
+        for folder, profile in self.accounts.doctor_profiles(folders):
+            doctor_full_name = profile.get("Full Name")
+            if not doctor_full_name:
+                continue
+
+            if self.appointments.count(doctor=doctor_full_name, status="Ongoing"):
+                if doctor_full_name not in blocked_doctors:
+                    blocked_doctors.append(doctor_full_name)
+                continue
+
+            candidates.append((folder, doctor_full_name))
+
+        return candidates, blocked_doctors
+
+    def remove(self, folders):
+        self.accounts.remove_doctors(folders)
+
+
+class AppointmentService:
+    def __init__(self, store):
+        self.store = store
+
+    def blocked_slots(self, doctor, day, now=None):
+        return self.store.booked_mask(doctor, day) | past_mask(day, now)
+
+    def next_available(self, doctor, day, now=None):
+        return self.store.next_available(doctor, day, now)
+
+    def book(self, profile, user, day, times, now=None):
+        if not times:
+            raise InvalidInput("Please select a time slot.", "No Time")
+        now = now or datetime.now()
+        if day < now.date().isoformat():
+            raise InvalidInput("You cannot select a past date.", "Invalid Date")
+        if any(past_mask(day, now) & (1 << slot) for slot in slot_numbers(times)):
+            raise InvalidInput("That time has already passed today.", "Invalid Time")
+
+        return self.store.add({
+            "doctor": profile.get("Full Name", "Unknown"),
+            "user": user,
+            "date": day,
+            "time": list(times),
+            "fee": profile.get('Fee', 'Not Available'),
+            "status": "Ongoing"
+        })
+
+    def cancel(self, appointment_id):
+        self.store.set_status(appointment_id, "Cancelled")
+
+    def complete(self, appointment_id):
+        self.store.set_status(appointment_id, "Completed")
+
+    def sweep(self, now=None):
+        return self.store.expire(now or datetime.now())
+
+    def refresh(self):
+        return self.store.refresh()
+
+    def history(self, doctor=None, user=None):
+        return self.store.find(doctor=doctor, user=user)
+
+    def ongoing_page(self, after=None, limit=None, doctor=None, user=None):
+        return self.store.find(doctor=doctor, user=user, status="Ongoing", after=after, limit=limit)
+
+    def ongoing_count(self):
+        return self.store.count(status="Ongoing")
+
+    @metrics.timed()
+    def user_counts(self, email):
+        return [self.store.count(user=email, status=status) for status in ("Completed", "Cancelled", "Ongoing")]
+
+    @metrics.timed()
+    def doctor_totals(self, name):
+        return (self.store.sum_fees(doctor=name, status="Completed"),
+                self.store.distinct_users(doctor=name, status=("Ongoing", "Completed")),
+                self.store.count(doctor=name, status="Ongoing"))
+
+
+def open_services(accounts, appointment_store, doctor_dir):
+    return (AccountService(accounts), DoctorService(accounts, appointment_store, doctor_dir),
+            AppointmentService(appointment_store))
@@ -0,0 +1,1256 @@
+import bisect
+import functools
+import json
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import zlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from Allocator import IdAllocator, locked_file
+from Availability import AvailabilityIndex, ensure_schedule, minute_stamp, slot_numbers
+from Events import BOOKED, COMPLETED, STATUS_EVENTS, AppointmentEvent
+from Journal import WriteJournal, atomic_copy, atomic_write, create_json, write_json
+from Metrics import metrics
+from Reservations import SlotConflict, SlotReservations
+
+
+def synchronized(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class StatusConflict(Exception):
+    def __init__(self, appointment_id, status):
+        self.appointment_id = appointment_id
+        self.status = status
+        super().__init__(f"This appointment is already {(status or 'removed').lower()}.")
+
+
+def appointment_number(appointment_id):
+    match = re.match(r'appointment(\d+)', appointment_id)
+    return int(match.group(1)) if match else 0
+
+
+def appointment_sort_key(appointment_id):
+    stem, _, item = appointment_id.partition(':')
+    return appointment_number(stem), int(item or 0)
+
+
+READ_THREADS = 8
+
+
+def _read_bytes(path):
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError as e:
+        return e
+
+
+def _parse_json(raw):
+    if isinstance(raw, Exception):
+        return raw
+    try:
+        return json.loads(raw)
+    except ValueError as e:
+        return e
+
+
+def load_json_files(paths, threads=READ_THREADS):
+    paths = list(paths)
+    if not paths:
+        return {}
+
+    with metrics.timer("read json files"), ThreadPoolExecutor(max_workers=min(threads, len(paths))) as pool:
+        blobs = list(pool.map(_read_bytes, paths))
+    metrics.count("files read", len(paths))
+    metrics.count("bytes parsed", sum(len(raw) for raw in blobs if isinstance(raw, bytes)))
+
+    with metrics.timer("parse json files"):
+        parsed = [_parse_json(raw) for raw in blobs]
+
+    records = {}
+    for path, data in zip(paths, parsed):
+        if isinstance(data, FileNotFoundError):
+            continue
+        if isinstance(data, Exception):
+            print(f"Failed to read {os.path.basename(path)}: {data}")
+        else:
+            records[path] = data
+    return records
+
+
+class JsonDirectoryBackend:
+    def __init__(self, appointment_dir, journal=None):
+        self.appointment_dir = appointment_dir
+        self.journal = journal or WriteJournal()
+        self.lock_path = os.path.join(os.path.dirname(os.path.abspath(appointment_dir)), 'appointments.lock')
+        self.last_number = 0
+        self.dir_stamp = None
+        self.stamps = {}
+
+    def _scan(self):
+        # Every write is a rename, so a new inode marks a changed file.
+        stamps = {}
+        with os.scandir(self.appointment_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    stamps[entry.name] = (entry.inode(), stat.st_mtime_ns, stat.st_size)
+        metrics.count("directories listed")
+        return stamps
+
+    def _read(self, files):
+        records = {}
+        for file in files:
+            self.last_number = max(self.last_number, appointment_number(file[:-len('.json')]))
+
+        paths = [os.path.join(self.appointment_dir, f) for f in sorted(files)]
+        for path, data in load_json_files(paths).items():
+            stem = os.path.basename(path)[:-len('.json')]
+            if isinstance(data, list):
+                for i, item in enumerate(data):
+                    if isinstance(item, dict):
+                        records[f"{stem}:{i}"] = item
+            elif isinstance(data, dict):
+                records[stem] = data
+        return records
+
+    def load_all(self):
+        self.last_number = 0
+        self.dir_stamp = os.stat(self.appointment_dir).st_mtime_ns
+        self.stamps = self._scan()
+        return self._read(self.stamps)
+
+    def load_changes(self):
+        dir_stamp = os.stat(self.appointment_dir).st_mtime_ns
+        if dir_stamp == self.dir_stamp:
+            return {}
+        self.dir_stamp = dir_stamp
+
+        stamps = self._scan()
+        changed = [f for f, stamp in stamps.items() if self.stamps.get(f) != stamp]
+        removed = [f for f in self.stamps if f not in stamps]
+        self.stamps = stamps
+
+        records = {f[:-len('.json')]: None for f in removed}
+        records.update(self._read(changed))
+        return records
+
+    def _file_contents(self, items):
+        files = {}
+        for appointment_id, data in items:
+            stem, _, item = appointment_id.partition(':')
+            file_path = os.path.join(self.appointment_dir, f"{stem}.json")
+            if item:
+                if file_path not in files:
+                    with open(file_path, 'r') as f:
+                        files[file_path] = json.load(f)
+                files[file_path][int(item)] = data
+            else:
+                files[file_path] = data
+        return files
+
+    def put(self, appointment_id, data):
+        for file_path, content in self._file_contents([(appointment_id, data)]).items():
+            write_json(file_path, content)
+
+    def create(self, appointment_id, data):
+        create_json(os.path.join(self.appointment_dir, f"{appointment_id}.json"), data)
+
+    def load(self, appointment_id):
+        stem, _, item = appointment_id.partition(':')
+        path = os.path.join(self.appointment_dir, f"{stem}.json")
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return data[int(item)] if item else data
+
+    def update_statuses(self, items, expected="Ongoing"):
+        # Compare-and-set against the file, not this client's copy, which may be stale.
+        applied, current, files, dirty = [], {}, {}, set()
+        with locked_file(self.lock_path), self.journal.transaction() as transaction:
+            for appointment_id, status in items:
+                stem, _, item = appointment_id.partition(':')
+                file_path = os.path.join(self.appointment_dir, f"{stem}.json")
+                if file_path not in files:
+                    try:
+                        with open(file_path, 'r') as f:
+                            files[file_path] = json.load(f)
+                    except (FileNotFoundError, json.JSONDecodeError):
+                        files[file_path] = None
+                content = files[file_path]
+                if content is None:
+                    continue
+                record = content[int(item)] if item else content
+                if record.get("status", "Ongoing") == expected:
+                    # Older records gain their schedule fields whenever their file is rewritten.
+                    ensure_schedule(record)["status"] = status
+                    applied.append(appointment_id)
+                    dirty.add(file_path)
+                current[appointment_id] = dict(record)
+            for file_path in dirty:
+                transaction.write_json(file_path, files[file_path])
+        return applied, current
+
+
+class AppendLogBackend:
+    def __init__(self, log_path, compact_ratio=2, compact_min=1000):
+        self.log_path = log_path
+        self.lock_path = log_path + ".lock"
+        self.compact_ratio = compact_ratio
+        self.compact_min = compact_min
+        self.last_number = 0
+        self.records = {}
+        self.changes = {}
+        self.line_count = 0
+        self.compacting = False
+        self.compact_retry = 0
+        self.lock = threading.Lock()
+        self.file = None
+        self.inode = None
+        self.offset = 0
+
+    def _read_lines(self):
+        try:
+            f = open(self.log_path, 'rb')
+        except FileNotFoundError:
+            return [], False
+        with f:
+            inode = os.fstat(f.fileno()).st_ino
+            restarted = inode != self.inode
+            if restarted:
+                # Another client compacted the log; its rewrite holds every record, so start over.
+                self.inode, self.offset = inode, 0
+            f.seek(self.offset)
+            raw = f.read()
+        # A line still being written by another client is left for the next read.
+        end = raw.rfind(b"\n") + 1
+        self.offset += end
+        entries = []
+        for line in raw[:end].splitlines():
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A torn line from a crash mid-append is dropped.
+                continue
+        return entries, restarted
+
+    def load_all(self):
+        self.records = {}
+        self.changes = {}
+        self.inode = None
+        entries, _ = self._read_lines()
+        for entry in entries:
+            self._apply(entry)
+        self.line_count = len(entries)
+
+        self.last_number = max((appointment_number(i) for i in self.records), default=0)
+        if self.file is None:
+            self.file = open(self.log_path, 'a', encoding='utf-8')
+        return {i: dict(data) for i, data in self.records.items()}
+
+    def _read_tail(self):
+        entries, restarted = self._read_lines()
+        if restarted:
+            self.line_count = len(entries)
+        for entry in entries:
+            before = self.records.get(entry.get("id"))
+            before = dict(before) if before is not None else None
+            self._apply(entry)
+            after = self.records.get(entry.get("id"))
+            # Lines this client wrote were applied when appended, so only other clients' lines count.
+            if after != before:
+                self.changes[entry["id"]] = dict(after)
+                self.line_count += 1
+        self.last_number = max([self.last_number] + [appointment_number(i) for i in self.changes])
+
+    def load_changes(self):
+        with self.lock:
+            self._read_tail()
+            changes, self.changes = self.changes, {}
+        return changes
+
+    def _apply(self, entry):
+        if entry.get("op") == "put":
+            self.records[entry["id"]] = entry["data"]
+        elif entry.get("op") == "status" and entry.get("id") in self.records:
+            self.records[entry["id"]]["status"] = entry["status"]
+
+    def _reopen(self):
+        # Appending to a log another client has replaced would write into an unlinked file.
+        if self.file is None or os.fstat(self.file.fileno()).st_ino != os.stat(self.log_path).st_ino:
+            if self.file is not None:
+                self.file.close()
+            self.file = open(self.log_path, 'a', encoding='utf-8')
+
+    def _write(self, entries):
+        lines = [json.dumps(entry, separators=(',', ':')) + "\n" for entry in entries]
+        self._reopen()
+        for line in lines:
+            self._apply(json.loads(line))
+        self.file.writelines(lines)
+        self.file.flush()
+        self.line_count += len(lines)
+        threshold = max(self.compact_min, self.compact_ratio * len(self.records), self.compact_retry)
+        if not self.compacting and self.line_count >= threshold:
+            self.compacting = True
+            threading.Thread(target=self.compact, daemon=True).start()
+
+    def _append(self, *entries):
+        with self.lock, locked_file(self.lock_path):
+            self._write(entries)
+
+    def put(self, appointment_id, data):
+        self._append({"op": "put", "id": appointment_id, "data": data})
+
+    def create(self, appointment_id, data):
+        with self.lock:
+            self._read_tail()
+            if appointment_id in self.records:
+                raise FileExistsError(appointment_id)
+        self.put(appointment_id, data)
+
+    def load(self, appointment_id):
+        with self.lock:
+            if appointment_id not in self.records:
+                self._read_tail()
+            data = self.records.get(appointment_id)
+        return dict(data) if data is not None else None
+
+    def update_statuses(self, items, expected="Ongoing"):
+        applied, current, entries = [], {}, []
+        with self.lock, locked_file(self.lock_path):
+            # Other clients' status lines must be seen before deciding what still applies.
+            self._read_tail()
+            for appointment_id, status in items:
+                record = self.records.get(appointment_id)
+                if record is None:
+                    continue
+                if record.get("status", "Ongoing") == expected:
+                    entries.append({"op": "status", "id": appointment_id, "status": status})
+                    applied.append(appointment_id)
+            self._write(entries)
+            for appointment_id, _ in items:
+                if appointment_id in self.records:
+                    current[appointment_id] = dict(self.records[appointment_id])
+        return applied, current
+
+    def compact(self):
+        try:
+            # Appenders wait on the same file lock, so nothing lands between the last read and the swap.
+            with self.lock, locked_file(self.lock_path):
+                self._read_tail()
+                records = sorted(self.records.items(), key=lambda item: appointment_sort_key(item[0]))
+                lines = [json.dumps({"op": "put", "id": i, "data": ensure_schedule(data)}, separators=(',', ':'))
+                         + "\n" for i, data in records]
+
+                tmp_path = self.log_path + ".compact"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.writelines(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+                # Windows refuses to replace a file this or another client still has open.
+                self.file.close()
+                try:
+                    os.replace(tmp_path, self.log_path)
+                finally:
+                    self.file = open(self.log_path, 'a', encoding='utf-8')
+                self.inode = os.fstat(self.file.fileno()).st_ino
+                self.offset = os.path.getsize(self.log_path)
+                self.line_count = len(lines)
+                self.compact_retry = 0
+        except OSError as e:
+            # The log is still whole; try again once another compact_min lines have been appended.
+            print(f"Failed to compact {self.log_path}: {e}")
+            self.compact_retry = self.line_count + self.compact_min
+            if os.path.exists(self.log_path + ".compact"):
+                os.remove(self.log_path + ".compact")
+        finally:
+            self.compacting = False
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+def migrate_directory_to_log(appointment_dir, log_path):
+    records = JsonDirectoryBackend(appointment_dir).load_all()
+    lines = []
+    for appointment_id in sorted(records, key=appointment_sort_key):
+        # List-file entries get a plain id so the log has a single id scheme.
+        entry = {"op": "put", "id": appointment_id.replace(':', '_'), "data": records[appointment_id]}
+        lines.append(json.dumps(entry, separators=(',', ':')) + "\n")
+    atomic_write(log_path, "".join(lines))
+    return len(records)
+
+
+class AppointmentStore:
+    def __init__(self, backend, bus=None, allocator=None, reservations=None):
+        self.backend = backend
+        self.bus = bus
+        self.allocator = allocator
+        self.reservations = reservations
+        self.lock = threading.RLock()
+        self.reload()
+
+    def _publish(self, kind, appointment_id, data):
+        if self.bus is not None and kind is not None:
+            self.bus.publish(AppointmentEvent(kind, appointment_id, data))
+
+    @synchronized
+    def reload(self):
+        self.availability = AvailabilityIndex()
+        self.expiry = []
+        self.records = {}
+        self.by_doctor = defaultdict(set)
+        self.by_user = defaultdict(set)
+        self.by_date = defaultdict(set)
+        self.by_status = defaultdict(set)
+
+        for appointment_id, data in self.backend.load_all().items():
+            self._index(appointment_id, data)
+        self.last_number = self.backend.last_number
+
+    def _index(self, appointment_id, data):
+        ensure_schedule(data)
+        self.records[appointment_id] = data
+        self.by_doctor[data.get("doctor")].add(appointment_id)
+        self.by_user[data.get("user")].add(appointment_id)
+        self.by_date[data.get("date")].add(appointment_id)
+        self.by_status[data.get("status", "Ongoing")].add(appointment_id)
+        if data.get("status") != "Cancelled":
+            self.availability.add(data.get("doctor"), data.get("date"), data.get("slots", []))
+        if data.get("status", "Ongoing") == "Ongoing" and "expires" in data:
+            bisect.insort(self.expiry, (data["expires"], appointment_id))
+
+    def _unindex(self, appointment_id):
+        data = self.records.pop(appointment_id)
+        self.by_doctor[data.get("doctor")].discard(appointment_id)
+        self.by_user[data.get("user")].discard(appointment_id)
+        self.by_date[data.get("date")].discard(appointment_id)
+        self.by_status[data.get("status", "Ongoing")].discard(appointment_id)
+        if data.get("status") != "Cancelled":
+            self.availability.remove(data.get("doctor"), data.get("date"), data.get("slots", []))
+        if data.get("status", "Ongoing") == "Ongoing" and "expires" in data:
+            entry = (data["expires"], appointment_id)
+            i = bisect.bisect_left(self.expiry, entry)
+            if i < len(self.expiry) and self.expiry[i] == entry:
+                del self.expiry[i]
+        return data
+
+    def _replace(self, appointment_id, data):
+        ensure_schedule(data)
+        if self.records.get(appointment_id) == data:
+            return False
+        if appointment_id in self.records:
+            self._unindex(appointment_id)
+        self._index(appointment_id, data)
+        return True
+
+    def _publish_change(self, appointment_id, before, data):
+        # Another client's booking or status change reaches this one as the event it would have published.
+        if before is None:
+            self._publish(BOOKED, appointment_id, data)
+        if data.get("status", "Ongoing") != (before or {}).get("status", "Ongoing"):
+            self._publish(STATUS_EVENTS.get(data.get("status")), appointment_id, data)
+
+    @synchronized
+    def refresh(self):
+        changes = {}
+        for appointment_id, data in self.backend.load_changes().items():
+            if data is None:
+                # A removed file takes every record that was read from it.
+                for i in [i for i in self.records if i.partition(':')[0] == appointment_id]:
+                    self._unindex(i)
+                    changes[i] = None
+                continue
+            before = self.records.get(appointment_id)
+            if self._replace(appointment_id, data):
+                changes[appointment_id] = data
+                self._publish_change(appointment_id, before, data)
+        self.last_number = max(self.last_number, self.backend.last_number)
+        return changes
+
+    @synchronized
+    def get(self, appointment_id):
+        return self.records.get(appointment_id)
+
+    def _ids(self, doctor=None, user=None, date=None, status=None):
+        candidates = []
+        if doctor is not None:
+            candidates.append(self.by_doctor.get(doctor, set()))
+        if user is not None:
+            candidates.append(self.by_user.get(user, set()))
+        if date is not None:
+            candidates.append(self.by_date.get(date, set()))
+        if isinstance(status, (tuple, list)):
+            candidates.append(set().union(*(self.by_status.get(s, set()) for s in status)))
+        elif status is not None:
+            candidates.append(self.by_status.get(status, set()))
+
+        if not candidates:
+            return self.records.keys()
+        candidates.sort(key=len)
+        if len(candidates) == 1:
+            return candidates[0]
+        return candidates[0].intersection(*candidates[1:])
+
+    @synchronized
+    def find(self, doctor=None, user=None, date=None, status=None, after=None, limit=None):
+        ids = sorted(self._ids(doctor, user, date, status), key=appointment_sort_key)
+        if after is not None:
+            after_key = appointment_sort_key(after)
+            ids = [i for i in ids if appointment_sort_key(i) > after_key]
+        if limit is not None:
+            ids = ids[:limit]
+        return [(i, self.records[i]) for i in ids]
+
+    @synchronized
+    def count(self, doctor=None, user=None, date=None, status=None):
+        return len(self._ids(doctor, user, date, status))
+
+    @synchronized
+    def sum_fees(self, doctor=None, user=None, date=None, status=None):
+        total = 0
+        for i in self._ids(doctor, user, date, status):
+            try:
+                total += int(self.records[i].get("fee", "0"))
+            except ValueError:
+                pass
+        return total
+
+    @synchronized
+    def distinct_users(self, doctor=None, user=None, date=None, status=None):
+        return len({self.records[i].get("user", "Unknown") for i in self._ids(doctor, user, date, status)})
+
+    @synchronized
+    def booked_mask(self, doctor, date):
+        return self.availability.booked_mask(doctor, date)
+
+    @synchronized
+    def next_available(self, doctor, start, now=None):
+        return self.availability.next_available(doctor, start, now=now)
+
+    def _next_number(self):
+        if self.allocator is None:
+            return self.last_number + 1
+        return self.allocator.allocate(self.last_number)
+
+    def _check_free(self, doctor, day, slots):
+        booked = self.availability.booked_mask(doctor, day)
+        taken = [slot for slot in slots if booked & (1 << slot)]
+        if taken:
+            raise SlotConflict(doctor, day, taken)
+
+    def _is_live(self, appointment_id):
+        data = self.backend.load(appointment_id)
+        if data is None:
+            return None
+        return data.get("status") != "Cancelled"
+
+    def _learn(self, conflict):
+        # Another client holds the slots, so pull its bookings in for this doctor's view.
+        for appointment_id in conflict.holders:
+            data = self.backend.load(appointment_id)
+            if data is not None and appointment_id not in self.records:
+                self._index(appointment_id, data)
+
+    def _release(self, appointment_id, data):
+        if self.reservations is not None:
+            self.reservations.release(data.get("doctor"), data.get("date"), data.get("slots", []), appointment_id)
+
+    @synchronized
+    def add(self, data):
+        ensure_schedule(data)
+        slot_key = (data.get("doctor"), data.get("date"), data.get("slots", []))
+        self._check_free(*slot_key)
+
+        while True:
+            self.last_number = self._next_number()
+            appointment_id = f"appointment{self.last_number}"
+            if self.reservations is not None:
+                try:
+                    self.reservations.reserve(*slot_key, appointment_id, self._is_live)
+                except SlotConflict as conflict:
+                    self._learn(conflict)
+                    raise
+            try:
+                self.backend.create(appointment_id, data)
+                break
+            except FileExistsError:
+                # Written by a client that predates the shared counter; skip past it.
+                self._release(appointment_id, data)
+                continue
+            except BaseException:
+                self._release(appointment_id, data)
+                raise
+        self._index(appointment_id, data)
+        self._publish(BOOKED, appointment_id, data)
+        return appointment_id
+
+    def _apply_statuses(self, items):
+        # Dashboard actions and the sweep only ever move a booking out of Ongoing.
+        applied, current = self.backend.update_statuses(items)
+        for appointment_id, data in current.items():
+            if self._replace(appointment_id, data) and appointment_id not in applied:
+                # Another client got there first; show its outcome instead of ours.
+                self._publish(STATUS_EVENTS.get(data.get("status")), appointment_id, data)
+        for appointment_id in applied:
+            data = self.records[appointment_id]
+            if data.get("status") == "Cancelled":
+                self._release(appointment_id, data)
+            self._publish(STATUS_EVENTS.get(data.get("status")), appointment_id, data)
+        return applied, current
+
+    @synchronized
+    def set_status(self, appointment_id, status):
+        applied, current = self._apply_statuses([(appointment_id, status)])
+        if appointment_id not in applied:
+            raise StatusConflict(appointment_id, (current.get(appointment_id) or {}).get("status"))
+        return current[appointment_id]
+
+    @synchronized
+    def expire(self, now):
+        cutoff = minute_stamp(now)
+        end = bisect.bisect_right(self.expiry, (cutoff, "\uffff"))
+        expired = [appointment_id for _, appointment_id in self.expiry[:end]]
+        if not expired:
+            return []
+        applied, _ = self._apply_statuses([(appointment_id, "Completed") for appointment_id in expired])
+        for appointment_id in applied:
+            self._release(appointment_id, self.records[appointment_id])
+        return applied
+
+
+class JsonAccountBackend:
+    def __init__(self, user_dir, admin_dir, doctor_dir, registry_path=None, journal=None):
+        self.role_dirs = {"User": user_dir, "Admin": admin_dir}
+        self.doctor_dir = doctor_dir
+        self.registry_path = registry_path
+        self.journal = journal or WriteJournal()
+        self.lock = threading.RLock()
+        self.lock_path = os.path.join(os.path.dirname(os.path.abspath(user_dir)), 'accounts.lock')
+        self.emails = {}
+        self.doctor_names = {}
+        self.stamps = None
+        self.registry_stamp = None
+        self.load_registry()
+
+    def _dir_stamps(self):
+        return [os.stat(d).st_mtime_ns for d in (*self.role_dirs.values(), self.doctor_dir)]
+
+    def _registry_stamp(self):
+        try:
+            return os.stat(self.registry_path).st_mtime_ns if self.registry_path else None
+        except OSError:
+            return None
+
+    def _check_registry(self):
+        # Adding or removing an account changes a directory mtime; editing a profile rewrites the registry.
+        if self._dir_stamps() != self.stamps or self._registry_stamp() != self.registry_stamp:
+            self.load_registry()
+
+    @synchronized
+    def load_registry(self):
+        if self.registry_path and os.path.exists(self.registry_path):
+            try:
+                registry_stamp = self._registry_stamp()
+                with open(self.registry_path, 'r') as file:
+                    registry = json.load(file)
+                stamps = self._dir_stamps()
+                if registry.get("stamps") == stamps:
+                    self.emails = {email: tuple(entry) for email, entry in registry["emails"].items()}
+                    self.doctor_names = registry["doctor_names"]
+                    self.stamps = stamps
+                    self.registry_stamp = registry_stamp
+                    return
+            except (OSError, json.JSONDecodeError, KeyError):
+                pass
+        self.rebuild_registry()
+
+    @synchronized
+    def rebuild_registry(self):
+        # Stamped before listing, so an account added meanwhile leaves the registry stale, not wrong.
+        stamps = self._dir_stamps()
+        self.emails = {}
+        self.doctor_names = {}
+        for role, directory in self.role_dirs.items():
+            for file in os.listdir(directory):
+                if file.lower().endswith('.json'):
+                    self.emails[file[:-len('.json')].lower()] = (role, os.path.join(directory, file))
+        for folder, profile in self.doctor_profiles():
+            self._register_doctor(folder, profile)
+        self.save_registry(stamps)
+
+    def save_registry(self, stamps=None):
+        self.stamps = stamps or self._dir_stamps()
+        if not self.registry_path:
+            return
+        registry = {"stamps": self.stamps, "emails": self.emails, "doctor_names": self.doctor_names}
+        write_json(self.registry_path, registry, indent=None)
+        self.registry_stamp = self._registry_stamp()
+
+    def _register_doctor(self, folder, profile):
+        profile_path = os.path.join(self.doctor_dir, folder, 'profile.json')
+        self.emails[profile.get("Email", folder).lower()] = ("Doctor", profile_path)
+        if profile.get("Full Name"):
+            self.doctor_names[profile["Full Name"]] = folder
+
+    def _unregister_doctor(self, folder):
+        for email, (role, path) in list(self.emails.items()):
+            if role == "Doctor" and os.path.basename(os.path.dirname(path)) == folder:
+                del self.emails[email]
+        for name, name_folder in list(self.doctor_names.items()):
+            if name_folder == folder:
+                del self.doctor_names[name]
+
+    def _account_path(self, role, email):
+        if role == "Doctor":
+            return os.path.join(self.doctor_dir, email, 'profile.json')
+        return os.path.join(self.role_dirs[role], f"{email}.json")
+
+    def find_account(self, email):
+        for role in ("User", "Admin", "Doctor"):
+            filepath = self._account_path(role, email)
+            if os.path.exists(filepath):
+                with open(filepath, 'r') as file:
+                    return role, json.load(file)
+        return None
+
+    @synchronized
+    def email_exists(self, email):
+        self._check_registry()
+        return email in self.emails
+
+    @synchronized
+    def save_account(self, role, data):
+        # The lock file makes check-then-write atomic across clients sharing the folder.
+        with locked_file(self.lock_path):
+            if self.email_exists(data["Email"].lower()):
+                raise FileExistsError(data["Email"])
+            filepath = self._account_path(role, data["Email"])
+            if role == "Doctor":
+                if os.path.exists(filepath):
+                    raise FileExistsError(data["Email"])
+                self._write_doctors([(data["Email"], data)], {})
+                return
+            # create_json refuses to replace an account file, even if the registry missed it.
+            create_json(filepath, data)
+            self.emails[data["Email"].lower()] = (role, filepath)
+            self.save_registry()
+
+    def count(self, role):
+        if role == "Doctor":
+            return len(self.doctor_folders())
+        metrics.count("directories listed")
+        return len([f for f in os.listdir(self.role_dirs[role]) if f.endswith(".json")])
+
+    def doctor_folders(self):
+        metrics.count("directories listed")
+        return sorted(f for f in os.listdir(self.doctor_dir) if os.path.isdir(os.path.join(self.doctor_dir, f)))
+
+    def doctor_profile(self, folder):
+        profile_path = os.path.join(self.doctor_dir, folder, 'profile.json')
+        try:
+            with open(profile_path, 'r') as file:
+                return json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def doctor_stamps(self):
+        stamps = {}
+        for folder in self.doctor_folders():
+            try:
+                stat = os.stat(os.path.join(self.doctor_dir, folder, 'profile.json'))
+                stamps[folder] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                stamps[folder] = None
+        return stamps
+
+    def watch_paths(self):
+        return [self.doctor_dir] + [os.path.join(self.doctor_dir, f) for f in self.doctor_folders()]
+
+    def doctor_profiles(self, folders=None):
+        if folders is None:
+            folders = self.doctor_folders()
+        paths = {os.path.join(self.doctor_dir, folder, 'profile.json'): folder for folder in sorted(folders)}
+        profiles = load_json_files(paths)
+        return [(paths[path], profile) for path, profile in profiles.items()]
+
+    @synchronized
+    def find_doctor(self, name=None, email=None):
+        self._check_registry()
+        if name is not None and name in self.doctor_names:
+            return self.doctor_names[name]
+        entry = self.emails.get(email)
+        if entry and entry[0] == "Doctor":
+            return os.path.basename(os.path.dirname(entry[1]))
+        return None
+
+    def save_doctor(self, folder, profile, images=()):
+        self.save_doctors([(folder, profile)], {folder: images})
+
+    @synchronized
+    def save_doctors(self, items, images=None):
+        # Other clients' accounts must be in the registry before this client saves it.
+        with locked_file(self.lock_path):
+            self._check_registry()
+            self._write_doctors(items, images or {})
+
+    def _write_doctors(self, items, images):
+        with self.journal.transaction() as transaction:
+            for folder, profile in items:
+                doctor_folder = os.path.join(self.doctor_dir, folder)
+                transaction.write_json(os.path.join(doctor_folder, 'profile.json'), profile)
+                for image_path in images.get(folder, ()):
+                    transaction.copy(image_path, os.path.join(doctor_folder, os.path.basename(image_path)))
+
+        for folder, profile in items:
+            self._unregister_doctor(folder)
+            self._register_doctor(folder, profile)
+        self.save_registry()
+
+    def remove_doctor(self, folder):
+        self.remove_doctors([folder])
+
+    @synchronized
+    def remove_doctors(self, folders):
+        with locked_file(self.lock_path):
+            self._check_registry()
+            with self.journal.transaction() as transaction:
+                for folder in folders:
+                    transaction.remove(os.path.join(self.doctor_dir, folder))
+
+            for folder in folders:
+                self._unregister_doctor(folder)
+            self.save_registry()
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    email TEXT PRIMARY KEY,
+    role TEXT NOT NULL,
+    name TEXT,
+    folder TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS accounts_role ON accounts (role);
+CREATE INDEX IF NOT EXISTS accounts_name ON accounts (name);
+CREATE UNIQUE INDEX IF NOT EXISTS accounts_folder ON accounts (folder);
+
+CREATE TABLE IF NOT EXISTS appointments (
+    id TEXT PRIMARY KEY,
+    number INTEGER NOT NULL,
+    doctor TEXT,
+    user TEXT,
+    date TEXT,
+    status TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS appointments_doctor_date ON appointments (doctor, date);
+CREATE INDEX IF NOT EXISTS appointments_user ON appointments (user);
+CREATE INDEX IF NOT EXISTS appointments_status_date ON appointments (status, date);
+CREATE INDEX IF NOT EXISTS appointments_number ON appointments (number);
+
+CREATE TABLE IF NOT EXISTS slot_reservations (
+    doctor TEXT NOT NULL,
+    date TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    appointment_id TEXT NOT NULL,
+    PRIMARY KEY (doctor, date, slot)
+);
+CREATE INDEX IF NOT EXISTS slot_reservations_appointment ON slot_reservations (appointment_id);
+"""
+
+
+class SQLiteBackend:
+    def __init__(self, db_path, doctor_dir):
+        self.db_path = db_path
+        self.doctor_dir = doctor_dir
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        has_reservations = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'slot_reservations'").fetchone() is not None
+        self.conn.executescript(SQLITE_SCHEMA)
+        if not has_reservations:
+            self._reserve_existing()
+
+    def _reserve_existing(self):
+        rows = self.conn.execute("SELECT id, data FROM appointments WHERE status != 'Cancelled'").fetchall()
+        with self.conn:
+            for appointment_id, data in rows:
+                self._reserve(appointment_id, json.loads(data), replace=False)
+
+    def _reserve(self, appointment_id, data, replace=True):
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        self.conn.executemany(
+            f"{verb} INTO slot_reservations (doctor, date, slot, appointment_id) VALUES (?, ?, ?, ?)",
+            [(data.get("doctor"), data.get("date"), slot, appointment_id)
+             for slot in slot_numbers(data.get("time", []))])
+
+    @synchronized
+    def put_account(self, role, data, folder=None):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO accounts (email, role, name, folder, data) VALUES (?, ?, ?, ?, ?)",
+            (data["Email"].lower(), role, data.get("Full Name"), folder, json.dumps(data)))
+
+    @synchronized
+    def find_account(self, email):
+        row = self.conn.execute("SELECT role, data FROM accounts WHERE email = ?", (email,)).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    @synchronized
+    def email_exists(self, email):
+        return self.conn.execute("SELECT 1 FROM accounts WHERE email = ?", (email,)).fetchone() is not None
+
+    @synchronized
+    def save_account(self, role, data):
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            if self.email_exists(data["Email"].lower()):
+                raise FileExistsError(data["Email"])
+            self.put_account(role, data, data["Email"] if role == "Doctor" else None)
+
+    @synchronized
+    def count(self, role):
+        return self.conn.execute("SELECT COUNT(*) FROM accounts WHERE role = ?", (role,)).fetchone()[0]
+
+    @synchronized
+    def doctor_folders(self):
+        rows = self.conn.execute("SELECT folder FROM accounts WHERE role = 'Doctor' ORDER BY folder")
+        return [row[0] for row in rows]
+
+    @synchronized
+    def doctor_profile(self, folder):
+        row = self.conn.execute("SELECT data FROM accounts WHERE folder = ?", (folder,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @synchronized
+    def doctor_stamps(self):
+        rows = self.conn.execute("SELECT folder, data FROM accounts WHERE role = 'Doctor'")
+        return {folder: (len(data), zlib.crc32(data.encode())) for folder, data in rows}
+
+    def watch_paths(self):
+        return [os.path.dirname(os.path.abspath(self.db_path))]
+
+    @synchronized
+    def doctor_profiles(self, folders=None):
+        query = "SELECT folder, data FROM accounts WHERE role = 'Doctor'"
+        params = []
+        if folders is not None:
+            folders = list(folders)
+            query += f" AND folder IN ({', '.join('?' * len(folders))})"
+            params = folders
+        rows = self.conn.execute(query + " ORDER BY folder", params)
+        return [(folder, json.loads(data)) for folder, data in rows]
+
+    @synchronized
+    def find_doctor(self, name=None, email=None):
+        row = self.conn.execute(
+            "SELECT folder FROM accounts WHERE role = 'Doctor' AND (name = ? OR email = ?)",
+            (name, email)).fetchone()
+        return row[0] if row else None
+
+    def save_doctor(self, folder, profile, images=()):
+        self.save_doctors([(folder, profile)], {folder: images})
+
+    @synchronized
+    def save_doctors(self, items, images=None):
+        images = images or {}
+        for folder, _ in items:
+            for image_path in images.get(folder, ()):
+                atomic_copy(image_path, os.path.join(self.doctor_dir, folder, os.path.basename(image_path)))
+        with self.conn:
+            for folder, profile in items:
+                self.put_account("Doctor", profile, folder)
+
+    def remove_doctor(self, folder):
+        self.remove_doctors([folder])
+
+    @synchronized
+    def remove_doctors(self, folders):
+        with self.conn:
+            self.conn.executemany("DELETE FROM accounts WHERE folder = ?", [(folder,) for folder in folders])
+        for folder in folders:
+            shutil.rmtree(os.path.join(self.doctor_dir, folder), ignore_errors=True)
+
+    @synchronized
+    def put_appointment(self, appointment_id, data, number=None):
+        if number is None:
+            number = appointment_number(appointment_id)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO appointments (id, number, doctor, user, date, status, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (appointment_id, number, data.get("doctor"), data.get("user"), data.get("date"),
+             data.get("status", "Ongoing"), json.dumps(data)))
+        if data.get("status") != "Cancelled":
+            self._reserve(appointment_id, data, replace=False)
+
+    @synchronized
+    def insert_appointment(self, data):
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            slots = data.get("slots", [])
+            taken = self.conn.execute(
+                f"SELECT slot, appointment_id FROM slot_reservations WHERE doctor = ? AND date = ? "
+                f"AND slot IN ({', '.join('?' * len(slots))})",
+                [data.get("doctor"), data.get("date"), *slots]).fetchall()
+            if taken:
+                raise SlotConflict(data.get("doctor"), data.get("date"), [slot for slot, _ in taken],
+                                   [holder for _, holder in taken])
+            number = self.conn.execute("SELECT COALESCE(MAX(number), 0) + 1 FROM appointments").fetchone()[0]
+            appointment_id = f"appointment{number}"
+            self.put_appointment(appointment_id, data, number)
+        return appointment_id
+
+    @synchronized
+    def data_version(self):
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    @synchronized
+    def appointment_statuses(self):
+        return dict(self.conn.execute("SELECT id, status FROM appointments"))
+
+    @synchronized
+    def booked_slots(self):
+        rows = self.conn.execute(
+            "SELECT doctor, date, json_extract(data, '$.time') FROM appointments WHERE status != 'Cancelled'")
+        return [(doctor, day, slot_numbers(json.loads(times or "[]"))) for doctor, day, times in rows]
+
+    @synchronized
+    def get_appointment(self, appointment_id):
+        row = self.conn.execute("SELECT data FROM appointments WHERE id = ?", (appointment_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @synchronized
+    def update_statuses(self, items, expected="Ongoing"):
+        applied, current = [], {}
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            for appointment_id, status in items:
+                row = self.conn.execute("SELECT data FROM appointments WHERE id = ?", (appointment_id,)).fetchone()
+                if row is None:
+                    continue
+                data = json.loads(row[0])
+                if data.get("status", "Ongoing") == expected:
+                    ensure_schedule(data)["status"] = status
+                    self.conn.execute("UPDATE appointments SET status = ?, data = ? WHERE id = ?",
+                                      (status, json.dumps(data), appointment_id))
+                    if status == "Cancelled":
+                        self.conn.execute("DELETE FROM slot_reservations WHERE appointment_id = ?",
+                                          (appointment_id,))
+                    applied.append(appointment_id)
+                current[appointment_id] = data
+        return applied, current
+
+    @synchronized
+    def ongoing_until(self, day):
+        rows = self.conn.execute(
+            "SELECT id, data FROM appointments WHERE status = 'Ongoing' AND date <= ? ORDER BY date", (day,))
+        return [(appointment_id, json.loads(data)) for appointment_id, data in rows]
+
+    def _where(self, doctor, user, date, status, after=None):
+        clauses, params = [], []
+        for column, value in (("doctor", doctor), ("user", user), ("date", date), ("status", status)):
+            if isinstance(value, (tuple, list)):
+                clauses.append(f"{column} IN ({', '.join('?' * len(value))})")
+                params.extend(value)
+            elif value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if after is not None:
+            clauses.append("(number, id) > (?, ?)")
+            params.extend([appointment_number(after), after])
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    @synchronized
+    def find_appointments(self, doctor=None, user=None, date=None, status=None, after=None, limit=None):
+        where, params = self._where(doctor, user, date, status, after)
+        query = f"SELECT id, data FROM appointments{where} ORDER BY number, id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [(appointment_id, json.loads(data)) for appointment_id, data in self.conn.execute(query, params)]
+
+    @synchronized
+    def count_appointments(self, doctor=None, user=None, date=None, status=None):
+        where, params = self._where(doctor, user, date, status)
+        return self.conn.execute(f"SELECT COUNT(*) FROM appointments{where}", params).fetchone()[0]
+
+    @synchronized
+    def sum_fees(self, doctor=None, user=None, date=None, status=None):
+        where, params = self._where(doctor, user, date, status)
+        query = f"SELECT COALESCE(SUM(CAST(json_extract(data, '$.fee') AS INTEGER)), 0) FROM appointments{where}"
+        return self.conn.execute(query, params).fetchone()[0]
+
+    @synchronized
+    def distinct_users(self, doctor=None, user=None, date=None, status=None):
+        where, params = self._where(doctor, user, date, status)
+        return self.conn.execute(f"SELECT COUNT(DISTINCT user) FROM appointments{where}", params).fetchone()[0]
+
+
+class SQLiteAppointmentStore(AppointmentStore):
+    def reload(self):
+        self.data_version = self.backend.data_version()
+        # Only statuses are kept, so refresh() can tell which bookings another client changed.
+        self.statuses = self.backend.appointment_statuses()
+        self.availability = AvailabilityIndex()
+        for doctor, day, times in self.backend.booked_slots():
+            self.availability.add(doctor, day, times)
+
+    @synchronized
+    def refresh(self):
+        # Queries already read the shared database; only the slot index is cached here.
+        if self.backend.data_version() == self.data_version:
+            return {}
+        before = self.statuses
+        self.reload()
+        changes = {appointment_id: None for appointment_id in before if appointment_id not in self.statuses}
+        for appointment_id, status in self.statuses.items():
+            if before.get(appointment_id) != status:
+                data = self.backend.get_appointment(appointment_id)
+                if data is not None:
+                    changes[appointment_id] = data
+                    self._publish_change(appointment_id, {"status": before[appointment_id]}
+                                         if appointment_id in before else None, data)
+        return changes
+
+    def get(self, appointment_id):
+        return self.backend.get_appointment(appointment_id)
+
+    def find(self, doctor=None, user=None, date=None, status=None, after=None, limit=None):
+        return self.backend.find_appointments(doctor=doctor, user=user, date=date, status=status,
+                                              after=after, limit=limit)
+
+    def count(self, doctor=None, user=None, date=None, status=None):
+        return self.backend.count_appointments(doctor=doctor, user=user, date=date, status=status)
+
+    def sum_fees(self, doctor=None, user=None, date=None, status=None):
+        return self.backend.sum_fees(doctor=doctor, user=user, date=date, status=status)
+
+    def distinct_users(self, doctor=None, user=None, date=None, status=None):
+        return self.backend.distinct_users(doctor=doctor, user=user, date=date, status=status)
+
+    @synchronized
+    def add(self, data):
+        ensure_schedule(data)
+        self._check_free(data.get("doctor"), data.get("date"), data.get("slots", []))
+        try:
+            appointment_id = self.backend.insert_appointment(data)
+        except SlotConflict as conflict:
+            for holder in conflict.holders:
+                held = ensure_schedule(self.backend.get_appointment(holder))
+                self.availability.add(held.get("doctor"), held.get("date"), held.get("slots", []))
+            raise
+        if data.get("status") != "Cancelled":
+            self.availability.add(data.get("doctor"), data.get("date"), data.get("slots", []))
+        self.statuses[appointment_id] = data.get("status", "Ongoing")
+        self._publish(BOOKED, appointment_id, data)
+        return appointment_id
+
+    @synchronized
+    def set_status(self, appointment_id, status):
+        applied, current = self.backend.update_statuses([(appointment_id, status)])
+        data = current.get(appointment_id)
+        if data is not None:
+            self.statuses[appointment_id] = data.get("status", "Ongoing")
+        if appointment_id not in applied:
+            if data is not None:
+                self._publish(STATUS_EVENTS.get(data.get("status")), appointment_id, data)
+            raise StatusConflict(appointment_id, (data or {}).get("status"))
+        ensure_schedule(data)
+        if status == "Cancelled":
+            self.availability.remove(data.get("doctor"), data.get("date"), data.get("slots", []))
+        self._publish(STATUS_EVENTS.get(status), appointment_id, data)
+        return data
+
+    @synchronized
+    def expire(self, now):
+        cutoff = minute_stamp(now)
+        expired = [appointment_id for appointment_id, data in self.backend.ongoing_until(now.date().isoformat())
+                   if ensure_schedule(data).get("expires", cutoff + 1) <= cutoff]
+        if not expired:
+            return []
+
+        applied, current = self.backend.update_statuses([(appointment_id, "Completed") for appointment_id in expired])
+        for appointment_id in applied:
+            self.statuses[appointment_id] = "Completed"
+            self._publish(COMPLETED, appointment_id, current[appointment_id])
+        return applied
+
+
+def import_data_tree(base_dir, db_path):
+    user_dir = os.path.join(base_dir, 'Users')
+    admin_dir = os.path.join(base_dir, 'Admins')
+    doctor_dir = os.path.join(base_dir, 'Doctors')
+    accounts = JsonAccountBackend(user_dir, admin_dir, doctor_dir)
+
+    tmp_path = db_path + ".import"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    db = SQLiteBackend(tmp_path, doctor_dir)
+
+    with db.conn:
+        for role, directory in (("User", user_dir), ("Admin", admin_dir)):
+            paths = [os.path.join(directory, f) for f in os.listdir(directory) if f.endswith('.json')]
+            for path, data in load_json_files(paths).items():
+                data.setdefault("Email", os.path.basename(path)[:-len('.json')])
+                db.put_account(role, data)
+
+        for folder, profile in accounts.doctor_profiles():
+            profile.setdefault("Email", folder)
+            db.put_account("Doctor", profile, folder)
+
+        records = JsonDirectoryBackend(os.path.join(base_dir, 'Appointments')).load_all()
+        for appointment_id, data in records.items():
+            db.put_appointment(appointment_id.replace(':', '_'), data)
+
+    db.conn.close()
+    os.replace(tmp_path, db_path)
+
+
+def open_storage(backend_name, base_dir, bus=None, journal=True):
+    user_dir = os.path.join(base_dir, 'Users')
+    admin_dir = os.path.join(base_dir, 'Admins')
+    doctor_dir = os.path.join(base_dir, 'Doctors')
+    appointment_dir = os.path.join(base_dir, 'Appointments')
+
+    if backend_name == "sqlite":
+        db_path = os.path.join(base_dir, 'data.sqlite3')
+        if not os.path.exists(db_path):
+            import_data_tree(base_dir, db_path)
+            print(f"Imported {base_dir} into {db_path}.")
+        backend = SQLiteBackend(db_path, doctor_dir)
+        return backend, SQLiteAppointmentStore(backend, bus)
+
+    write_journal = WriteJournal(os.path.join(base_dir, '.journal') if journal else None)
+    recovered = write_journal.recover()
+    if recovered:
+        print(f"Recovered {recovered} interrupted write(s) from the journal.")
+
+    allocator = IdAllocator(os.path.join(base_dir, 'appointment.counter'))
+    reservations = SlotReservations(os.path.join(base_dir, '.reservations'))
+    accounts = JsonAccountBackend(user_dir, admin_dir, doctor_dir, os.path.join(base_dir, 'registry.json'),
+                                  write_journal)
+    if backend_name == "log":
+        log_path = os.path.join(base_dir, 'appointments.jsonl')
+        if not os.path.exists(log_path):
+            count = migrate_directory_to_log(appointment_dir, log_path)
+            print(f"Migrated {count} appointments to {log_path}.")
+        return accounts, AppointmentStore(AppendLogBackend(log_path), bus, allocator, reservations)
+    return accounts, AppointmentStore(JsonDirectoryBackend(appointment_dir, write_journal), bus,
+                                      allocator, reservations)
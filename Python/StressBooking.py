@@ -0,0 +1,118 @@
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from datetime import date, timedelta
+from Availability import SLOT_LABELS
+from Reservations import SlotConflict
+from Storage import open_storage
+
+ROLE_DIRS = ('Users', 'Admins', 'Doctors', 'Appointments')
+
+
+def make_data_tree(base_dir, source=None):
+    if source:
+        shutil.copytree(source, base_dir, dirs_exist_ok=True)
+    for name in ROLE_DIRS:
+        os.makedirs(os.path.join(base_dir, name), exist_ok=True)
+
+
+def booking(client, worker, i, contend):
+    if contend:
+        doctor, day = "Dr. Contended", date(2099, 1, 1)
+    else:
+        doctor, day = f"Dr. Stress {client}-{worker}", date(2099, 1, 1) + timedelta(days=i // len(SLOT_LABELS))
+    return {
+        "doctor": doctor,
+        "user": f"client{client}-worker{worker}",
+        "date": day.isoformat(),
+        "time": [SLOT_LABELS[i % len(SLOT_LABELS)]],
+        "fee": "100",
+        "status": "Ongoing",
+    }
+
+
+def booker(base_dir, backend, client, threads, bookings, contend, results):
+    _, store = open_storage(backend, base_dir)
+    booked = []
+    booked_lock = threading.Lock()
+
+    def book(worker):
+        for i in range(bookings):
+            data = booking(client, worker, i, contend)
+            try:
+                appointment_id = store.add(data)
+            except SlotConflict:
+                appointment_id = None
+            with booked_lock:
+                booked.append((appointment_id, data["user"], data["time"][0]))
+
+    workers = [threading.Thread(target=book, args=(w,)) for w in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    results.put(booked)
+
+
+def run(base_dir, backend, clients, threads, bookings, contend=False):
+    # The first open migrates or imports the tree; do it once before clients race on it.
+    open_storage(backend, base_dir)
+
+    # Fresh interpreters per client, so nothing is shared except the Data folder.
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    processes = [context.Process(target=booker, args=(base_dir, backend, c, threads, bookings, contend, results))
+                 for c in range(clients)]
+    for process in processes:
+        process.start()
+    booked = []
+    for _ in processes:
+        booked.extend(results.get())
+    for process in processes:
+        process.join()
+
+    attempts = clients * threads * bookings
+    won = [(appointment_id, user, slot) for appointment_id, user, slot in booked if appointment_id]
+    ids = {appointment_id for appointment_id, _, _ in won}
+    _, store = open_storage(backend, base_dir)
+    # An overwritten booking shows up as an id whose record now belongs to someone else.
+    lost = sum(1 for appointment_id, user, _ in won if (store.get(appointment_id) or {}).get("user") != user)
+    # With contention each slot that was tried must end up with exactly one winner.
+    # Booking i only ever asks for slot i % len(SLOT_LABELS).
+    expected = min(bookings, len(SLOT_LABELS)) if contend else attempts
+    double_booked = len(won) - len({slot for _, _, slot in won}) if contend else 0
+
+    print(f"{clients} clients x {threads} threads x {bookings} bookings on {backend}"
+          f"{' (same doctor and day)' if contend else ''}")
+    print(f"booked: {len(won)}/{attempts}  unique ids: {len(ids)}  lost: {lost}  double booked: {double_booked}")
+    if len(booked) != attempts or len(ids) != len(won) or len(won) != expected or lost or double_booked:
+        print("FAILED")
+        return 1
+    print("OK")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Book appointments from many clients at once against one Data folder.")
+    parser.add_argument('--backend', choices=('json', 'log', 'sqlite'), default='json')
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--bookings', type=int, default=25)
+    parser.add_argument('--contend', action='store_true', help="have every client book the same doctor and day")
+    parser.add_argument('--data', help="copy this Data folder first instead of starting empty")
+    args = parser.parse_args()
+
+    base_dir = tempfile.mkdtemp(prefix='stress-data-')
+    try:
+        make_data_tree(base_dir, args.data)
+        return run(base_dir, args.backend, args.clients, args.threads, args.bookings, args.contend)
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import os
+import tempfile
+from PIL import Image
+from Metrics import metrics
+
+CARD_SIZE = (230, 220)
+BOOKING_SIZE = (230, 300)
+THUMB_DIR = '.thumbs'
+
+_memory = {}
+
+
+def _source_key(image_path):
+    stat = os.stat(image_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def thumbnail_path(image_path, size, key=None):
+    mtime_ns, file_size = key or _source_key(image_path)
+    folder, name = os.path.split(image_path)
+    stem = os.path.splitext(name)[0]
+    return os.path.join(folder, THUMB_DIR, f"{stem}-{size[0]}x{size[1]}-{mtime_ns}-{file_size}.png")
+
+
+def _purge_stale(image_path, size, keep):
+    thumb_dir = os.path.dirname(keep)
+    prefix = f"{os.path.splitext(os.path.basename(image_path))[0]}-{size[0]}x{size[1]}-"
+    for name in os.listdir(thumb_dir):
+        path = os.path.join(thumb_dir, name)
+        if name.startswith(prefix) and path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def generate_thumbnail(image_path, size, key=None):
+    path = thumbnail_path(image_path, size, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with metrics.timer("decode portrait"), Image.open(image_path) as source:
+        img = source.resize(size)
+    metrics.count("images decoded")
+    # Two threads or clients may build the same variant at once, so each gets its own temp file.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            img.save(f, format='PNG')
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _purge_stale(image_path, size, path)
+    return img
+
+
+def generate_thumbnails(image_path, sizes=(CARD_SIZE, BOOKING_SIZE)):
+    for size in sizes:
+        generate_thumbnail(image_path, size)
+
+
+def get_thumbnail(image_path, size):
+    if not image_path:
+        return Image.new('RGB', size, color='gray')
+
+    try:
+        key = _source_key(image_path)
+        memo_key = (image_path, size)
+        cached_key, img = _memory.get(memo_key, (None, None))
+        if cached_key == key:
+            metrics.count("thumbnails from memory")
+            return img
+
+        path = thumbnail_path(image_path, size, key)
+        if os.path.exists(path):
+            with metrics.timer("load cached thumbnail"), Image.open(path) as cached:
+                img = cached.copy()
+            metrics.count("thumbnails from disk")
+        else:
+            img = generate_thumbnail(image_path, size, key)
+    except Exception as e:
+        print(f"Failed to load image {image_path}: {e}")
+        return Image.new('RGB', size, color='gray')
+
+    # Keyed by path and size only, so a changed source replaces its old entry.
+    _memory[memo_key] = (key, img)
+    return img
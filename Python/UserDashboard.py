@@ -1,8 +1,5 @@
-import hashlib
 import os
 import re
-import shutil
-import json
 from typing import Optional
 import tkinter as tk
 from tkcalendar import Calendar
@@ -10,79 +7,38 @@ from datetime import datetime, date
 import customtkinter as ctk
 from PIL import Image
 from tkinter import messagebox, filedialog
+from Storage import open_storage
+from Assets import IconRegistry
+from Availability import FULL_MASK, SLOT_LABELS
+from Reservations import SlotConflict
+from Search import DoctorIndex
+from Services import AccountNotFound, DuplicateAccount, ServiceError, is_bookable, open_services
+from Events import BOOKED, EventBus
+from Metrics import metrics
+from Watcher import DataWatcher
+from Worker import IOExecutor
+from Thumbnails import CARD_SIZE, BOOKING_SIZE, get_thumbnail
 
 def create_account():
     bannerImg.pack_forget()
     loginMainFrame.pack_forget()
     signupMainFrame.pack(expand=True)
 
-def email_exists(email):
-    for directory in [user_dir, admin_dir]:
-        for file in os.listdir(directory):
-            if file.lower() == f"{email}.json":
-                return True
-
-    for folder in os.listdir(doctor_dir):
-        folder_path = os.path.join(doctor_dir, folder)
-        if os.path.isdir(folder_path):
-            profile_path = os.path.join(folder_path, 'profile.json')
-            if os.path.exists(profile_path):
-                try:
-                    with open(profile_path, 'r') as f:
-                        data = json.load(f)
-                        if data.get("Email", "").lower() == email:
-                            return True
-                except json.JSONDecodeError:
-                    continue
-    return False
+def show_service_error(error):
+    if isinstance(error, DuplicateAccount):
+        messagebox.showwarning(error.title, str(error))
+    else:
+        messagebox.showerror(error.title, str(error))
 
 def signup_account():
-    name = nameEntry.get()
-    email = emailEntry.get().lower()
-    contact = contactEntry.get()
-    password = passwordEntry.get()
     role = roleVar.get()
 
-    if not all([name, email, contact, password, role]):
-        messagebox.showerror("Input Error", "All fields are required.")
-        return
-
-    if not is_valid_email(email):
-        messagebox.showerror("Invalid Email", "Please enter a valid email address.")
-        return
-
-    if not is_strong_password(password):
-        messagebox.showerror(
-            "Weak Password","Password must include at least one uppercase letter, one number, and one special character.")
-        return
-
-    if email_exists(email):
-        messagebox.showwarning("Duplicate", "This email is already registered, Please use another one.")
-        return
-
-    if role == "User":
-        filepath = os.path.join(user_dir, f"{email}.json")
-    elif role == "Admin":
-        filepath = os.path.join(admin_dir, f"{email}.json")
-    elif role == "Doctor":
-        folder = os.path.join(doctor_dir, email)
-        os.makedirs(folder, exist_ok=True)
-        filepath = os.path.join(folder, 'profile.json')
-    else:
-        messagebox.showerror("Role Error", "Unknown account type.")
-        return
-
-    account_data = {
-        "Full Name": name,
-        "Email": email,
-        "Contact": contact,
-        "Password": hash_password(password),
-        "Account Type": role
-    }
-
-    with open(filepath, 'w') as file:
-        json.dump(account_data, file, indent=4)
+    signupButton.configure(state="disabled", text="Creating account...")
+    io_executor.submit(account_service.signup, nameEntry.get(), emailEntry.get(), contactEntry.get(),
+                       passwordEntry.get(), role, on_done=lambda _: finish_signup(role), on_error=signup_failed)
 
+def finish_signup(role):
+    signupButton.configure(state="normal", text="Create Account")
     for entry in [nameEntry, emailEntry, contactEntry, passwordEntry]:
         entry.delete(0, 'end')
     roleVar.set("User")
@@ -93,15 +49,12 @@ def signup_account():
     signupMainFrame.pack_forget()
     loginMainFrame.pack(expand=True)
 
-def is_strong_password(password):
-    return (
-        any(c.isupper() for c in password) and
-        any(c.isdigit() for c in password) and
-        any(c in "!@#$%^&*()-_=+[]{};:,<.>/?\\" for c in password)
-    )
-
-def is_valid_email(email):
-    return "@" in email and "." in email
+def signup_failed(error):
+    signupButton.configure(state="normal", text="Create Account")
+    if isinstance(error, ServiceError):
+        show_service_error(error)
+        return
+    messagebox.showerror("Registration Failed", f"Failed to save account:\n{error}")
 
 def validate_contact(p):
     return (p.isdigit() and len(p) <= 11) or p == ""
@@ -142,100 +95,160 @@ def login_account():
 
 def verify_login():
     email = emailLogin.get().lower()
-    password = passwordLogin.get()
 
-    if not all([email, password]):
-        messagebox.showerror("Input Error", "Both fields are required.")
+    LoginButton.configure(state="disabled", text="Signing in...")
+    io_executor.submit(account_service.login, email, passwordLogin.get(),
+                       on_done=lambda account: finish_login(email, account), on_error=login_failed)
+
+def finish_login(email, account):
+    LoginButton.configure(state="normal", text="Login")
+    role, data = account
+    messagebox.showinfo("Login Successful", f"Welcome back, {data['Full Name']}!")
+
+    current_user["email"] = email
+    current_user["role"] = role
+    if role == "Doctor":
+        current_user["name"] = data.get("Full Name")
+    loginMainFrame.pack_forget()
+    createButton.pack_forget()
+    loginButtonHeader.pack_forget()
+
+    ensure_role_view(role)
+    for handler in role_views[role]:
+        appointment_events.subscribe(handler)
+
+    if role == "User":
+        userMainFrame.pack(fill='both', expand=True)
+    elif role == "Admin":
+        adminLabel.pack(side='left', padx=(10, 0), pady=10)
+        adminMainFrame.pack(fill='both', expand=True)
+    elif role == "Doctor":
+        doctorLabel.pack(side='left', padx=(10, 0), pady=10)
+        doctorMainFrame.pack(fill='both', expand=True)
+    load_role_appointments(role)
+
+    logoutButton.pack(side="right")
+    emailLogin.delete(0, 'end')
+    passwordLogin.delete(0, 'end')
+
+def login_failed(error):
+    LoginButton.configure(state="normal", text="Login")
+    if isinstance(error, AccountNotFound):
+        if messagebox.askyesno(error.title, str(error)):
+            loginFrame.pack_forget()
+            create_account()
+        return
+    if isinstance(error, ServiceError):
+        show_service_error(error)
         return
+    messagebox.showerror("Login Failed", f"Failed to read account:\n{error}")
 
-    for role, directory in [("User", user_dir), ("Admin", admin_dir), ("Doctor", doctor_dir)]:
-        filepath = os.path.join(directory, f"{email}.json") if role != "Doctor" else os.path.join(directory, email, 'profile.json')
-        if os.path.exists(filepath):
-            with open(filepath, 'r') as file:
-                data = json.load(file)
-            if check_password(data["Password"], password):
-                messagebox.showinfo("Login Successful", f"Welcome back, {data['Full Name']}!")
-
-                current_user["email"] = email
-                current_user["role"] = role
-                if role == "Doctor":
-                    current_user["name"] = data.get("Full Name")
-                loginMainFrame.pack_forget()
-                createButton.pack_forget()
-                loginButtonHeader.pack_forget()
-
-                if role == "User":
-                    userMainFrame.pack(fill='both', expand=True)
-                    load_user_appointments()
-                    load_user_bookings()
-                elif role == "Admin":
-                    adminLabel.pack(side='left', padx=(10, 0), pady=10)
-                    adminMainFrame.pack(fill='both', expand=True)
-                    load_admin_appointments()
-                    load_admin_bookings()
-                elif role == "Doctor":
-                    doctorLabel.pack(side='left', padx=(10, 0), pady=10)
-                    doctorMainFrame.pack(fill='both', expand=True)
-                    load_doctor_appointments()
-                    load_doctor_dashboard()
-
-
-                logoutButton.pack(side="right")
-                emailLogin.delete(0, 'end')
-                passwordLogin.delete(0, 'end')
-                return
-            else:
-                messagebox.showerror("Login Failed", "Incorrect password.")
-                return
+def ensure_role_view(role):
+    if role not in role_main_frames:
+        role_builders[role]()
 
-    if messagebox.askyesno("Account Not Found", "Email not found. Would you like to register?"):
-        loginFrame.pack_forget()
-        create_account()
+def show_page(name):
+    role = current_user["role"]
+    pages = role_pages[role]
+    for page, frame in pages.items():
+        if page != name:
+            frame.pack_forget()
+    pages[name].pack(side='left', fill='both', expand=True)
 
-def show_dashboard(event):
-    userAppointmentFrame.pack_forget()
-    userMakeAppointmentFrame.pack_forget()
-    adminAppointmentFrame.pack_forget()
-    adminAddDoctorFrame.pack_forget()
-    adminDoctorListFrame.pack_forget()
-    doctorAppointmentFrame.pack_forget()
-    userDashboardFrame.pack(side='left', fill='both', expand=True)
-    adminDashboardFrame.pack(side='left', fill='both', expand=True)
-    doctorDashboardFrame.pack(side='left', fill='both', expand=True)
+    if (role, name) in page_loaders and (role, name) not in loaded_pages:
+        loaded_pages.add((role, name))
+        start_doctor_watcher()
+        page_loaders[(role, name)]()
 
+def show_dashboard(event):
+    show_page("dashboard")
 
 def show_appointment(event):
-    userDashboardFrame.pack_forget()
-    userMakeAppointmentFrame.pack_forget()
-    adminDashboardFrame.pack_forget()
-    adminAddDoctorFrame.pack_forget()
-    adminDoctorListFrame.pack_forget()
-    doctorDashboardFrame.pack_forget()
-    userAppointmentFrame.pack(side='left', fill='both', expand=True)
-    adminAppointmentFrame.pack(side='left', fill='both', expand=True)
-    doctorAppointmentFrame.pack(side='left', fill='both', expand=True)
+    show_page("appointments")
 
 def show_make_appointment(event):
-    userDashboardFrame.pack_forget()
-    userAppointmentFrame.pack_forget()
-    adminDashboardFrame.pack_forget()
-    adminAppointmentFrame.pack_forget()
-    adminDoctorListFrame.pack_forget()
-    userMakeAppointmentFrame.pack(side='left', fill='both', expand=True)
-    adminAddDoctorFrame.pack(side='left', fill='both', expand=True)
+    show_page("make")
 
 def show_doctors_list(event):
-    adminDashboardFrame.pack_forget()
-    adminAddDoctorFrame.pack_forget()
-    adminAppointmentFrame.pack_forget()
-    adminDoctorListFrame.pack(side='left', fill='both', expand=True)
+    show_page("doctors")
 
 
 def show_frame(name):
+    global current_specialty
+
+    current_specialty = name
+    searchResultsFrame.pack_forget()
     for frame in doctor_frames.values():
         frame.pack_forget()
     doctor_frames[name].pack(side='top', anchor='w', padx=20, pady=20)
 
+def select_specialty(name):
+    clear_search_inputs()
+    show_frame(name)
+
+def clear_search_inputs():
+    searchEntry.delete(0, 'end')
+    for entry in search_ranges.values():
+        entry.delete(0, 'end')
+    availableOnlyVar.set(False)
+
+def clear_search():
+    clear_search_inputs()
+    show_frame(current_specialty)
+
+def search_range(field):
+    low, high = (search_ranges[(field, bound)].get() for bound in ("Min", "Max"))
+    return int(low) if low else None, int(high) if high else None
+
+@metrics.timed()
+def run_search():
+    query = searchEntry.get().strip()
+    fee = search_range("Fee")
+    experience = search_range("Experience")
+    available_only = availableOnlyVar.get()
+
+    if not query and fee == (None, None) and experience == (None, None) and not available_only:
+        show_frame(current_specialty)
+        return
+
+    show_search_results(doctor_index.search(query, fee, experience, available_only))
+
+@metrics.timed()
+def show_search_results(keys):
+    global search_empty_label
+
+    for frame in doctor_frames.values():
+        frame.pack_forget()
+    searchResultsFrame.pack(side='top', anchor='w', padx=20, pady=20)
+
+    shown = keys[:search_result_limit]
+    if len(shown) < len(keys):
+        searchResultsLabel.configure(text=f"Search Results (showing {len(shown)} of {len(keys)})")
+    else:
+        searchResultsLabel.configure(text=f"Search Results ({len(keys)})")
+
+    for tile in search_tiles.values():
+        tile.grid_forget()
+    if search_empty_label is not None:
+        search_empty_label.destroy()
+        search_empty_label = None
+
+    if not keys:
+        search_empty_label = ctk.CTkLabel(searchResultsGrid, text="No doctors match your search.",
+                                          font=('Bahnschrift', 16, 'italic'), text_color='gray')
+        search_empty_label.grid(row=0, column=0, padx=20, pady=20)
+        return
+
+    columns = max(1, width // 330)
+    for i, key in enumerate(shown):
+        # Tiles are kept between keystrokes so typing only re-grids them.
+        tile = search_tiles.get(key)
+        if tile is None:
+            profile, img_path, img = doctor_entries[key]
+            tile = create_doctor_tile(searchResultsGrid, profile, img_path, img)
+            search_tiles[key] = tile
+        tile.grid(row=i // columns, column=i % columns, padx=10, pady=10, sticky='n')
+
 def select_image():
     global uploaded_image_path, current_image
 
@@ -249,8 +262,8 @@ def select_image():
         return
 
     try:
-        img = Image.open(file_path).resize((230, 300))
-        new_ctk_image = ctk.CTkImage(dark_image=img, light_image=img, size=(230, 300))
+        img = Image.open(file_path).resize(BOOKING_SIZE)
+        new_ctk_image = ctk.CTkImage(dark_image=img, light_image=img, size=BOOKING_SIZE)
 
         image_label.configure(image=new_ctk_image, text="")
         image_label.image = new_ctk_image
@@ -267,74 +280,25 @@ def select_image():
 
 
 def save_doctor():
-    global uploaded_image_path, current_image
+    fields = {key: entry.get() for key, entry in entries.items()}
+    fields["About"] = about_textbox.get("1.0", "end")
+    if fields["Specialty"] == "Select specialty":
+        fields["Specialty"] = ""
 
-    name = entries["Full Name"].get().strip()
-    email = entries["Email"].get().strip().lower()
-    password = entries["Password"].get().strip()
-    experience = entries["Experience"].get().strip()
-    fee = entries["Fee"].get().strip()
-    specialty = entries["Specialty"].get().strip()
-    address = entries["Address"].get().strip()
-    about = about_textbox.get("1.0", "end").strip()
-
-    if specialty == "Select specialty":
-        specialty = ""
-
-    if not all([name, email, password, experience, fee, specialty, address, about]):
-        messagebox.showerror("Input Error", "All fields are required.")
-        return
+    submit_btn.configure(state="disabled", text="Saving...")
+    io_executor.submit(doctor_service.add, fields, uploaded_image_path,
+                       on_done=finish_save_doctor, on_error=save_doctor_failed)
 
-    if not is_valid_email(email):
-        messagebox.showerror("Invalid Email", "Enter a valid email.")
-        return
-
-    if not is_strong_password(password):
-        messagebox.showerror(
-            "Weak Password", "Password must include at least one uppercase letter, one number, and one special character."
-        )
-        return
-
-    for existing_folder in os.listdir(doctor_dir):
-        existing_path = os.path.join(doctor_dir, existing_folder, 'profile.json')
-        if os.path.exists(existing_path):
-            with open(existing_path, 'r') as file:
-                existing_data = json.load(file)
-                if existing_data.get("Full Name") == name or existing_data.get("Email") == email:
-                    messagebox.showwarning("Duplicate", "This name or email is already registered.")
-                    return
-
-    doctor_folder = os.path.join(doctor_dir, email)
-    os.makedirs(doctor_folder, exist_ok=True)
-    profile_path = os.path.join(doctor_folder, 'profile.json')
-
-    image_name = ""
-    if uploaded_image_path:
-        image_name = os.path.basename(uploaded_image_path)
-
-    doctor_data = {
-        "Full Name": name,
-        "Email": email,
-        "Password": hash_password(password),
-        "Experience": experience,
-        "Fee": fee,
-        "Specialty": specialty,
-        "Address": address,
-        "About": about,
-        "Availability": "Available",
-        "Image": image_name
-    }
-
-    with open(profile_path, 'w') as file:
-        json.dump(doctor_data, file, indent=4)
+def finish_save_doctor(result):
+    global uploaded_image_path, current_image
 
-    if uploaded_image_path:
-        try:
-            doctor_image_path = os.path.join(doctor_folder, image_name)
-            shutil.copy(uploaded_image_path, doctor_image_path)
-            messagebox.showinfo("Success", "Doctor added successfully with image.")
-        except Exception as e:
-            messagebox.showerror("Image Error", f"Failed to save the image: {e}")
+    submit_btn.configure(state="normal", text="Add Doctor")
+    has_image, thumbnail_error = result
+    if thumbnail_error is not None:
+        messagebox.showwarning("Thumbnail Warning",
+                               f"Doctor saved, but the thumbnail could not be generated:\n{thumbnail_error}")
+    elif has_image:
+        messagebox.showinfo("Success", "Doctor added successfully with image.")
 
     for key, entry in entries.items():
         if key == "Specialty":
@@ -348,89 +312,98 @@ def save_doctor():
     uploaded_image_path = None
     current_image = None
 
-def compute_doctor_hash():
-    doctor_folders = sorted([f for f in os.listdir(doctor_dir) if os.path.isdir(os.path.join(doctor_dir, f))])
-    return hashlib.md5("".join(doctor_folders).encode()).hexdigest(), doctor_folders
-
+def save_doctor_failed(error):
+    submit_btn.configure(state="normal", text="Add Doctor")
+    if isinstance(error, ServiceError):
+        show_service_error(error)
+        return
+    messagebox.showerror("Save Error", f"Failed to save doctor:\n{error}")
 
 def load_doctors(scrollable,force_refresh=False):
-    global last_doctor_hash
+    global doctor_load_token, doctor_empty_label
+
+    doctor_load_token += 1
+    token = doctor_load_token
+    if not doctor_cards and doctor_empty_label is None:
+        doctor_empty_label = ctk.CTkLabel(scrollable, text="Loading doctors...", font=('Bahnschrift', 16, 'italic'))
+        doctor_empty_label.grid(row=0, column=0, pady=20)
+
+    io_executor.submit(doctor_service.read_cards, last_doctor_stamps, force_refresh,
+                       on_done=lambda result: show_doctor_cards(scrollable, token, force_refresh, *result))
+
 
-    current_hash, doctor_folders = compute_doctor_hash()
+@metrics.timed()
+def show_doctor_cards(scrollable, token, force_refresh, current_hash, stamps, updates):
+    global last_doctor_hash, last_doctor_stamps, doctor_empty_label
 
+    if token != doctor_load_token:
+        return
     if not force_refresh and current_hash == last_doctor_hash:
-        scrollable.after(1000, lambda: load_doctors(scrollable))
         return
 
     last_doctor_hash = current_hash
+    last_doctor_stamps = stamps
+    doctor_folders = sorted(stamps)
 
-    existing_cards = scrollable.winfo_children()
-
-    for widget in existing_cards:
-        widget.destroy()
+    for folder in list(doctor_cards):
+        if folder not in doctor_folders:
+            doctor_cards.pop(folder).destroy()
 
     if not doctor_folders:
-        ctk.CTkLabel(scrollable, text="No doctors found.", font=('Bahnschrift', 16, 'italic')).pack(pady=20)
+        if doctor_empty_label is None:
+            doctor_empty_label = ctk.CTkLabel(scrollable, text="No doctors found.", font=('Bahnschrift', 16, 'italic'))
+            doctor_empty_label.grid(row=0, column=0, pady=20)
+        doctor_empty_label.configure(text="No doctors found.")
         return
 
+    if doctor_empty_label is not None:
+        doctor_empty_label.destroy()
+        doctor_empty_label = None
+
     window_width = scrollable.winfo_screenwidth()
     max_columns = max(1, window_width // 350)
 
-    for i, folder in enumerate(doctor_folders):
-        folder_path = os.path.join(doctor_dir, folder)
-        profile_path = os.path.join(folder_path, 'profile.json')
-
-        if not os.path.exists(profile_path):
-            continue
-
-        with open(profile_path, 'r') as file:
-            profile = json.load(file)
-
-        doctor_name = profile.get("Full Name", "Unknown")
-        doctor_specialty = profile.get("Specialty", "Not Specified")
-        availability = profile.get("Availability", "Unknown")
-
-        img_path = next((os.path.join(folder_path, f) for f in os.listdir(folder_path)
-                         if f.lower().endswith(('.png', '.jpg', '.jpeg', '.gif'))), None)
-
-        try:
-            img = Image.open(img_path).resize((230, 220)) if img_path else Image.new('RGB', (230, 220), color='gray')
-        except:
-            img = Image.new('RGB', (230, 220), color='gray')
-
-        photo = ctk.CTkImage(light_image=img, size=(230, 220))
-
-        card = ctk.CTkFrame(scrollable, width=300, height=330, fg_color='#f6f6f6', corner_radius=12)
-        card.pack_propagate(False)
-        card.grid(row=i // max_columns, column=i % max_columns, padx=10, pady=10, sticky='nsew')
+    i = 0
+    for folder in doctor_folders:
+        card = doctor_cards.get(folder)
 
-        ctk.CTkLabel(card, image=photo, text="").pack(pady=(10, 5))
-        text_wrapper = ctk.CTkFrame(card, fg_color=color2, corner_radius=8)
-        text_wrapper.pack(fill='both', expand=True)
+        if folder in updates:
+            profile, image = updates[folder]
+            if profile is None:
+                if card is not None:
+                    doctor_cards.pop(folder).destroy()
+                continue
 
-        ctk.CTkLabel(text_wrapper, text=doctor_name, font=('Bahnschrift', 18, 'bold'),
-                     text_color='white', anchor='w', wraplength=200).pack(fill='x', padx=13, pady=(5, 0))
-        ctk.CTkLabel(text_wrapper, text=doctor_specialty, font=('Bahnschrift', 13),
-                     text_color='white', anchor='w', wraplength=140).pack(fill='x', padx=13)
-        ctk.CTkLabel(text_wrapper, text=f"Status: {availability}", font=('Bahnschrift', 14),
-                     text_color="#4CAF50" if availability.lower() == "available" else "white",
-                     anchor='w', wraplength=140).pack(fill='x', padx=13)
+            if card is None:
+                card = DoctorCard(scrollable, folder)
+                doctor_cards[folder] = card
+            card.update_profile(profile, image)
+        elif card is None:
+            continue
 
-        var = ctk.BooleanVar()
-        check = ctk.CTkCheckBox(card, text="", variable=var)
-        check.place(relx=0.88, rely=0.02)
-        checkboxes.append((check, folder))
+        card.place_at(i // max_columns, i % max_columns)
+        i += 1
 
     for col in range(max_columns):
         scrollable.grid_columnconfigure(col, weight=1)
 
-    scrollable.after(5000, lambda: load_doctors(scrollable))
+def start_doctor_watcher():
+    global doctor_watcher
+
+    if doctor_watcher is None:
+        doctor_watcher = DataWatcher(window, accounts, on_doctors_changed, io_executor)
+        doctor_watcher.start()
 
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+def on_doctors_changed(events):
+    if ("Admin", "doctors") in loaded_pages:
+        load_doctors(adminDoctorFrame)
+    if ("User", "make") in loaded_pages:
+        load_doctors_to_categories()
 
-def check_password(stored_hash, entered_password):
-    return stored_hash == hash_password(entered_password)
+def refresh_doctor_lists():
+    if doctor_watcher is not None:
+        doctor_watcher.sync()
+    on_doctors_changed([])
 
 def is_numeric(value):
     return value.isdigit() or value == ""
@@ -438,10 +411,10 @@ def is_numeric(value):
 def logout_account():
     current_user["email"] = None
     current_user["role"] = None
+    appointment_events.clear()
 
-    userMainFrame.pack_forget()
-    adminMainFrame.pack_forget()
-    doctorMainFrame.pack_forget()
+    for main_frame in role_main_frames.values():
+        main_frame.pack_forget()
     adminLabel.pack_forget()
     doctorLabel.pack_forget()
 
@@ -472,6 +445,306 @@ class TimeButton(ctk.CTkButton):
         colors = self.selected_colors if self.selected else self.default_colors
         self.configure(fg_color=colors["fg"], text_color=colors["text"])
 
+class DoctorCard(ctk.CTkFrame):
+    def __init__(self, master, folder, *args, **kwargs):
+        super().__init__(master, *args, width=300, height=330, fg_color='#f6f6f6', corner_radius=12, **kwargs)
+        self.pack_propagate(False)
+        self.folder = folder
+        self.profile = None
+        self.image = None
+        self.position = None
+
+        self.image_label = ctk.CTkLabel(self, text="")
+        self.image_label.pack(pady=(10, 5))
+        text_wrapper = ctk.CTkFrame(self, fg_color=color2, corner_radius=8)
+        text_wrapper.pack(fill='both', expand=True)
+
+        self.name_label = ctk.CTkLabel(text_wrapper, font=('Bahnschrift', 18, 'bold'),
+                                       text_color='white', anchor='w', wraplength=200)
+        self.name_label.pack(fill='x', padx=13, pady=(5, 0))
+        self.specialty_label = ctk.CTkLabel(text_wrapper, font=('Bahnschrift', 13),
+                                            text_color='white', anchor='w', wraplength=140)
+        self.specialty_label.pack(fill='x', padx=13)
+        self.status_label = ctk.CTkLabel(text_wrapper, font=('Bahnschrift', 14), anchor='w', wraplength=140)
+        self.status_label.pack(fill='x', padx=13)
+
+        self.check = ctk.CTkCheckBox(self, text="", variable=ctk.BooleanVar())
+        self.check.place(relx=0.88, rely=0.02)
+        metrics.count("doctor cards built")
+
+    def update_profile(self, profile, image):
+        if image is not self.image:
+            self.image = image
+            photo = ctk.CTkImage(light_image=image, size=CARD_SIZE)
+            self.image_label.configure(image=photo)
+
+        if profile == self.profile:
+            return
+        self.profile = profile
+
+        availability = profile.get("Availability", "Unknown")
+        self.name_label.configure(text=profile.get("Full Name", "Unknown"))
+        self.specialty_label.configure(text=profile.get("Specialty", "Not Specified"))
+        self.status_label.configure(text=f"Status: {availability}",
+                                    text_color="#4CAF50" if availability.lower() == "available" else "white")
+
+    def place_at(self, row, column):
+        if self.position != (row, column):
+            self.position = (row, column)
+            self.grid(row=row, column=column, padx=10, pady=10, sticky='nsew')
+
+class HistoryTable(ctk.CTkFrame):
+    row_height = 70
+    buffer = 2
+
+    def __init__(self, master, weights, *args, **kwargs):
+        super().__init__(master, *args, fg_color='white', **kwargs)
+        self.weights = weights
+        self.rows = []
+        self.positions = {}
+        self.first = 0
+        self.pool = []
+        self.loading = False
+
+        self.body = ctk.CTkFrame(self, fg_color='white')
+        self.body.pack(side='left', fill='both', expand=True)
+        self.body.grid_propagate(False)
+        for column, weight in enumerate(weights):
+            self.body.grid_columnconfigure(column, weight=weight)
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.on_scrollbar)
+        self.scrollbar.pack(side='right', fill='y')
+
+        self.body.bind('<Configure>', lambda e: self.render())
+        self.bind_wheel(self.body)
+
+    def bind_wheel(self, widget):
+        widget.bind('<MouseWheel>', lambda e: self.scroll_to(self.first - (1 if e.delta > 0 else -1)))
+        widget.bind('<Button-4>', lambda e: self.scroll_to(self.first - 1))
+        widget.bind('<Button-5>', lambda e: self.scroll_to(self.first + 1))
+
+    def visible_count(self):
+        return max(1, self.body.winfo_height() // self.row_height)
+
+    def ensure_pool(self, count):
+        while len(self.pool) < count:
+            row = len(self.pool)
+            self.body.grid_rowconfigure(row, minsize=self.row_height)
+            labels = []
+            for column in range(len(self.weights)):
+                label = ctk.CTkLabel(self.body, text="", font=('Bahnschrift', 14), text_color='black',
+                                     fg_color='white', anchor='w', justify='left')
+                label.grid(row=row, column=column, sticky='w', padx=10, pady=5)
+                self.bind_wheel(label)
+                labels.append(label)
+            self.pool.append(labels)
+            metrics.count("history rows built")
+
+    def show_loading(self):
+        self.rows = []
+        self.positions = {}
+        self.first = 0
+        self.loading = True
+        self.render()
+
+    def set_rows(self, rows):
+        self.loading = False
+        self.rows = [(values, status) for _, values, status in rows]
+        self.positions = {appointment_id: i for i, (appointment_id, _, _) in enumerate(rows)}
+        self.first = 0
+        self.render()
+
+    def append_row(self, appointment_id, values, status):
+        if appointment_id in self.positions:
+            self.update_status(appointment_id, status)
+            return
+        self.positions[appointment_id] = len(self.rows)
+        self.rows.append((values, status))
+        self.render()
+
+    def update_status(self, appointment_id, status):
+        index = self.positions.get(appointment_id)
+        if index is None:
+            return
+        self.rows[index] = (self.rows[index][0], status)
+        if self.first <= index < self.first + len(self.pool):
+            self.render()
+
+    def on_scrollbar(self, action, value, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(value) * len(self.rows)))
+        elif action == 'scroll':
+            step = self.visible_count() if unit == 'pages' else 1
+            self.scroll_to(self.first + int(float(value)) * step)
+
+    def scroll_to(self, first):
+        first = max(0, min(first, len(self.rows) - self.visible_count()))
+        if first != self.first:
+            self.first = first
+            self.render()
+
+    def render(self):
+        visible = self.visible_count()
+        self.ensure_pool(visible + self.buffer)
+
+        for k, labels in enumerate(self.pool):
+            index = self.first + k
+            if index < len(self.rows):
+                values, status = self.rows[index]
+                texts = [str(index + 1)] + values + [status]
+                colors = ['black'] * (len(texts) - 1) + [status_colors.get(status, 'gray')]
+            else:
+                texts = [""] * len(labels)
+                colors = ['black'] * len(labels)
+                if self.loading and k == 0:
+                    texts[1] = "Loading..."
+
+            for label, text, color in zip(labels, texts, colors):
+                if label.cget("text") != text or label.cget("text_color") != color:
+                    label.configure(text=text, text_color=color)
+
+        total = max(1, len(self.rows))
+        self.scrollbar.set(self.first / total, min(1.0, (self.first + visible) / total))
+
+class BookingPager:
+    page_size = 20
+
+    def __init__(self, frame, add_card):
+        self.frame = frame
+        self.add_card = add_card
+        self.cards = {}
+        self.filters = {}
+        self.after = None
+        self.exhausted = True
+        self.loading = False
+        self.generation = 0
+        self.placeholder = ctk.CTkLabel(frame, text="Loading...", font=('Bahnschrift', 16, 'italic'), text_color='gray')
+        frame._parent_canvas.configure(yscrollcommand=self.on_scroll)
+
+    def on_scroll(self, first, last):
+        self.frame._scrollbar.set(first, last)
+        if float(last) > 0.9 and not self.exhausted and not self.loading:
+            self.load_page()
+
+    def set_loading(self, loading):
+        self.loading = loading
+        if loading:
+            self.placeholder.pack(pady=20)
+        else:
+            self.placeholder.pack_forget()
+
+    def clear(self):
+        self.generation += 1
+        for card in self.cards.values():
+            card.destroy()
+        self.cards.clear()
+        self.after = None
+        self.exhausted = True
+        self.set_loading(True)
+
+    def reset(self, **filters):
+        self.clear()
+        self.filters = filters
+        self.exhausted = False
+        self.load_page()
+
+    def load_page(self):
+        generation = self.generation
+        self.set_loading(True)
+        io_executor.submit(self.fetch_page, self.after, self.filters,
+                           on_done=lambda page: self.show_page(generation, page))
+
+    @metrics.timed("fetch_booking_page")
+    def fetch_page(self, after, filters):
+        return appointment_service.ongoing_page(after, self.page_size, **filters)
+
+    @metrics.timed("show_booking_page")
+    def show_page(self, generation, page):
+        if generation != self.generation:
+            return
+
+        self.set_loading(False)
+        for appointment_id, data in page:
+            self.cards[appointment_id] = self.add_card(appointment_id, data)
+        if page:
+            self.after = page[-1][0]
+        self.exhausted = len(page) < self.page_size
+
+    def append(self, appointment_id, data):
+        if self.exhausted and not self.loading and appointment_id not in self.cards:
+            self.cards[appointment_id] = self.add_card(appointment_id, data)
+            self.after = appointment_id
+
+    def remove(self, appointment_id):
+        card = self.cards.pop(appointment_id, None)
+        if card is not None:
+            card.destroy()
+
+def count_widgets(widget):
+    return sum(1 + count_widgets(child) for child in widget.winfo_children())
+
+class MetricsOverlay(ctk.CTkFrame):
+    refresh_interval = 1000
+
+    def __init__(self, master, dump_path, *args, **kwargs):
+        super().__init__(master, *args, fg_color='#101820', corner_radius=10, **kwargs)
+        self.dump_path = dump_path
+        self.visible = False
+        self.pending = None
+
+        self.text = ctk.CTkTextbox(self, width=560, height=440, font=('Consolas', 12),
+                                   fg_color='#101820', text_color='#d0f0d0', wrap='none')
+        self.text.pack(padx=10, pady=(10, 5))
+        buttons = ctk.CTkFrame(self, fg_color='transparent')
+        buttons.pack(fill='x', padx=10, pady=(0, 10))
+        ctk.CTkButton(buttons, text='Dump to file', width=110, fg_color=color2, command=self.dump).pack(side='left')
+        ctk.CTkButton(buttons, text='Reset', width=70, fg_color=color2, command=self.reset).pack(side='left', padx=5)
+        self.status = ctk.CTkLabel(buttons, text='', text_color='gray', font=('Bahnschrift', 12))
+        self.status.pack(side='left', padx=10)
+
+    def toggle(self, event=None):
+        self.visible = not self.visible
+        if self.visible:
+            self.place(relx=1.0, y=110, x=-20, anchor='ne')
+            self.lift()
+            self.refresh()
+        else:
+            self.place_forget()
+            if self.pending is not None:
+                self.after_cancel(self.pending)
+                self.pending = None
+
+    def refresh(self):
+        snapshot = metrics.snapshot()
+        lines = [f"{'timer':<30}{'calls':>7}{'mean ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+        for name, timing in snapshot["timings"].items():
+            lines.append(f"{name:<30}{timing['count']:>7}{timing['mean_ms']:>10.2f}"
+                         f"{timing['p95_ms']:>10.2f}{timing['max_ms']:>10.2f}")
+        lines.append("")
+        for name, value in snapshot["counters"].items():
+            lines.append(f"{name:<30}{value:>10}")
+        lines.append(f"{'widgets alive':<30}{count_widgets(self.master):>10}")
+
+        self.text.configure(state='normal')
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", "\n".join(lines))
+        self.text.configure(state='disabled')
+        self.lift()
+        self.pending = self.after(self.refresh_interval, self.refresh)
+
+    def dump(self):
+        try:
+            metrics.dump(self.dump_path)
+        except OSError as e:
+            self.status.configure(text=f"Dump failed: {e}")
+            return
+        self.status.configure(text=f"Appended to {self.dump_path}")
+
+    def reset(self):
+        metrics.reset()
+        self.status.configure(text="Counters reset")
+
+@metrics.timed()
 def create_booking_frame(parent, profile, image):
     frame = ctk.CTkScrollableFrame(parent, fg_color=color2)
 
@@ -479,7 +752,7 @@ def create_booking_frame(parent, profile, image):
     topContentFrame.pack(fill='x', pady=10)
 
     doctor_img = ctk.CTkLabel(topContentFrame, width=230, height=300,
-                              image=ctk.CTkImage(light_image=image, size=(230, 300)),
+                              image=ctk.CTkImage(light_image=image, size=BOOKING_SIZE),
                               text="", corner_radius=10, fg_color='white')
     doctor_img.pack(side='left', padx=20)
 
@@ -556,34 +829,63 @@ def create_booking_frame(parent, profile, image):
 
     ctk.CTkLabel(gridFrame, text="Select Time", font=('Bahnschrift', 18, 'bold'), text_color='black').grid(row=0, column=0, columnspan=4, sticky='w', pady=(0, 10))
 
+    nextAvailableLabel = ctk.CTkLabel(gridFrame, text="", font=('Bahnschrift', 14), text_color=color2, cursor='hand2')
+    nextAvailableLabel.grid(row=5, column=0, columnspan=4, sticky='w', pady=(10, 0))
+    next_available = {"date": None}
+
     time_buttons = []
+    slot_request = {"token": 0}
+
+    def read_time_slots(doctor_name, selected_date):
+        blocked = appointment_service.blocked_slots(doctor_name, selected_date)
+        following = appointment_service.next_available(doctor_name, selected_date) if blocked == FULL_MASK else None
+        return blocked, following
 
     def refresh_time_buttons(selected_date):
+        # The store lock can be held through a sweep's disk writes, so the bitmask is read off the Tk thread.
+        slot_request["token"] += 1
+        token = slot_request["token"]
+        nextAvailableLabel.configure(text="Loading times...")
+        io_executor.submit(read_time_slots, profile.get("Full Name", "Unknown"), selected_date,
+                           on_done=lambda result: show_time_buttons(token, *result))
+
+    @metrics.timed("refresh_time_buttons")
+    def show_time_buttons(token, blocked, following):
         nonlocal time_buttons
+        if token != slot_request["token"] or not gridFrame.winfo_exists():
+            return
         for child in gridFrame.winfo_children():
             if isinstance(child, TimeButton):
                 child.destroy()
         time_buttons.clear()
 
-        booked = get_booked_times(profile.get("Full Name", "Unknown"), selected_date)
-
-        selected_is_today = selected_date == date.today().strftime('%Y-%m-%d')
-        current_hour = datetime.now().hour
-        current_minute = datetime.now().minute
-
-        for i, hour in enumerate(range(8, 23)):
-            label = f"{hour % 12 or 12}:00 {'AM' if hour < 12 else 'PM'}"
+        for i, label in enumerate(SLOT_LABELS):
             btn = TimeButton(gridFrame, time_text=label)
 
-            if label in booked:
+            if blocked & (1 << i):
                 btn.configure(state="disabled")
-            elif selected_is_today:
-                if hour < current_hour or (hour == current_hour and 0 < current_minute):
-                    btn.configure(state="disabled")
 
             btn.grid(row=1 + i // 4, column=i % 4, padx=5, pady=5)
             time_buttons.append(btn)
 
+        next_available["date"] = None
+        if blocked == FULL_MASK:
+            next_available["date"] = following
+            if next_available["date"]:
+                nextAvailableLabel.configure(
+                    text=f"Fully booked. Next available: {format_booking_date(next_available['date'])}")
+            else:
+                nextAvailableLabel.configure(text="Fully booked for the next year.")
+        else:
+            nextAvailableLabel.configure(text="")
+
+    def jump_to_next_available(event=None):
+        if next_available["date"]:
+            calendar_widget.selection_set(next_available["date"])
+            refresh_time_buttons(next_available["date"])
+
+    nextAvailableLabel.bind("<Button-1>", jump_to_next_available)
+
     def on_date_change(event=None):
         selected_date = calendar_widget.get_date()
         today_str = date.today().strftime('%Y-%m-%d')
@@ -601,47 +903,29 @@ def create_booking_frame(parent, profile, image):
         selected_date = calendar_widget.get_date()
         selected_times = [btn.cget("text") for btn in time_buttons if btn.selected]
 
-        if not selected_times:
-            messagebox.showerror("No Time", "Please select a time slot.")
-            return
-
-        existing_files = [f for f in os.listdir(appointment_dir) if f.startswith("appointment") and f.endswith(".json")]
-        existing_numbers = []
-
-        for f in existing_files:
-            match = re.search(r'appointment(\d+)\.json', f)
-            if match:
-                existing_numbers.append(int(match.group(1)))
-
-        next_number = max(existing_numbers, default=0) + 1
-        filename = f"appointment{next_number}.json"
-        file_path = os.path.join(appointment_dir, filename)
-
-        doctor_fee = profile.get('Fee', 'Not Available')
-
-        appointment_data = {
-            "doctor": profile.get("Full Name", "Unknown"),
-            "user": current_user["email"],
-            "date": selected_date,
-            "time": selected_times,
-            "fee": doctor_fee,
-            "status": "Ongoing"
-        }
-
-        with open(file_path, 'w') as f:
-            json.dump(appointment_data, f, indent=4)
+        bookButton.configure(state="disabled", text="Booking...")
+        io_executor.submit(appointment_service.book, profile, current_user["email"], selected_date, selected_times,
+                           on_done=booking_saved, on_error=booking_failed)
 
+    def booking_saved(appointment_id):
         messagebox.showinfo("Appointment Booked", "Your appointment has been successfully booked.")
-        load_user_appointments()
-        load_user_bookings()
-        load_admin_bookings()
-        load_admin_appointments()
 
         userMakeAppointmentLabelFrame.pack(side='top', fill='x', padx=20, pady=(25, 0))
         show_frame("General Physician")
 
         frame.pack_forget()
 
+    def booking_failed(error):
+        bookButton.configure(state="normal", text="Book Appointment")
+        if isinstance(error, SlotConflict):
+            refresh_time_buttons(calendar_widget.get_date())
+            messagebox.showwarning("Time Slot Taken", f"{error}\nPlease choose another time.")
+            return
+        if isinstance(error, ServiceError):
+            show_service_error(error)
+            return
+        messagebox.showerror("Booking Failed", f"Failed to book appointment:\n{error}")
+
     def cancel_booking():
         userMakeAppointmentLabelFrame.pack(side='top', fill='x', padx=20, pady=(25, 0))
         show_frame("General Physician")
@@ -650,9 +934,10 @@ def create_booking_frame(parent, profile, image):
     buttonFrame = ctk.CTkFrame(frame, fg_color='transparent')
     buttonFrame.pack(pady=15)
 
-    ctk.CTkButton(buttonFrame, text="Book Appointment", fg_color='white', hover_color='#E0E0E0',
-                  text_color=color2, width=420, height=50, font=('Bahnschrift', 18, 'bold'),
-                  command=book_appointment).pack(side='left', padx=10)
+    bookButton = ctk.CTkButton(buttonFrame, text="Book Appointment", fg_color='white', hover_color='#E0E0E0',
+                               text_color=color2, width=420, height=50, font=('Bahnschrift', 18, 'bold'),
+                               command=book_appointment)
+    bookButton.pack(side='left', padx=10)
 
     ctk.CTkButton(buttonFrame, text="Cancel", fg_color='white', hover_color='#E0E0E0',
                   text_color=color2, width=420, height=50, font=('Bahnschrift', 18, 'bold'),
@@ -660,764 +945,423 @@ def create_booking_frame(parent, profile, image):
 
     return frame
 
-def open_doctor_booking(profile, image):
+def open_doctor_booking(profile, image_path):
     for f in doctor_frames.values():
         f.pack_forget()
+    searchResultsFrame.pack_forget()
     for widget in userMakeAppointmentFrame.winfo_children():
-        if widget not in doctor_frames.values() and widget != userMakeAppointmentLabelFrame:
+        if widget not in doctor_frames.values() and widget not in (userMakeAppointmentLabelFrame, searchResultsFrame):
             widget.destroy()
     userMakeAppointmentLabelFrame.pack_forget()
-    booking_frame = create_booking_frame(userMakeAppointmentFrame, profile, image)
+    booking_frame = create_booking_frame(userMakeAppointmentFrame, profile, get_thumbnail(image_path, BOOKING_SIZE))
     booking_frame.pack(fill='both', expand=True,padx=20,pady=20)
 
 def load_doctors_to_categories():
-    for frame in doctor_frames.values():
-        for widget in frame.winfo_children()[1:]:
-            widget.destroy()
-
-    _, doctor_folders = compute_doctor_hash()
-
-    for folder in doctor_folders:
-        folder_path = os.path.join(doctor_dir, folder)
-        profile_path = os.path.join(folder_path, 'profile.json')
-        if not os.path.exists(profile_path):
-            continue
-
-        with open(profile_path, 'r') as file:
-            profile = json.load(file)
-
-        name = profile.get("Full Name", "Unknown")
-        specialty = profile.get("Specialty", "General Physician")
-        availability = profile.get("Availability", "Unknown")
-        about = profile.get("About", "No description provided.")
-        fee = profile.get("Fee", "P1000")
-
-        if availability.lower() == "unavailable":
-            continue
-
-        img_path = next((os.path.join(folder_path, f) for f in os.listdir(folder_path)
-                         if f.lower().endswith(('.png', '.jpg', '.jpeg', '.gif'))), None)
-        if img_path:
-            try:
-                img = Image.open(img_path).resize((230, 220))
-            except:
-                img = Image.new('RGB', (230, 220), color='gray')
-        else:
-            img = Image.new('RGB', (230, 220), color='gray')
-
-        photo = ctk.CTkImage(light_image=img, size=(230, 220))
+    global category_load_token
 
-        frame = doctor_frames.get(specialty)
-        if not frame:
-            continue
+    category_load_token += 1
+    token = category_load_token
+    for frame in doctor_frames.values():
+        if len(frame.winfo_children()) == 1:
+            ctk.CTkLabel(frame, text="Loading doctors...", font=('Bahnschrift', 16, 'italic'),
+                         text_color='gray').pack(side='left', anchor='n', padx=20, pady=20)
+
+    io_executor.submit(doctor_service.read_directory, on_done=lambda result: show_doctors_in_categories(token, *result))
+
+def create_doctor_tile(parent, profile, img_path, img):
+    metrics.count("doctor tiles built")
+    name = profile.get("Full Name", "Unknown")
+    specialty = profile.get("Specialty", "General Physician")
+    availability = profile.get("Availability", "Unknown")
+
+    photo = ctk.CTkImage(light_image=img, size=CARD_SIZE)
+
+    doctor_wrapper = ctk.CTkFrame(
+        parent,
+        width=300,
+        height=330,
+        corner_radius=12,
+        fg_color="#f6f6f6"
+    )
+    doctor_wrapper.pack_propagate(False)
 
-        doctor_wrapper = ctk.CTkFrame(
-            frame,
-            width=300,
-            height=330,
-            corner_radius=12,
-            fg_color="#f6f6f6"
-        )
-        doctor_wrapper.pack(side='left', anchor='n', padx=10, pady=10)
-        doctor_wrapper.pack_propagate(False)
+    def on_click(event, p=profile, i=img_path):
+        open_doctor_booking(p, i)
 
-        def on_click(event, p=profile, i=img):
-            open_doctor_booking(p, i)
+    doctor_wrapper.bind("<Button-1>", on_click)
 
-        doctor_wrapper.bind("<Button-1>", on_click)
+    img_label = ctk.CTkLabel(doctor_wrapper, image=photo, text="")
+    img_label.pack(pady=(10, 5))
+    img_label.bind("<Button-1>", on_click)
 
-        img_label = ctk.CTkLabel(doctor_wrapper, image=photo, text="")
-        img_label.pack(pady=(10, 5))
-        img_label.bind("<Button-1>", on_click)
+    text_wrapper = ctk.CTkFrame(doctor_wrapper, fg_color=color2, corner_radius=8)
+    text_wrapper.pack(fill='both', expand=True)
+    text_wrapper.bind("<Button-1>", on_click)
 
-        text_wrapper = ctk.CTkFrame(doctor_wrapper, fg_color=color2, corner_radius=8)
-        text_wrapper.pack(fill='both', expand=True)
-        text_wrapper.bind("<Button-1>", on_click)
-
-        for text, font, color in [
-            (name, ('Bahnschrift', 18, 'bold'), 'white'),
-            (specialty, ('Bahnschrift', 13), 'white'),
-            (f"Status: {availability}", ('Bahnschrift', 14),
-             "#4CAF50" if availability.lower() == "available" else "white")
-        ]:
-            lbl = ctk.CTkLabel(text_wrapper, text=text, font=font, text_color=color, anchor='w', wraplength=200)
-            lbl.pack(fill='x', padx=13, pady=(5 if font[1] == 18 else 0, 0))
-            lbl.bind("<Button-1>", on_click)
-
-def get_booked_times(doctor_name, date_str):
-    booked_times = []
-    for file in os.listdir(appointment_dir):
-        if file.endswith(".json"):
-            with open(os.path.join(appointment_dir, file), 'r') as f:
-                data = json.load(f)
-            if (data.get("doctor") == doctor_name and
-                data.get("date") == date_str and
-                data.get("status") != "Cancelled"):
-                booked_times.extend(data.get("time", []))
-    return booked_times
-
-def get_status(date_str, time_list):
-    try:
-        appointment_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        current_date = datetime.now().date()
-
-        if appointment_date < current_date:
-            return "Completed"
-        elif appointment_date == current_date:
-            now = datetime.now()
-            all_past = True
-
-            for t in time_list:
-                time_obj = datetime.strptime(t, "%I:%M %p").time()
-                appointment_datetime = datetime.combine(appointment_date, time_obj)
-                if appointment_datetime > now:
-                    all_past = False
-                    break
-
-            if all_past:
-                return "Completed"
-            else:
-                return "Ongoing"
-        else:
-            return "Ongoing"
-    except:
-        return "Ongoing"
+    for text, font, color in [
+        (name, ('Bahnschrift', 18, 'bold'), 'white'),
+        (specialty, ('Bahnschrift', 13), 'white'),
+        (f"Status: {availability}", ('Bahnschrift', 14),
+         "#4CAF50" if availability.lower() == "available" else "white")
+    ]:
+        lbl = ctk.CTkLabel(text_wrapper, text=text, font=font, text_color=color, anchor='w', wraplength=200)
+        lbl.pack(fill='x', padx=13, pady=(5 if font[1] == 18 else 0, 0))
+        lbl.bind("<Button-1>", on_click)
 
-def load_user_bookings():
-    for widget in bookingsFrame.winfo_children():
-        if widget != bookingHeader:
-            widget.destroy()
+    return doctor_wrapper
 
-    completed_count = 0
-    cancelled_count = 0
-    ongoing_count = 0
-
-    for file in os.listdir(appointment_dir):
-        if file.endswith(".json"):
-            file_path = os.path.join(appointment_dir, file)
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-
-            if data.get("user") == current_user["email"]:
-                doctor = data.get("doctor", "Unknown")
-                date_str = data.get("date", "")
-                times = data.get("time", [])
-                status = get_status(date_str, times)
-
-                if status == "Completed" and data.get("status") != "Completed":
-                    data["status"] = "Completed"
-                    with open(file_path, 'w') as f:
-                        json.dump(data, f, indent=4)
-
-                if data.get("status") == "Completed":
-                    completed_count += 1
-                    continue
-                elif data.get("status") == "Cancelled":
-                    cancelled_count += 1
-                    continue
-                else:
-                    ongoing_count += 1
-
-                try:
-                    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                    formatted_date = date_obj.strftime("%A %d %B %Y")
-                except:
-                    formatted_date = date_str
-
-                timeslots = ", ".join(times)
-                date_time_text = f"Booking on {formatted_date} at {timeslots}"
-
-                status_text = data.get("status", "Ongoing")
-                status_color = {
-                    'Completed': 'green',
-                    'Ongoing': 'orange',
-                    'Cancelled': 'red'
-                }.get(status_text, 'gray')
-
-                card = ctk.CTkFrame(bookingsFrame, fg_color="#f5f5f5", corner_radius=10)
-                card.pack(fill='x', padx=15, pady=10)
-
-                row_frame = ctk.CTkFrame(card, fg_color="transparent")
-                row_frame.pack(fill='x', padx=15, pady=10)
-
-                ctk.CTkLabel(
-                    row_frame,
-                    text=f"{doctor}",
-                    font=('Bahnschrift', 17),
-                    text_color='black',
-                    anchor='w'
-                ).pack(side='left', padx=5)
-
-                ctk.CTkLabel(
-                    row_frame,
-                    text=date_time_text,
-                    font=('Bahnschrift', 17),
-                    text_color='black',
-                    anchor='center',
-                    wraplength=450
-                ).pack(side='left', expand=True)
-
-                status_label = ctk.CTkLabel(
-                    row_frame,
-                    text=status_text,
-                    font=('Bahnschrift', 17),
-                    text_color=status_color,
-                    anchor='e'
-                )
-                status_label.pack(side='right', padx=5)
-
-                if status_text == "Ongoing":
-                    def cancel_appointment(file_path=file_path, label=status_label):
-                        try:
-                            with open(file_path, 'r') as f:
-                                data = json.load(f)
-                            data["status"] = "Cancelled"
-                            with open(file_path, 'w') as f:
-                                json.dump(data, f, indent=4)
-
-                            label.configure(text="Cancelled", text_color="red")
-                            load_user_bookings()
-                            load_user_appointments()
-                            load_admin_bookings()
-                            load_admin_appointments()
-                            load_doctor_appointments()
-                            load_doctor_dashboard()
-                        except Exception as e:
-                            messagebox.showerror("Error", f"Failed to cancel appointment:\n{e}")
-
-                    cancel_btn = ctk.CTkButton(
-                        row_frame,
-                        text="Cancel",
-                        font=('Bahnschrift', 14),
-                        text_color='white',
-                        fg_color='red',
-                        hover_color='#cc0000',
-                        width=80,
-                        command=cancel_appointment
-                    )
-                    cancel_btn.pack(side='right', padx=5)
+@metrics.timed()
+def show_doctors_in_categories(token, doctors, index):
+    global doctor_index, doctor_entries
 
-    completed_label.configure(text=f"Completed: {completed_count}")
-    cancelled_label.configure(text=f"Cancelled: {cancelled_count}")
-    ongoing_label.configure(text=f"Ongoing: {ongoing_count}")
-
-    completed_label.configure(text=f"Completed: {completed_count}")
-    cancelled_label.configure(text=f"Cancelled: {cancelled_count}")
-    ongoing_label.configure(text=f"Ongoing: {ongoing_count}")
-
-
-def load_user_appointments():
-    for widget in historyContent.winfo_children():
-        widget.destroy()
-
-    if not os.path.exists(appointment_dir):
-        messagebox.showerror("Error", "Appointment directory not found.")
+    if token != category_load_token:
         return
 
-    appointment_files = [f for f in os.listdir(appointment_dir) if f.endswith('.json')]
-    user_appointments = []
-
-    for file_name in appointment_files:
-        file_path = os.path.join(appointment_dir, file_name)
-
-        try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+    for frame in doctor_frames.values():
+        for widget in frame.winfo_children()[1:]:
+            widget.destroy()
+    for tile in search_tiles.values():
+        tile.destroy()
+    search_tiles.clear()
 
-            if isinstance(data, list):
-                for appointment in data:
-                    if appointment.get('user') == current_user["email"]:
-                        user_appointments.append(appointment)
+    doctor_index = index
+    doctor_entries = {folder: (profile, img_path, img) for folder, profile, img_path, img in doctors}
 
-            elif isinstance(data, dict):
-                if data.get('user') == current_user["email"]:
-                    user_appointments.append(data)
+    for folder, profile, img_path, img in doctors:
+        if not is_bookable(profile):
+            continue
 
-        except Exception as e:
-            print(f"Failed to read {file_name}: {e}")
+        frame = doctor_frames.get(profile.get("Specialty", "General Physician"))
+        if not frame:
             continue
 
-    for i, appointment_data in enumerate(user_appointments):
-        doctor_name = appointment_data.get('doctor', 'Unknown Doctor')
-        date = appointment_data.get('date', 'Unknown Date')
-        time_slots = appointment_data.get('time', [])
-        lines = []
+        create_doctor_tile(frame, profile, img_path, img).pack(side='left', anchor='n', padx=10, pady=10)
 
-        for j in range(0, len(time_slots), 2):
-            line = ", ".join(time_slots[j:j + 2])
-            lines.append(line)
+    if searchResultsFrame.winfo_ismapped():
+        run_search()
 
-        while len(lines) < 2:
-            lines.append("")
+def format_booking_date(date_str):
+    try:
+        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
+        return date_obj.strftime("%A %d %B %Y")
+    except:
+        return date_str
 
-        times = f"{date}\n" + "\n".join(lines)
-        status = appointment_data.get('status', "Ongoing")
+def booking_date_text(data):
+    if "day" in data:
+        return date.fromordinal(data["day"]).strftime("%A %d %B %Y")
+    return data.get("date", "")
 
-        doctor_fee = appointment_data.get('fee', "₱0")
-        doctor_fee = f"₱{doctor_fee}"
+def format_history_times(appointment_data):
+    date = appointment_data.get('date', 'Unknown Date')
+    time_slots = appointment_data.get('time', [])
 
-        row = i + 1
+    lines = []
+    for j in range(0, len(time_slots), 2):
+        lines.append(", ".join(time_slots[j:j + 2]))
+    while len(lines) < 2:
+        lines.append("")
 
-        ctk.CTkLabel(historyContent, text=str(i + 1), font=('Bahnschrift', 14), text_color='black', fg_color='white').grid(row=row, column=0, sticky='w', padx=10, pady=5)
-        ctk.CTkLabel(historyContent, text=times, font=('Bahnschrift', 14), text_color='black', fg_color='white', anchor='w', justify='left').grid(row=row, column=1, sticky='w', padx=10, pady=5)
-        ctk.CTkLabel(historyContent, text=doctor_name, font=('Bahnschrift', 14), text_color='black', fg_color='white').grid(row=row, column=2, sticky='w', padx=10, pady=5)
-        ctk.CTkLabel(historyContent, text=doctor_fee, font=('Bahnschrift', 14), text_color='black', fg_color='white').grid(row=row, column=3, sticky='w', padx=10, pady=5)
+    return f"{date}\n" + "\n".join(lines)
 
-        status_color = {
-            'Completed': 'green',
-            'Ongoing': 'orange',
-            'Cancelled': 'red'
-        }.get(status, 'gray')
+def create_booking_card(parent, appointment_id, left_text, middle_text, status_text, buttons):
+    metrics.count("booking cards built")
+    card = ctk.CTkFrame(parent, fg_color="#f5f5f5", corner_radius=10)
+    card.pack(fill='x', padx=15, pady=10)
 
-        ctk.CTkLabel(historyContent, text=status, font=('Bahnschrift', 14), text_color=status_color, fg_color='white').grid(row=row, column=4, sticky='w', padx=10, pady=5)
+    row_frame = ctk.CTkFrame(card, fg_color="transparent")
+    row_frame.pack(fill='x', padx=15, pady=10)
 
-def load_admin_appointments():
-    for widget in adminHistoryContent.winfo_children():
-        widget.destroy()
+    ctk.CTkLabel(
+        row_frame,
+        text=left_text,
+        font=('Bahnschrift', 17),
+        text_color='black',
+        anchor='w'
+    ).pack(side='left', padx=5)
 
-    if not os.path.exists(appointment_dir):
-        messagebox.showerror("Error", "Appointment directory not found.")
-        return
+    ctk.CTkLabel(
+        row_frame,
+        text=middle_text,
+        font=('Bahnschrift', 17),
+        text_color='black',
+        anchor='center',
+        wraplength=450
+    ).pack(side='left', expand=True)
 
-    appointment_files = [f for f in os.listdir(appointment_dir) if f.endswith('.json')]
-    all_appointments = []
+    ctk.CTkLabel(
+        row_frame,
+        text=status_text,
+        font=('Bahnschrift', 17),
+        text_color=status_colors.get(status_text, 'gray'),
+        anchor='e'
+    ).pack(side='right', padx=5)
+
+    for status in buttons:
+        def status_failed(e, status=status):
+            action = "cancel" if status == "Cancelled" else "complete"
+            messagebox.showerror("Error", f"Failed to {action} appointment:\n{e}")
+
+        def change_status(appointment_id=appointment_id, status=status, on_error=status_failed):
+            action = appointment_service.cancel if status == "Cancelled" else appointment_service.complete
+            io_executor.submit(action, appointment_id, on_error=on_error)
+
+        if status == "Cancelled":
+            ctk.CTkButton(
+                row_frame,
+                text="Cancel",
+                font=('Bahnschrift', 14),
+                text_color='white',
+                fg_color='red',
+                hover_color='#cc0000',
+                width=80,
+                command=change_status
+            ).pack(side='right', padx=5)
+        else:
+            ctk.CTkButton(
+                row_frame,
+                text="Complete",
+                font=('Bahnschrift', 14),
+                text_color='white',
+                fg_color='green',
+                hover_color='#009933',
+                width=90,
+                command=change_status
+            ).pack(side='right', padx=5)
 
-    for file_name in appointment_files:
-        file_path = os.path.join(appointment_dir, file_name)
+    return card
 
-        try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+def schedule_status_sweep():
+    io_executor.submit(appointment_service.sweep)
+    window.after(status_sweep_interval, schedule_status_sweep)
 
-            if isinstance(data, list):
-                all_appointments.extend(data)
-            elif isinstance(data, dict):
-                all_appointments.append(data)
+def open_data():
+    stores = open_storage(storage_backend, base_dir, appointment_events)
+    return stores, open_services(*stores, doctor_dir)
 
-        except Exception as e:
-            print(f"Failed to read {file_name}: {e}")
-            continue
+def start_data_open():
+    # Parsing Data/ scales with its size, so it runs behind the login screen instead of before it.
+    LoginButton.configure(state="disabled", text="Loading data...")
+    signupButton.configure(state="disabled", text="Loading data...")
+    io_executor.submit(open_data, on_done=data_opened, on_error=data_open_failed)
 
-    for i, appointment_data in enumerate(all_appointments):
-        user_email = appointment_data.get('user', 'Unknown')
-        doctor_name = appointment_data.get('doctor', 'Unknown Doctor')
-        date = appointment_data.get('date', 'Unknown Date')
-        time_slots = appointment_data.get('time', [])
-        doctor_fee = appointment_data.get('fee', "₱0")
-        status = appointment_data.get('status', "Ongoing")
+def data_opened(result):
+    global accounts, appointment_store, account_service, doctor_service, appointment_service
 
-        lines = []
-        for j in range(0, len(time_slots), 2):
-            line = ", ".join(time_slots[j:j + 2])
-            lines.append(line)
+    (accounts, appointment_store), (account_service, doctor_service, appointment_service) = result
+    LoginButton.configure(state="normal", text="Login")
+    signupButton.configure(state="normal", text="Create Account")
+    schedule_status_sweep()
+    schedule_appointment_refresh()
 
-        while len(lines) < 2:
-            lines.append("")
+def data_open_failed(error):
+    LoginButton.configure(text="Data unavailable")
+    signupButton.configure(text="Data unavailable")
+    messagebox.showerror("Data Error", f"Failed to open the Data folder:\n{error}")
 
-        times = f"{date}\n" + "\n".join(lines)
+def load_role_appointments(role):
+    if role == "User":
+        load_user_appointments()
+        load_user_bookings()
+    elif role == "Admin":
+        load_admin_appointments()
+        load_admin_bookings()
+    elif role == "Doctor":
+        load_doctor_appointments()
+        load_doctor_dashboard()
 
-        doctor_fee = f"₱{doctor_fee}"
+def appointments_refreshed(changes):
+    # New bookings and status changes arrive as events; only a deleted record needs a full reload.
+    if None in changes.values() and current_user["role"]:
+        load_role_appointments(current_user["role"])
 
-        row = i + 1
+def schedule_appointment_refresh():
+    io_executor.submit(appointment_service.refresh, on_done=appointments_refreshed)
+    window.after(appointment_refresh_interval, schedule_appointment_refresh)
 
-        ctk.CTkLabel(adminHistoryContent, text=str(i + 1), font=('Bahnschrift', 14), text_color='black', fg_color='white').grid(row=row, column=0, sticky='w', padx=10, pady=5)
-        ctk.CTkLabel(adminHistoryContent, text=user_email, font=('Bahnschrift', 14), text_color='black', fg_color='white', anchor='w').grid(row=row, column=1, sticky='w', padx=10, pady=5)
-        ctk.CTkLabel(adminHistoryContent, text=times, font=('Bahnschrift', 14), text_color='black', fg_color='white', anchor='w', justify='left').grid(row=row, column=2, sticky='w', padx=10, pady=5)
-        ctk.CTkLabel(adminHistoryContent, text=doctor_name, font=('Bahnschrift', 14), text_color='black', fg_color='white').grid(row=row, column=3, sticky='w', padx=10, pady=5)
-        ctk.CTkLabel(adminHistoryContent, text=doctor_fee, font=('Bahnschrift', 14), text_color='black', fg_color='white').grid(row=row, column=4, sticky='w', padx=10, pady=5)
+def add_user_booking_card(appointment_id, data):
+    date_time_text = f"Booking on {booking_date_text(data)} at {', '.join(data.get('time', []))}"
+    return create_booking_card(
+        bookingsFrame, appointment_id, data.get("doctor", "Unknown"), date_time_text, "Ongoing", ["Cancelled"])
 
-        status_color = {
-            'Completed': 'green',
-            'Ongoing': 'orange',
-            'Cancelled': 'red'
-        }.get(status, 'gray')
+def show_user_counters(values):
+    completed_count, cancelled_count, ongoing_count = values
+    completed_label.configure(text=f"Completed: {completed_count}")
+    cancelled_label.configure(text=f"Cancelled: {cancelled_count}")
+    ongoing_label.configure(text=f"Ongoing: {ongoing_count}")
 
-        ctk.CTkLabel(adminHistoryContent, text=status, font=('Bahnschrift', 14), text_color=status_color, fg_color='white').grid(row=row, column=5, sticky='w', padx=10, pady=5)
+def update_user_counters():
+    io_executor.submit(appointment_service.user_counts, current_user["email"], on_done=show_user_counters)
 
-def load_admin_bookings():
-    for widget in adminBookingsFrame.winfo_children():
-        if widget != adminBookingHeader:
-            widget.destroy()
+def show_user_bookings(email):
+    user_bookings.reset(user=email)
+    update_user_counters()
 
-    doctor_count = len([f for f in os.listdir(doctor_dir) if os.path.isdir(os.path.join(doctor_dir, f))])
-    patient_count = len([f for f in os.listdir(user_dir) if f.endswith(".json")])
-    ongoing_count = 0
+def load_user_bookings():
+    email = current_user["email"]
+    user_bookings.clear()
+    io_executor.submit(appointment_service.sweep, on_done=lambda _: show_user_bookings(email))
 
-    for file in os.listdir(appointment_dir):
-        if file.endswith(".json"):
-            file_path = os.path.join(appointment_dir, file)
-            with open(os.path.join(appointment_dir, file), 'r') as f:
-                data = json.load(f)
+def on_user_bookings_event(event):
+    if event.record.get("user") != current_user["email"]:
+        return
 
-            status = get_status(data.get("date", ""), data.get("time", []))
+    if event.kind == BOOKED:
+        user_bookings.append(event.appointment_id, event.record)
+    else:
+        user_bookings.remove(event.appointment_id)
 
-            if status == "Completed" and data.get("status") != "Completed":
-                data["status"] = "Completed"
-                with open(file_path, 'w') as f:
-                    json.dump(data, f, indent=4)
+    update_user_counters()
 
-            if data.get("status") in ["Cancelled", "Completed"]:
-                continue
+def user_history_values(appointment_data):
+    doctor_fee = f"₱{appointment_data.get('fee', '₱0')}"
+    return [format_history_times(appointment_data), appointment_data.get('doctor', 'Unknown Doctor'), doctor_fee]
 
-            ongoing_count += 1
+@metrics.timed()
+def user_history_rows(email):
+    return [(appointment_id, user_history_values(data), data.get('status', "Ongoing"))
+            for appointment_id, data in appointment_service.history(user=email)]
 
-            doctor = data.get("doctor", "Unknown")
-            user = data.get("user", "Unknown")
-            date_str = data.get("date", "")
-            times = ", ".join(data.get("time", []))
+def load_user_appointments():
+    historyContent.show_loading()
+    io_executor.submit(user_history_rows, current_user["email"], on_done=historyContent.set_rows)
 
-            try:
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                formatted_date = date_obj.strftime("%A %d %B %Y")
-            except:
-                formatted_date = date_str
+def on_user_history_event(event):
+    if event.record.get("user") != current_user["email"]:
+        return
 
-            status_text = data.get("status", "Ongoing")
-            status_color = {
-                'Completed': 'green',
-                'Ongoing': 'orange',
-                'Cancelled': 'red'
-            }.get(status_text, 'gray')
+    if event.kind == BOOKED:
+        historyContent.append_row(event.appointment_id, user_history_values(event.record), event.record["status"])
+    else:
+        historyContent.update_status(event.appointment_id, event.record["status"])
 
-            card = ctk.CTkFrame(adminBookingsFrame, fg_color="#f5f5f5", corner_radius=10)
-            card.pack(fill='x', padx=15, pady=10)
+def admin_history_values(appointment_data):
+    doctor_fee = f"₱{appointment_data.get('fee', '₱0')}"
+    return [appointment_data.get('user', 'Unknown'), format_history_times(appointment_data),
+            appointment_data.get('doctor', 'Unknown Doctor'), doctor_fee]
 
-            row_frame = ctk.CTkFrame(card, fg_color="transparent")
-            row_frame.pack(fill='x', padx=15, pady=10)
+@metrics.timed()
+def admin_history_rows():
+    return [(appointment_id, admin_history_values(data), data.get('status', "Ongoing"))
+            for appointment_id, data in appointment_service.history()]
 
-            ctk.CTkLabel(
-                row_frame,
-                text=f"{doctor}",
-                font=('Bahnschrift', 17),
-                text_color='black'
-            ).pack(side='left', padx=5)
+def load_admin_appointments():
+    adminHistoryContent.show_loading()
+    io_executor.submit(admin_history_rows, on_done=adminHistoryContent.set_rows)
 
-            ctk.CTkLabel(
-                row_frame,
-                text=f"{user} — {formatted_date} at {times}",
-                font=('Bahnschrift', 17),
-                text_color='black',
-                wraplength=450
-            ).pack(side='left', expand=True)
+def on_admin_history_event(event):
+    if event.kind == BOOKED:
+        adminHistoryContent.append_row(event.appointment_id, admin_history_values(event.record), event.record["status"])
+    else:
+        adminHistoryContent.update_status(event.appointment_id, event.record["status"])
 
-            status_label = ctk.CTkLabel(
-                row_frame,
-                text=status_text,
-                font=('Bahnschrift', 17),
-                text_color=status_color
-            )
-            status_label.pack(side='right', padx=5)
-
-            def cancel_appointment(fp=file_path, label=status_label):
-                try:
-                    with open(fp, 'r') as f:
-                        data = json.load(f)
-                    data["status"] = "Cancelled"
-                    with open(fp, 'w') as f:
-                        json.dump(data, f, indent=4)
-
-                    label.configure(text="Cancelled", text_color="red")
-                    load_admin_bookings()
-                    load_admin_appointments()
-                    load_user_appointments()
-                    load_user_bookings()
-                    load_doctor_appointments()
-                    load_doctor_dashboard()
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to cancel:\n{e}")
-
-            cancel_btn = ctk.CTkButton(
-                row_frame,
-                text="Cancel",
-                font=('Bahnschrift', 14),
-                text_color='white',
-                fg_color='red',
-                hover_color='#cc0000',
-                width=80,
-                command=cancel_appointment
-            )
-            cancel_btn.pack(side='right', padx=5)
-
-            def complete_appointment(fp=file_path, label=status_label):
-                try:
-                    with open(fp, 'r') as f:
-                        data = json.load(f)
-                    data["status"] = "Completed"
-                    with open(fp, 'w') as f:
-                        json.dump(data, f, indent=4)
-
-                    label.configure(text="Completed", text_color="green")
-                    load_admin_bookings()
-                    load_admin_appointments()
-                    load_user_appointments()
-                    load_user_bookings()
-                    load_doctor_appointments()
-                    load_doctor_dashboard()
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to complete:\n{e}")
-
-            complete_btn = ctk.CTkButton(
-                row_frame,
-                text="Complete",
-                font=('Bahnschrift', 14),
-                text_color='white',
-                fg_color='green',
-                hover_color='#009933',
-                width=90,
-                command=complete_appointment
-            )
-            complete_btn.pack(side='right', padx=5)
+def add_admin_booking_card(appointment_id, data):
+    middle_text = f"{data.get('user', 'Unknown')} — {booking_date_text(data)} at {', '.join(data.get('time', []))}"
+    return create_booking_card(
+        adminBookingsFrame, appointment_id, data.get("doctor", "Unknown"), middle_text, "Ongoing",
+        ["Completed", "Cancelled"])
+
+@metrics.timed()
+def admin_counter_values():
+    return account_service.count("Doctor"), account_service.count("User"), appointment_service.ongoing_count()
 
+def show_admin_counters(values):
+    doctor_count, patient_count, ongoing_count = values
     doctor_count_label.configure(text=f"Doctors: {doctor_count}")
     patient_count_label.configure(text=f"Patients: {patient_count}")
     admin_ongoing_label.configure(text=f"Appointments: {ongoing_count}")
 
-def load_doctor_appointments():
-    for widget in doctorHistoryContent.winfo_children():
-        widget.destroy()
-
-    if not os.path.exists(appointment_dir):
-        messagebox.showerror("Error", "Appointment directory not found.")
-        return
-
-    appointment_files = [f for f in os.listdir(appointment_dir) if f.endswith('.json')]
-    doctor_appointments = []
-
-    for file_name in appointment_files:
-        file_path = os.path.join(appointment_dir, file_name)
-
-        try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-
-            if isinstance(data, list):
-                for appointment in data:
-                    if appointment.get('doctor') == current_user["name"]:
-                        doctor_appointments.append(appointment)
-
-            elif isinstance(data, dict):
-                if data.get('doctor') == current_user["name"]:
-                    doctor_appointments.append(data)
-
-        except Exception as e:
-            print(f"Failed to read {file_name}: {e}")
-            continue
+def update_admin_counters():
+    io_executor.submit(admin_counter_values, on_done=show_admin_counters)
 
-    for i, appointment_data in enumerate(doctor_appointments):
-        patient_email = appointment_data.get('user', 'Unknown')
-        date = appointment_data.get('date', 'Unknown Date')
-        time_slots = appointment_data.get('time', [])
-        status = appointment_data.get('status', 'Ongoing')
-        doctor_fee = appointment_data.get('fee', "₱0")
-        doctor_fee = f"₱{doctor_fee}"
-
-        lines = []
-        for j in range(0, len(time_slots), 2):
-            lines.append(", ".join(time_slots[j:j + 2]))
-        while len(lines) < 2:
-            lines.append("")
-        times = f"{date}\n" + "\n".join(lines)
-
-        status_color = {
-            'Completed': 'green',
-            'Ongoing': 'orange',
-            'Cancelled': 'red'
-        }.get(status, 'gray')
-
-        row = i + 1
-
-        ctk.CTkLabel(doctorHistoryContent, text=str(row), font=('Bahnschrift', 14), text_color='black', fg_color='white').grid(row=row, column=0, sticky='w', padx=10, pady=5)
-        ctk.CTkLabel(doctorHistoryContent, text=patient_email, font=('Bahnschrift', 14), text_color='black', fg_color='white').grid(row=row, column=1, sticky='w', padx=10, pady=5)
-        ctk.CTkLabel(doctorHistoryContent, text=times, font=('Bahnschrift', 14), text_color='black', fg_color='white', justify='left').grid(row=row, column=2, sticky='w', padx=10, pady=5)
-        ctk.CTkLabel(doctorHistoryContent, text=doctor_fee, font=('Bahnschrift', 14), text_color='black', fg_color='white').grid(row=row, column=3, sticky='w', padx=10, pady=5)
-        ctk.CTkLabel(doctorHistoryContent, text=status, font=('Bahnschrift', 14), text_color=status_color, fg_color='white').grid(row=row, column=4, sticky='w', padx=10, pady=5)
-
-def load_doctor_dashboard():
-    for widget in doctorBookingsFrame.winfo_children():
-        if widget != doctorBookingHeader:
-            widget.destroy()
+def show_admin_bookings():
+    admin_bookings.reset()
+    update_admin_counters()
 
-    doctor_name = current_user.get("name")
-    income_total = 0
-    ongoing_count = 0
-    unique_patients = set()
-
-    for file in os.listdir(appointment_dir):
-        if file.endswith(".json"):
-            file_path = os.path.join(appointment_dir, file)
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+def load_admin_bookings():
+    admin_bookings.clear()
+    io_executor.submit(appointment_service.sweep, on_done=lambda _: show_admin_bookings())
 
-            if data.get("doctor") != doctor_name:
-                continue
+def on_admin_bookings_event(event):
+    if event.kind == BOOKED:
+        admin_bookings.append(event.appointment_id, event.record)
+    else:
+        admin_bookings.remove(event.appointment_id)
 
-            status = get_status(data.get("date", ""), data.get("time", []))
+    update_admin_counters()
 
-            if status == "Completed" and data.get("status") != "Completed":
-                data["status"] = "Completed"
-                with open(file_path, 'w') as f:
-                    json.dump(data, f, indent=4)
+def doctor_history_values(appointment_data):
+    doctor_fee = f"₱{appointment_data.get('fee', '₱0')}"
+    return [appointment_data.get('user', 'Unknown'), format_history_times(appointment_data), doctor_fee]
 
-            if data.get("status") == "Completed":
-                try:
-                    income_total += int(data.get("fee", "0"))
-                except ValueError:
-                    pass
-                unique_patients.add(data.get("user", "Unknown"))
-                continue
+@metrics.timed()
+def doctor_history_rows(name):
+    return [(appointment_id, doctor_history_values(data), data.get('status', 'Ongoing'))
+            for appointment_id, data in appointment_service.history(doctor=name)]
 
-            if data.get("status") == "Cancelled":
-                continue
+def load_doctor_appointments():
+    doctorHistoryContent.show_loading()
+    io_executor.submit(doctor_history_rows, current_user["name"], on_done=doctorHistoryContent.set_rows)
 
-            ongoing_count += 1
-            unique_patients.add(data.get("user", "Unknown"))
+def on_doctor_history_event(event):
+    if event.record.get("doctor") != current_user["name"]:
+        return
 
-            doctor = data.get("doctor", "Unknown")
-            user = data.get("user", "Unknown")
-            date_str = data.get("date", "")
-            times = ", ".join(data.get("time", []))
+    if event.kind == BOOKED:
+        doctorHistoryContent.append_row(event.appointment_id, doctor_history_values(event.record), event.record["status"])
+    else:
+        doctorHistoryContent.update_status(event.appointment_id, event.record["status"])
 
-            try:
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                formatted_date = date_obj.strftime("%A %d %B %Y")
-            except:
-                formatted_date = date_str
+def add_doctor_booking_card(appointment_id, data):
+    middle_text = f"{booking_date_text(data)} at {', '.join(data.get('time', []))}"
+    return create_booking_card(
+        doctorBookingsFrame, appointment_id, data.get("user", "Unknown"), middle_text, "Ongoing", ["Completed"])
 
-            status_text = data.get("status", "Ongoing")
-            status_color = {
-                'Completed': 'green',
-                'Ongoing': 'orange',
-                'Cancelled': 'red'
-            }.get(status_text, 'gray')
+def show_doctor_counters(values):
+    income, patients, ongoing_count = values
+    doctor_income_label.configure(text=f"Income: ₱{income}")
+    doctor_patient_label.configure(text=f"Patients: {patients}")
+    doctor_appointments_label.configure(text=f"Appointments: {ongoing_count}")
 
-            card = ctk.CTkFrame(doctorBookingsFrame, fg_color="#f5f5f5", corner_radius=10)
-            card.pack(fill='x', padx=15, pady=10)
+def update_doctor_counters():
+    io_executor.submit(appointment_service.doctor_totals, current_user["name"], on_done=show_doctor_counters)
 
-            row_frame = ctk.CTkFrame(card, fg_color="transparent")
-            row_frame.pack(fill='x', padx=15, pady=10)
+def show_doctor_bookings(name):
+    doctor_bookings.reset(doctor=name)
+    update_doctor_counters()
 
-            ctk.CTkLabel(
-                row_frame,
-                text=f"{user}",
-                font=('Bahnschrift', 17),
-                text_color='black'
-            ).pack(side='left', padx=5)
+def load_doctor_dashboard():
+    name = current_user["name"]
+    doctor_bookings.clear()
+    io_executor.submit(appointment_service.sweep, on_done=lambda _: show_doctor_bookings(name))
 
-            ctk.CTkLabel(
-                row_frame,
-                text=f"{formatted_date} at {times}",
-                font=('Bahnschrift', 17),
-                text_color='black',
-                wraplength=450
-            ).pack(side='left', expand=True)
+def on_doctor_bookings_event(event):
+    if event.record.get("doctor") != current_user["name"]:
+        return
 
-            status_label = ctk.CTkLabel(
-                row_frame,
-                text=status_text,
-                font=('Bahnschrift', 17),
-                text_color=status_color
-            )
-            status_label.pack(side='right', padx=5)
-
-            def complete_appointment(fp=file_path, label=status_label):
-                try:
-                    with open(fp, 'r') as f:
-                        data = json.load(f)
-                    data["status"] = "Completed"
-                    with open(fp, 'w') as f:
-                        json.dump(data, f, indent=4)
-
-                    label.configure(text="Completed", text_color="green")
-                    load_doctor_dashboard()
-                    load_doctor_appointments()
-                    load_admin_bookings()
-                    load_admin_appointments()
-                    load_user_appointments()
-                    load_user_bookings()
-                except Exception as e:
-                    messagebox.showerror("Error", f"Failed to complete:\n{e}")
-
-            complete_btn = ctk.CTkButton(
-                row_frame,
-                text="Complete",
-                font=('Bahnschrift', 14),
-                text_color='white',
-                fg_color='green',
-                hover_color='#009933',
-                width=90,
-                command=complete_appointment
-            )
-            complete_btn.pack(side='right', padx=5)
+    if event.kind == BOOKED:
+        doctor_bookings.append(event.appointment_id, event.record)
+    else:
+        doctor_bookings.remove(event.appointment_id)
 
-    doctor_income_label.configure(text=f"Income: ₱{income_total}")
-    doctor_patient_label.configure(text=f"Patients: {len(unique_patients)}")
-    doctor_appointments_label.configure(text=f"Appointments: {ongoing_count}")
+    update_doctor_counters()
 
 def update_doctor_status(new_status):
-    selected = [folder for check, folder in checkboxes if check.get()]
+    selected = [folder for folder, card in doctor_cards.items() if card.check.get()]
     if not selected:
         messagebox.showwarning("No Selection", "Please select at least one doctor to update.")
         return
 
     for folder in selected:
-        profile_path = os.path.join(doctor_dir, folder, 'profile.json')
-        if os.path.exists(profile_path):
-            with open(profile_path, 'r+') as file:
-                data = json.load(file)
-                data['Availability'] = new_status
-                file.seek(0)
-                json.dump(data, file, indent=4)
-                file.truncate()
-
-    load_doctors(adminDoctorFrame, force_refresh=True)
-
-def remove_selected_doctor():
-    selected = [folder for check, folder in checkboxes if check.get()]
-    if not selected:
-        messagebox.showwarning("No Selection", "Please select at least one doctor to remove.")
-        return
-
-    blocked_doctors = []
-
-    for folder in selected:
-        folder_path = os.path.join(doctor_dir, folder)
-        profile_path = os.path.join(folder_path, 'profile.json')
+        doctor_cards[folder].check.deselect()
 
-        if not os.path.exists(profile_path):
-            continue
+    io_executor.submit(doctor_service.set_availability, selected, new_status, on_done=lambda _: refresh_doctor_lists())
 
-        try:
-            with open(profile_path, 'r') as file:
-                profile = json.load(file)
-                doctor_full_name = profile.get("Full Name")
-        except:
-            continue
+def confirm_doctor_removal(selected, result):
+    candidates, blocked_doctors = result
 
-        if not doctor_full_name:
-            continue
-
-        has_ongoing = False
-        for filename in os.listdir(appointment_dir):
-            file_path = os.path.join(appointment_dir, filename)
-            if filename.endswith('.json') and os.path.isfile(file_path):
-                try:
-                    with open(file_path, 'r') as appt_file:
-                        appt = json.load(appt_file)
-                        if appt.get("doctor") == doctor_full_name and appt.get("status") == "Ongoing":
-                            has_ongoing = True
-                            break
-                except:
-                    continue
-
-        if has_ongoing:
-            if doctor_full_name not in blocked_doctors:
-                blocked_doctors.append(doctor_full_name)
-            continue
-
-        confirm = messagebox.askyesno("Confirm Delete", f"Are you sure you want to remove {doctor_full_name}?")
-        if confirm:
-            import shutil
-            shutil.rmtree(folder_path)
+    confirmed = [folder for folder, doctor_full_name in candidates
+                 if messagebox.askyesno("Confirm Delete", f"Are you sure you want to remove {doctor_full_name}?")]
 
     if blocked_doctors:
         unique_names = sorted(set(blocked_doctors))
@@ -1427,7 +1371,20 @@ def remove_selected_doctor():
             f"The following doctors have ongoing appointments and cannot be removed:\n\n- {names}"
         )
 
-    load_doctors(adminDoctorFrame, force_refresh=True)
+    for folder in selected:
+        if folder in doctor_cards:
+            doctor_cards[folder].check.deselect()
+
+    io_executor.submit(doctor_service.remove, confirmed, on_done=lambda _: refresh_doctor_lists())
+
+def remove_selected_doctor():
+    selected = [folder for folder, card in doctor_cards.items() if card.check.get()]
+    if not selected:
+        messagebox.showwarning("No Selection", "Please select at least one doctor to remove.")
+        return
+
+    io_executor.submit(doctor_service.removal_candidates, selected,
+                       on_done=lambda result: confirm_doctor_removal(selected, result))
 
 #Main Window
 window = ctk.CTk()
@@ -1435,16 +1392,34 @@ width = window.winfo_screenwidth()
 height = window.winfo_screenheight()
 color2 = '#08395f'
 background = '#e1f3fc'
+status_colors = {
+    'Completed': 'green',
+    'Ongoing': 'orange',
+    'Cancelled': 'red'
+}
 window.attributes('-fullscreen',True)
 window.state('zoomed')
 window.bind("<Escape>", lambda e: window.attributes("-fullscreen", False))
 window.bind("<F12>", lambda e: window.attributes("-fullscreen", True))
+metrics_overlay = MetricsOverlay(window, os.environ.get("METRICS_FILE", "metrics.jsonl"))
+window.bind("<F9>", metrics_overlay.toggle)
 window.configure(fg_color=background)
 window.tk.call("tk", "scaling", 1.0)
 window.minsize(1400,950)
+io_executor = IOExecutor(window)
+current_specialty = "General Physician"
+doctor_index = DoctorIndex()
+doctor_entries = {}
+search_tiles = {}
+search_empty_label = None
+search_result_limit = 24
 last_doctor_hash = None
+last_doctor_stamps = {}
+doctor_load_token = 0
+category_load_token = 0
 selected_doctor_var = ctk.StringVar(value="")
-checkboxes = []
+doctor_cards = {}
+doctor_empty_label = None
 blank_pil_image = Image.new("RGB", (230, 300), color="#E0E0E0")
 default_ctk_image = ctk.CTkImage(dark_image=blank_pil_image, light_image=blank_pil_image, size=(230, 300))
 current_user: dict[str, Optional[str]] = {
@@ -1461,66 +1436,49 @@ admin_dir = os.path.join(base_dir, 'Admins')
 appointment_dir = os.path.join(base_dir, 'Appointments')
 for path in [user_dir, doctor_dir, admin_dir, appointment_dir]:
     os.makedirs(path, exist_ok=True)
+storage_backend = os.environ.get("STORAGE_BACKEND", "json")
+appointment_events = EventBus(io_executor.call_soon)
+accounts = appointment_store = None
+account_service = doctor_service = appointment_service = None
+status_sweep_interval = 60000
+appointment_refresh_interval = 5000
+doctor_labels = [
+    "General Physician",
+    "Gynecologist",
+    "Dermatologist",
+    "Pediatrician",
+    "Neurologist",
+    "Dentist"
+]
+role_views = {
+    "User": [on_user_bookings_event, on_user_history_event],
+    "Admin": [on_admin_bookings_event, on_admin_history_event],
+    "Doctor": [on_doctor_bookings_event, on_doctor_history_event]
+}
+role_main_frames = {}
+role_pages = {}
+loaded_pages = set()
+doctor_watcher = None
 
 #Images
-img1 = Image.open('Images/Logo.png')
-logo = ctk.CTkImage(img1, size=img1.size)
-img2 = Image.open('Images/Banner.png')
-banner = ctk.CTkImage(img2, size=img2.size)
-img3 = Image.open('Images/home.png')
-home = ctk.CTkImage(img3, size=img3.size)
-img4 = Image.open('Images/calendar.png')
-calendar = ctk.CTkImage(img4, size=img4.size)
-img5 = Image.open('Images/user-add.png')
-add_doctor = ctk.CTkImage(img5, size=img5.size)
-img6 = Image.open('Images/users.png')
-users = ctk.CTkImage(img6, size=img6.size)
-img7 = Image.open('Images/square-plus.png')
-add = ctk.CTkImage(img7, size=img7.size)
-img8 = Image.open('Images/check.png')
-completed = ctk.CTkImage(img8, size=img8.size)
-img9 = Image.open('Images/cancel.png')
-cancelled = ctk.CTkImage(img9, size=img9.size)
-img10 = Image.open('Images/add.png')
-pending = ctk.CTkImage(img10, size=img10.size)
-img11 = Image.open('Images/latest.png')
-booking = ctk.CTkImage(img11, size=img11.size)
-img12 = Image.open('Images/doctor.png')
-doctor = ctk.CTkImage(img12, size=img12.size)
-img13 = Image.open('Images/admin appointment.png')
-adminAppointment = ctk.CTkImage(img13, size=img13.size)
-img14 = Image.open('Images/medical.png')
-adminPatients = ctk.CTkImage(img14, size=img14.size)
-img15 = Image.open('Images/admin calendar.png')
-adminCalendar = ctk.CTkImage(img15, size=img15.size)
-img16 = Image.open('Images/navigation doctor.png')
-navigationDoctor = ctk.CTkImage(img16, size=img16.size)
-img17 = Image.open('Images/Income.png')
-income = ctk.CTkImage(img17, size=img17.size)
-img18 = Image.open('Images/first-aid-kit.png')
-img19 = Image.open('Images/checklist.png')
-verify = ctk.CTkImage(img19, size=img19.size)
-img20 = Image.open('Images/close.png')
-xmark = ctk.CTkImage(img20, size=img20.size)
-dashDoctor = ctk.CTkImage(img18, size=img18.size)
-signup = ctk.CTkImage(light_image=Image.open("Images/createAccount.png"), size=(400, 550))
+icons = IconRegistry('Images')
 
 
 #Header
 header = ctk.CTkFrame(window,fg_color='white',height=100,width=width,corner_radius=0)
 header.pack(side='top')
 header.pack_propagate(False)
-ctk.CTkLabel(header,image=logo,text='',bg_color='white').pack(side='left',padx=(50,0))
+ctk.CTkLabel(header,image=icons.get("logo"),text='',bg_color='white').pack(side='left',padx=(50,0))
 adminLabel = ctk.CTkLabel(header, text='Admin', text_color='white',fg_color=color2, font=('Bahnschrift', 18, 'bold'),width=80,pady=10, corner_radius=5)
 doctorLabel = ctk.CTkLabel(header, text='Doctor', text_color='white',fg_color=color2, font=('Bahnschrift', 18, 'bold'),width=80,pady=10, corner_radius=5)
 
 #Home
-bannerImg = ctk.CTkLabel(window,text='', image=banner,bg_color=background)
+bannerImg = ctk.CTkLabel(window,text='', image=icons.get("banner"),bg_color=background)
 bannerImg.pack(pady='65')
 closeButton = ctk.CTkButton(
     header,
     text='',
-    image=xmark,
+    image=icons.get("xmark"),
     width=60,
     height=60,
     fg_color='white',
@@ -1579,7 +1537,7 @@ signupFrame.pack_propagate(False)
 signupImgFrame = ctk.CTkFrame(signupMainFrame, fg_color='black', width=400, height=520, corner_radius=20)
 signupImgFrame.pack(side='left', padx=(20, 0), pady=40)
 signupImgFrame.pack_propagate(False)
-ctk.CTkLabel(signupImgFrame, text='', image=signup).pack(expand=True)
+ctk.CTkLabel(signupImgFrame, text='', image=icons.get("signup", (400, 550))).pack(expand=True)
 ctk.CTkLabel(signupFrame, text='Create Account', font=('Bahnschrift', 30, 'bold'), text_color=color2, fg_color='white').grid(row=0, column=0, sticky='w', padx=40, pady=(20, 10))
 ctk.CTkLabel(signupFrame, text='Please sign up to book appointment', font=('Bahnschrift', 14), text_color=color2, fg_color='white').grid(row=1, column=0, sticky='w', padx=40, pady=(0, 15))
 nameEntry = signup_entry(2, "Full Name", "name")
@@ -1637,7 +1595,7 @@ loginFrame.grid_propagate(False)
 loginImgFrame = ctk.CTkFrame(loginMainFrame, fg_color='black', width=400, height=520, corner_radius=20)
 loginImgFrame.pack(side='left', padx=(20, 0), pady=40)
 loginImgFrame.pack_propagate(False)
-ctk.CTkLabel(loginImgFrame, text='', image=signup).pack(expand=True)
+ctk.CTkLabel(loginImgFrame, text='', image=icons.get("signup", (400, 550))).pack(expand=True)
 ctk.CTkLabel(loginFrame, text='Login', font=('Bahnschrift', 30, 'bold'), text_color=color2, fg_color='white').grid(row=0, column=0, sticky='w', padx=40, pady=(20, 10))
 ctk.CTkLabel(loginFrame, text='Please log in to book appointment', font=('Bahnschrift', 14), text_color=color2, fg_color='white').grid(row=1, column=0, sticky='w', padx=40, pady=(0, 15))
 ctk.CTkLabel(loginFrame, text='Email', font=('Bahnschrift', 14,'bold'), text_color=color2, fg_color='white').grid(row=2, column=0, sticky='w', padx=40)
@@ -1675,512 +1633,557 @@ signupButton2 = ctk.CTkButton(
 signupButton2.grid(row=7, column=0, sticky='e', padx=40)
 
 #User Navigation
-userMainFrame = ctk.CTkFrame(window, fg_color=background)
-userFrame = ctk.CTkFrame(userMainFrame,height=height,width=300,fg_color=color2,corner_radius=0)
-userFrame.pack(side='left', fill='y')
-userFrame.pack_propagate(False)
-userDashboardButton = ctk.CTkButton(
-    userFrame,
-    image=home,
-    text='Dashboard',
-    font=('Bahnschrift', 20, 'bold'),
-    compound='left',
-    anchor='w',
-    fg_color='white',
-    text_color='black',
-    corner_radius=5,
-    hover_color="#e0e0e0",
-    command=lambda: show_dashboard(None)
-)
-userDashboardButton.pack(side='top', fill='x', pady=(40, 15), padx=10)
-
-userAppointmentButton = ctk.CTkButton(
-    userFrame,
-    image=calendar,
-    text='Appointments',
-    font=('Bahnschrift', 20, 'bold'),
-    compound='left',
-    anchor='w',
-    fg_color='white',
-    text_color='black',
-    corner_radius=5,
-    hover_color="#e0e0e0",
-    command=lambda: show_appointment(None)
-)
-userAppointmentButton.pack(side='top', fill='x', pady=(0, 15), padx=10)
-
-userMakeAppointmentButton = ctk.CTkButton(
-    userFrame,
-    image=add,
-    text='Make an appointment',
-    font=('Bahnschrift', 20, 'bold'),
-    compound='left',
-    anchor='w',
-    fg_color='white',
-    text_color='black',
-    corner_radius=5,
-    hover_color="#e0e0e0",
-    command=lambda: show_make_appointment(None)
-)
-userMakeAppointmentButton.pack(side='top', fill='x', pady=(0, 15), padx=10)
-
-
-#User Dashboard
-userDashboardFrame = ctk.CTkFrame(userMainFrame, fg_color=background)
-userDashboardFrame.pack(side='left', fill='both', expand=True)
-statusFrame = ctk.CTkFrame(userDashboardFrame, fg_color=background)
-statusFrame.pack(side='top', fill='x', padx=20, pady=25)
-statusFrame.grid_columnconfigure((0, 1, 2), weight=1)
-completed_label = ctk.CTkLabel(statusFrame, image=completed, text='Completed: 0', font=('Bahnschrift', 16),
-                               compound='left', padx=15, pady=10, fg_color='white',
-                               text_color='black', corner_radius=10)
-completed_label.grid(row=0, column=0, padx=20, pady=5, sticky='ew')
-
-cancelled_label = ctk.CTkLabel(statusFrame, image=cancelled, text='Cancelled: 0', font=('Bahnschrift', 16),
-                               compound='left', padx=15, pady=10, fg_color='white',
-                               text_color='black', corner_radius=10)
-cancelled_label.grid(row=0, column=1, padx=20, pady=5, sticky='ew')
-
-ongoing_label = ctk.CTkLabel(statusFrame, image=pending, text='Ongoing: 0', font=('Bahnschrift', 16),
-                             compound='left', padx=15, pady=10, fg_color='white',
-                             text_color='black', corner_radius=10)
-ongoing_label.grid(row=0, column=2, padx=20, pady=5, sticky='ew')
-bookingMainFrame = ctk.CTkFrame(userDashboardFrame, fg_color='white',corner_radius=7)
-bookingMainFrame.pack(side='top', fill='both', expand=True, padx=20, pady=20)
-bookingMainFrame.pack_propagate(True)
-bookingHeader = ctk.CTkFrame(bookingMainFrame, height=100, fg_color=color2)
-bookingHeader.pack(side='top', fill='x')
-bookingHeader.pack_propagate(False)
-ctk.CTkLabel(bookingHeader,image=booking,text='Latest Bookings',fg_color=color2,text_color='white',font=('Bahnschrift',19,'bold'),compound='left',padx=10).pack(side='left',padx=45)
-bookingsFrame = ctk.CTkScrollableFrame(bookingMainFrame, fg_color='white',corner_radius=7)
-bookingsFrame.pack(side='top', fill='both', expand=True, padx=20, pady=20)
-bookingsFrame.pack_propagate(True)
-
-#User Appointment
-userAppointmentFrame = ctk.CTkFrame(userMainFrame,height=height,width=width,fg_color=background)
-userAppointmentLabelFrame = ctk.CTkFrame(userAppointmentFrame, fg_color=background)
-userAppointmentLabelFrame.pack(side='top', fill='x', padx=20, pady=(25, 0))
-ctk.CTkLabel(userAppointmentLabelFrame, text='All Appointments', font=('Bahnschrift', 20, 'bold'), pady=10, fg_color=background,text_color='black').pack(side='left')
-historyFrame = ctk.CTkFrame(userAppointmentFrame, fg_color='white',corner_radius=7)
-historyFrame.pack(side='top', fill='both', expand=True, padx=20, pady=(0, 20))
-historyFrame.pack_propagate(True)
-historyHeader = ctk.CTkFrame(historyFrame, height=40, fg_color=color2)
-historyHeader.pack(side='top', fill='x')
-historyHeader.pack_propagate(False)
-historyHeader.grid_columnconfigure(0, weight=1)
-historyHeader.grid_columnconfigure(1, weight=2)
-historyHeader.grid_columnconfigure(2, weight=3)
-historyHeader.grid_columnconfigure(3, weight=2)
-historyHeader.grid_columnconfigure(4, weight=2)
-ctk.CTkLabel(historyHeader, text='#', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=0, sticky='w', padx=10)
-ctk.CTkLabel(historyHeader, text='Date & Time', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=1, sticky='w', padx=(10,35))
-ctk.CTkLabel(historyHeader, text='Doctor', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=2, sticky='w', padx=10)
-ctk.CTkLabel(historyHeader, text='Fees', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=3, sticky='w', padx=(37,10))
-ctk.CTkLabel(historyHeader, text='Status', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=4, sticky='w', padx=(10,15))
-historyContent = ctk.CTkScrollableFrame(historyFrame, fg_color='white')
-historyContent.pack(fill='both', expand=True)
-historyContent.grid_columnconfigure(0, weight=1)
-historyContent.grid_columnconfigure(1, weight=2)
-historyContent.grid_columnconfigure(2, weight=3)
-historyContent.grid_columnconfigure(3, weight=2)
-historyContent.grid_columnconfigure(4, weight=2)
-
-#User Make an Appointment
-userMakeAppointmentFrame = ctk.CTkFrame(userMainFrame,height=height,width=width,fg_color=background)
-userMakeAppointmentLabelFrame = ctk.CTkFrame(userMakeAppointmentFrame, fg_color=background)
-userMakeAppointmentLabelFrame.pack(side='top', fill='x', padx=20, pady=(25, 0))
-doctor_labels = [
-    "General Physician",
-    "Gynecologist",
-    "Dermatologist",
-    "Pediatrician",
-    "Neurologist",
-    "Dentist"
-]
-doctor_frames = {}
-for i, label in enumerate(doctor_labels):
-    userMakeAppointmentLabelFrame.grid_columnconfigure(i, weight=1)
-    btn = ctk.CTkButton(
-        userMakeAppointmentLabelFrame,
-        text=label,
-        font=('Bahnschrift', 18, 'bold'),
+@metrics.timed()
+def build_user_view():
+    global userMainFrame, userDashboardFrame, userAppointmentFrame, userMakeAppointmentFrame
+    global userMakeAppointmentLabelFrame, completed_label, cancelled_label, ongoing_label, bookingsFrame
+    global user_bookings, historyContent, doctor_frames, searchEntry, search_ranges, availableOnlyVar
+    global searchResultsFrame, searchResultsLabel, searchResultsGrid
+    userMainFrame = ctk.CTkFrame(window, fg_color=background)
+    userFrame = ctk.CTkFrame(userMainFrame,height=height,width=300,fg_color=color2,corner_radius=0)
+    userFrame.pack(side='left', fill='y')
+    userFrame.pack_propagate(False)
+    userDashboardButton = ctk.CTkButton(
+        userFrame,
+        image=icons.get("home"),
+        text='Dashboard',
+        font=('Bahnschrift', 20, 'bold'),
+        compound='left',
+        anchor='w',
         fg_color='white',
-        text_color=color2,
+        text_color='black',
+        corner_radius=5,
         hover_color="#e0e0e0",
-        command=lambda l=label: show_frame(l)
+        command=lambda: show_dashboard(None)
     )
-    btn.grid(row=0, column=i, padx=5, pady=5, sticky='ew')
-specialties = {
-    "General Physician": "General Physicians",
-    "Gynecologist": "Gynecologists",
-    "Dermatologist": "Dermatologists",
-    "Pediatrician": "Pediatricians",
-    "Neurologist": "Neurologists",
-    "Dentist": "Dentist"
-}
+    userDashboardButton.pack(side='top', fill='x', pady=(40, 15), padx=10)
 
-for key, label_text in specialties.items():
-    frame = ctk.CTkFrame(userMakeAppointmentFrame, fg_color='white', height=height, width=width)
-    frame.pack_propagate(False)
-    header = ctk.CTkFrame(frame, height=50, fg_color=color2)
-    header.pack(side='top', fill='x')
-    header.pack_propagate(False)
-    ctk.CTkLabel(
-        header,
-        text=label_text,
+    userAppointmentButton = ctk.CTkButton(
+        userFrame,
+        image=icons.get("calendar"),
+        text='Appointments',
         font=('Bahnschrift', 20, 'bold'),
-        pady=10,
-        fg_color='transparent',
-        text_color='white'
-    ).pack(side='left', padx=50)
-    doctor_frames[key] = frame
-load_doctors_to_categories()
-show_frame("General Physician")
+        compound='left',
+        anchor='w',
+        fg_color='white',
+        text_color='black',
+        corner_radius=5,
+        hover_color="#e0e0e0",
+        command=lambda: show_appointment(None)
+    )
+    userAppointmentButton.pack(side='top', fill='x', pady=(0, 15), padx=10)
 
-#Admin Navigation
-adminMainFrame = ctk.CTkFrame(window, fg_color=background)
-adminFrame = ctk.CTkFrame(adminMainFrame,height=height,width=300,fg_color=color2,corner_radius=0)
-adminFrame.pack(side='left', fill='y')
-adminFrame.pack_propagate(False)
-adminDashboardButton = ctk.CTkButton(
-    adminFrame,
-    image=home,
-    text='Dashboard',
-    font=('Bahnschrift', 20, 'bold'),
-    compound='left',
-    anchor='w',
-    fg_color='white',
-    text_color='black',
-    corner_radius=5,
-    hover_color="#e0e0e0",
-    command=lambda: show_dashboard(None)
-)
-adminDashboardButton.pack(side='top', fill='x', pady=(40, 15), padx=10)
-
-adminAppointmentButton = ctk.CTkButton(
-    adminFrame,
-    image=calendar,
-    text='Appointments',
-    font=('Bahnschrift', 20, 'bold'),
-    compound='left',
-    anchor='w',
-    fg_color='white',
-    text_color='black',
-    corner_radius=5,
-    hover_color="#e0e0e0",
-    command=lambda: show_appointment(None)
-)
-adminAppointmentButton.pack(side='top', fill='x', pady=(0, 15), padx=10)
-
-adminMakeAppointmentButton = ctk.CTkButton(
-    adminFrame,
-    image=add,
-    text='Add Doctor',
-    font=('Bahnschrift', 20, 'bold'),
-    compound='left',
-    anchor='w',
-    fg_color='white',
-    text_color='black',
-    corner_radius=5,
-    hover_color="#e0e0e0",
-    command=lambda: show_make_appointment(None)
-)
-adminMakeAppointmentButton.pack(side='top', fill='x', pady=(0, 15), padx=10)
-
-adminMakeAppointmentButton = ctk.CTkButton(
-    adminFrame,
-    image=navigationDoctor,
-    text='Doctors List',
-    font=('Bahnschrift', 20, 'bold'),
-    compound='left',
-    anchor='w',
-    fg_color='white',
-    text_color='black',
-    corner_radius=5,
-    hover_color="#e0e0e0",
-    command=lambda: show_doctors_list(None)
-)
-adminMakeAppointmentButton.pack(side='top', fill='x', pady=(0, 15), padx=10)
-
-#Admin Dashboard
-adminDashboardFrame = ctk.CTkFrame(adminMainFrame, fg_color=background)
-adminDashboardFrame.pack(side='left', fill='both', expand=True)
-adminStatusFrame = ctk.CTkFrame(adminDashboardFrame, fg_color=background)
-adminStatusFrame.pack(side='top', fill='x', padx=20, pady=25)
-adminStatusFrame.grid_columnconfigure((0, 1, 2), weight=1)
-doctor_count_label = ctk.CTkLabel(adminStatusFrame, image=doctor, text='Doctors: 0', font=('Bahnschrift', 16),
-                                  compound='left', padx=15, pady=10, fg_color='white',
-                                  text_color='black', corner_radius=10)
-doctor_count_label.grid(row=0, column=0, padx=20, pady=5, sticky='ew')
-
-admin_ongoing_label = ctk.CTkLabel(adminStatusFrame, image=adminAppointment, text='Appointments: 0', font=('Bahnschrift', 16),
+    userMakeAppointmentButton = ctk.CTkButton(
+        userFrame,
+        image=icons.get("add"),
+        text='Make an appointment',
+        font=('Bahnschrift', 20, 'bold'),
+        compound='left',
+        anchor='w',
+        fg_color='white',
+        text_color='black',
+        corner_radius=5,
+        hover_color="#e0e0e0",
+        command=lambda: show_make_appointment(None)
+    )
+    userMakeAppointmentButton.pack(side='top', fill='x', pady=(0, 15), padx=10)
+
+
+    #User Dashboard
+    userDashboardFrame = ctk.CTkFrame(userMainFrame, fg_color=background)
+    userDashboardFrame.pack(side='left', fill='both', expand=True)
+    statusFrame = ctk.CTkFrame(userDashboardFrame, fg_color=background)
+    statusFrame.pack(side='top', fill='x', padx=20, pady=25)
+    statusFrame.grid_columnconfigure((0, 1, 2), weight=1)
+    completed_label = ctk.CTkLabel(statusFrame, image=icons.get("completed"), text='Completed: 0', font=('Bahnschrift', 16),
                                    compound='left', padx=15, pady=10, fg_color='white',
                                    text_color='black', corner_radius=10)
-admin_ongoing_label.grid(row=0, column=2, padx=20, pady=5, sticky='ew')
+    completed_label.grid(row=0, column=0, padx=20, pady=5, sticky='ew')
 
-patient_count_label = ctk.CTkLabel(adminStatusFrame, image=adminPatients, text='Patients: 0', font=('Bahnschrift', 16),
+    cancelled_label = ctk.CTkLabel(statusFrame, image=icons.get("cancelled"), text='Cancelled: 0', font=('Bahnschrift', 16),
                                    compound='left', padx=15, pady=10, fg_color='white',
                                    text_color='black', corner_radius=10)
-patient_count_label.grid(row=0, column=1, padx=20, pady=5, sticky='ew')
-
-adminBookingMainFrame = ctk.CTkFrame(adminDashboardFrame, fg_color='white',corner_radius=7)
-adminBookingMainFrame.pack(side='top', fill='both', expand=True, padx=20, pady=20)
-adminBookingMainFrame.pack_propagate(True)
-adminBookingHeader = ctk.CTkFrame(adminBookingMainFrame, height=100, fg_color=color2)
-adminBookingHeader.pack(side='top', fill='x')
-adminBookingHeader.pack_propagate(False)
-ctk.CTkLabel(adminBookingHeader,image=adminCalendar,text='Latest Bookings',fg_color=color2,text_color='white',font=('Bahnschrift',19,'bold'),compound='left',padx=10).pack(side='left',padx=45)
-adminBookingsFrame = ctk.CTkScrollableFrame(adminBookingMainFrame, fg_color='white',corner_radius=7)
-adminBookingsFrame.pack(side='top', fill='both', expand=True, padx=20, pady=20)
-adminBookingsFrame.pack_propagate(True)
-
-
-#Admin Appointment
-adminAppointmentFrame = ctk.CTkFrame(adminMainFrame,height=height,width=width,fg_color=background)
-adminAppointmentLabelFrame = ctk.CTkFrame(adminAppointmentFrame, fg_color=background)
-adminAppointmentLabelFrame.pack(side='top', fill='x', padx=20, pady=(25, 0))
-ctk.CTkLabel(adminAppointmentLabelFrame, text='All Appointments', font=('Bahnschrift', 20, 'bold'), pady=10, fg_color=background,text_color='black').pack(side='left')
-adminHistoryFrame = ctk.CTkFrame(adminAppointmentFrame, fg_color='white',corner_radius=7)
-adminHistoryFrame.pack(side='top', fill='both', expand=True, padx=20, pady=(0, 20))
-adminHistoryFrame.pack_propagate(True)
-adminHistoryHeader = ctk.CTkFrame(adminHistoryFrame, height=40, fg_color=color2)
-adminHistoryHeader.pack(side='top', fill='x')
-adminHistoryHeader.pack_propagate(False)
-adminHistoryHeader.grid_columnconfigure(0, weight=1)
-adminHistoryHeader.grid_columnconfigure(1, weight=3)
-adminHistoryHeader.grid_columnconfigure(2, weight=3)
-adminHistoryHeader.grid_columnconfigure(3, weight=3)
-adminHistoryHeader.grid_columnconfigure(4, weight=2)
-adminHistoryHeader.grid_columnconfigure(5, weight=2)
-ctk.CTkLabel(adminHistoryHeader, text='#', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=0, sticky='w', padx=10)
-ctk.CTkLabel(adminHistoryHeader, text='Patient', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=1, sticky='w', padx=(30,30))
-ctk.CTkLabel(adminHistoryHeader, text='Date & Time', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=2, sticky='w', padx=(50,10))
-ctk.CTkLabel(adminHistoryHeader, text='Doctor', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=3, sticky='w', padx=(35,35))
-ctk.CTkLabel(adminHistoryHeader, text='Fees', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=4, sticky='w', padx=10)
-ctk.CTkLabel(adminHistoryHeader, text='Status', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=5, sticky='w', padx=10)
-adminHistoryContent = ctk.CTkScrollableFrame(adminHistoryFrame, fg_color='white')
-adminHistoryContent.pack(fill='both', expand=True)
-adminHistoryContent.grid_columnconfigure(0, weight=1)
-adminHistoryContent.grid_columnconfigure(1, weight=3)
-adminHistoryContent.grid_columnconfigure(2, weight=3)
-adminHistoryContent.grid_columnconfigure(3, weight=3)
-adminHistoryContent.grid_columnconfigure(4, weight=2)
-adminHistoryContent.grid_columnconfigure(5, weight=2)
-
-
-#Admin Add Doctor
-adminAddDoctorFrame = ctk.CTkFrame(adminMainFrame,height=height,width=width,fg_color=background)
-adminAddDoctorLabelFrame = ctk.CTkFrame(adminAddDoctorFrame, fg_color=background)
-adminAddDoctorLabelFrame.pack(side='top', fill='x', padx=20, pady=(25, 0))
-ctk.CTkLabel(adminAddDoctorLabelFrame, text='Add Doctor', font=('Bahnschrift', 20, 'bold'), pady=10, fg_color=background,text_color='black').pack(side='left')
-scrollableFrame = ctk.CTkScrollableFrame(adminAddDoctorFrame, fg_color=color2)
-scrollableFrame.pack(padx=40, pady=30, fill='both', expand=True)
-scrollableFrame.grid_columnconfigure(0, weight=1)
-scrollableFrame.grid_columnconfigure(1, weight=1)
-image_label = ctk.CTkLabel(scrollableFrame, text="Click to upload image",width=230, height=300, fg_color='#E0E0E0', corner_radius=10,text_color='gray', font=('Bahnschrift', 14))
-image_label.pack(side='top',pady=10)
-image_label.bind("<Button-1>", lambda e: select_image())
-formRow = ctk.CTkFrame(scrollableFrame, fg_color=color2)
-formRow.pack(padx=40, fill='both', expand=True)
-leftColumn = ctk.CTkFrame(formRow, fg_color=color2)
-leftColumn.pack(side='left', expand=True, fill='both', padx=(0, 20))
-rightColumn = ctk.CTkFrame(formRow, fg_color=color2)
-rightColumn.pack(side='left', expand=True, fill='both')
-left_fields = [
-    ("Full Name", "Enter doctor's full name"),
-    ("Email", "Enter email address"),
-    ("Password", "Enter password"),
-    ("Fee", "1000")
-]
-right_fields = [
-    ("Specialty", "e.g., Cardiologist"),
-    ("Address", "Enter clinic address"),
-    ("Experience", "10"),
-]
-entries = {}
-for label, placeholder in left_fields:
-    ctk.CTkLabel(leftColumn, text=label, text_color='white',font=('Bahnschrift', 15, 'bold')).pack(anchor='w', pady=(10, 5))
-    if label.lower() == "fee":
-        vcmd = leftColumn.register(is_numeric)
-        doctor_entry = ctk.CTkEntry(
-            leftColumn,
-            placeholder_text=placeholder,
-            height=40,
-            corner_radius=8,
-            font=('Bahnschrift', 14),
-            validate="key",
-            validatecommand=(vcmd, '%P'),
-            fg_color='white',
-            text_color='black'
-        )
-    else:
-        doctor_entry = ctk.CTkEntry(
-            leftColumn,
-            placeholder_text=placeholder,
-            height=40,
-            corner_radius=8,
-            font=('Bahnschrift', 14),
-            fg_color='white',
-            text_color='black'
-        )
-    doctor_entry.pack(fill='x', pady=(0, 10))
-    entries[label] = doctor_entry
-
-for label, placeholder in right_fields:
-    ctk.CTkLabel(rightColumn, text=label, text_color='white',font=('Bahnschrift', 15, 'bold')).pack(anchor='w', pady=(10, 5))
-    if label == "Specialty":
-        doctor_entry = ctk.CTkComboBox(rightColumn,values=doctor_labels,font=('Bahnschrift', 14),height=40,corner_radius=8,state='readonly',fg_color='white',text_color='black',border_color='black')
-        doctor_entry.set("Select specialty")
-    elif label.lower() == "experience":
-        vcmd = rightColumn.register(is_numeric)
-        doctor_entry = ctk.CTkEntry(
-            rightColumn,
-            placeholder_text=placeholder,
-            height=40,
-            corner_radius=8,
-            font=('Bahnschrift', 14),
-            validate="key",
-            validatecommand=(vcmd, '%P'),
+    cancelled_label.grid(row=0, column=1, padx=20, pady=5, sticky='ew')
+
+    ongoing_label = ctk.CTkLabel(statusFrame, image=icons.get("pending"), text='Ongoing: 0', font=('Bahnschrift', 16),
+                                 compound='left', padx=15, pady=10, fg_color='white',
+                                 text_color='black', corner_radius=10)
+    ongoing_label.grid(row=0, column=2, padx=20, pady=5, sticky='ew')
+    bookingMainFrame = ctk.CTkFrame(userDashboardFrame, fg_color='white',corner_radius=7)
+    bookingMainFrame.pack(side='top', fill='both', expand=True, padx=20, pady=20)
+    bookingMainFrame.pack_propagate(True)
+    bookingHeader = ctk.CTkFrame(bookingMainFrame, height=100, fg_color=color2)
+    bookingHeader.pack(side='top', fill='x')
+    bookingHeader.pack_propagate(False)
+    ctk.CTkLabel(bookingHeader,image=icons.get("booking"),text='Latest Bookings',fg_color=color2,text_color='white',font=('Bahnschrift',19,'bold'),compound='left',padx=10).pack(side='left',padx=45)
+    bookingsFrame = ctk.CTkScrollableFrame(bookingMainFrame, fg_color='white',corner_radius=7)
+    bookingsFrame.pack(side='top', fill='both', expand=True, padx=20, pady=20)
+    bookingsFrame.pack_propagate(True)
+    user_bookings = BookingPager(bookingsFrame, add_user_booking_card)
+
+    #User Appointment
+    userAppointmentFrame = ctk.CTkFrame(userMainFrame,height=height,width=width,fg_color=background)
+    userAppointmentLabelFrame = ctk.CTkFrame(userAppointmentFrame, fg_color=background)
+    userAppointmentLabelFrame.pack(side='top', fill='x', padx=20, pady=(25, 0))
+    ctk.CTkLabel(userAppointmentLabelFrame, text='All Appointments', font=('Bahnschrift', 20, 'bold'), pady=10, fg_color=background,text_color='black').pack(side='left')
+    historyFrame = ctk.CTkFrame(userAppointmentFrame, fg_color='white',corner_radius=7)
+    historyFrame.pack(side='top', fill='both', expand=True, padx=20, pady=(0, 20))
+    historyFrame.pack_propagate(True)
+    historyHeader = ctk.CTkFrame(historyFrame, height=40, fg_color=color2)
+    historyHeader.pack(side='top', fill='x')
+    historyHeader.pack_propagate(False)
+    historyHeader.grid_columnconfigure(0, weight=1)
+    historyHeader.grid_columnconfigure(1, weight=2)
+    historyHeader.grid_columnconfigure(2, weight=3)
+    historyHeader.grid_columnconfigure(3, weight=2)
+    historyHeader.grid_columnconfigure(4, weight=2)
+    ctk.CTkLabel(historyHeader, text='#', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=0, sticky='w', padx=10)
+    ctk.CTkLabel(historyHeader, text='Date & Time', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=1, sticky='w', padx=(10,35))
+    ctk.CTkLabel(historyHeader, text='Doctor', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=2, sticky='w', padx=10)
+    ctk.CTkLabel(historyHeader, text='Fees', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=3, sticky='w', padx=(37,10))
+    ctk.CTkLabel(historyHeader, text='Status', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=4, sticky='w', padx=(10,15))
+    historyContent = HistoryTable(historyFrame, weights=[1, 2, 3, 2, 2])
+    historyContent.pack(fill='both', expand=True)
+
+    #User Make an Appointment
+    userMakeAppointmentFrame = ctk.CTkFrame(userMainFrame,height=height,width=width,fg_color=background)
+    userMakeAppointmentLabelFrame = ctk.CTkFrame(userMakeAppointmentFrame, fg_color=background)
+    userMakeAppointmentLabelFrame.pack(side='top', fill='x', padx=20, pady=(25, 0))
+    doctor_frames = {}
+    for i, label in enumerate(doctor_labels):
+        userMakeAppointmentLabelFrame.grid_columnconfigure(i, weight=1)
+        btn = ctk.CTkButton(
+            userMakeAppointmentLabelFrame,
+            text=label,
+            font=('Bahnschrift', 18, 'bold'),
             fg_color='white',
-            text_color='black'
+            text_color=color2,
+            hover_color="#e0e0e0",
+            command=lambda l=label: select_specialty(l)
         )
-    else:
-        doctor_entry = ctk.CTkEntry(rightColumn,placeholder_text=placeholder,height=40, corner_radius=8,font=('Bahnschrift', 14),fg_color='white',text_color='black')
-    doctor_entry.pack(fill='x', pady=(0, 10))
-    entries[label] = doctor_entry
-
-bottomSection = ctk.CTkFrame(scrollableFrame, fg_color=color2)
-bottomSection.pack(fill='x', padx=40, pady=(0, 20))
-
-ctk.CTkLabel(bottomSection, text="About Doctor", text_color='white',
-             font=('Bahnschrift', 15, 'bold')).pack(anchor='w', pady=(10, 5))
-
-about_textbox = ctk.CTkTextbox(bottomSection, height=100, corner_radius=10,
-                               font=('Bahnschrift', 14), wrap='word', fg_color='white',text_color='black')
-about_textbox.pack(fill='x')
-
-submit_btn = ctk.CTkButton(bottomSection, text='Add Doctor',
-                           height=60, font=('Bahnschrift', 20, 'bold'),
-                           corner_radius=10, fg_color='white',text_color=color2,hover_color='#e0e0e0',
-                           command=save_doctor
-                           )
-submit_btn.pack(pady=20,fill='x')
-
-#Doctors List
-adminDoctorListFrame = ctk.CTkFrame(adminMainFrame,height=height,width=width,fg_color=background)
-adminDoctorHeader = ctk.CTkFrame(adminDoctorListFrame, height=50, fg_color=color2)
-adminDoctorHeader.pack(side='top', fill='x', padx=20, pady=(20, 0))
-adminDoctorHeader.pack_propagate(False)
-ctk.CTkLabel(adminDoctorHeader, text='Doctors List', font=('Bahnschrift', 20, 'bold'), pady=10, fg_color='transparent', text_color='white').pack(side='left', padx=50)
-remove_btn = ctk.CTkButton(adminDoctorHeader, text="Remove", fg_color="red", hover_color="#cc0000", width=90,
-                            font=('Bahnschrift', 14), command=remove_selected_doctor)
-remove_btn.pack(side='right', padx=(5, 10))
-
-unavail_btn = ctk.CTkButton(adminDoctorHeader, text="Unavailable", fg_color="orange", width=100,
-                             font=('Bahnschrift', 14), command=lambda: update_doctor_status("Unavailable"))
-unavail_btn.pack(side='right', padx=(5, 10))
-
-avail_btn = ctk.CTkButton(adminDoctorHeader, text="Available", fg_color="green", width=90,
-                           font=('Bahnschrift', 14), command=lambda: update_doctor_status("Available"))
-avail_btn.pack(side='right', padx=(5, 10))
-adminDoctorFrame = ctk.CTkScrollableFrame(adminDoctorListFrame, width=width, height=height-60, fg_color='transparent')
-adminDoctorFrame.pack(side='top', fill='both', expand=True, padx=20, pady=(10, 20))
-load_doctors(adminDoctorFrame,force_refresh=True)
+        btn.grid(row=0, column=i, padx=5, pady=5, sticky='ew')
+    searchBar = ctk.CTkFrame(userMakeAppointmentLabelFrame, fg_color='white', corner_radius=10)
+    searchBar.grid(row=1, column=0, columnspan=len(doctor_labels), padx=5, pady=5, sticky='ew')
+    searchEntry = ctk.CTkEntry(searchBar, placeholder_text='Search by name, specialty or about', width=380, height=36,
+                               font=('Bahnschrift', 14), fg_color='white', text_color='black')
+    searchEntry.pack(side='left', padx=10, pady=10)
+    searchEntry.bind('<KeyRelease>', lambda e: run_search())
+    search_ranges = {}
+    for field in ("Fee", "Experience"):
+        ctk.CTkLabel(searchBar, text=field, font=('Bahnschrift', 14, 'bold'), text_color=color2).pack(side='left', padx=(15, 5))
+        for bound in ("Min", "Max"):
+            vcmd = searchBar.register(is_numeric)
+            range_entry = ctk.CTkEntry(searchBar, placeholder_text=bound, width=70, height=36, font=('Bahnschrift', 14),
+                                       validate="key", validatecommand=(vcmd, '%P'), fg_color='white', text_color='black')
+            range_entry.pack(side='left', padx=2)
+            range_entry.bind('<KeyRelease>', lambda e: run_search())
+            search_ranges[(field, bound)] = range_entry
+    availableOnlyVar = ctk.BooleanVar(value=False)
+    ctk.CTkCheckBox(searchBar, text='Available only', variable=availableOnlyVar, command=run_search,
+                    font=('Bahnschrift', 14), text_color=color2).pack(side='left', padx=15)
+    ctk.CTkButton(searchBar, text='Clear', width=80, height=36, font=('Bahnschrift', 14, 'bold'), fg_color=color2,
+                  text_color='white', command=clear_search).pack(side='left', padx=5)
+    specialties = {
+        "General Physician": "General Physicians",
+        "Gynecologist": "Gynecologists",
+        "Dermatologist": "Dermatologists",
+        "Pediatrician": "Pediatricians",
+        "Neurologist": "Neurologists",
+        "Dentist": "Dentist"
+    }
+
+    for key, label_text in specialties.items():
+        frame = ctk.CTkFrame(userMakeAppointmentFrame, fg_color='white', height=height, width=width)
+        frame.pack_propagate(False)
+        header = ctk.CTkFrame(frame, height=50, fg_color=color2)
+        header.pack(side='top', fill='x')
+        header.pack_propagate(False)
+        ctk.CTkLabel(
+            header,
+            text=label_text,
+            font=('Bahnschrift', 20, 'bold'),
+            pady=10,
+            fg_color='transparent',
+            text_color='white'
+        ).pack(side='left', padx=50)
+        doctor_frames[key] = frame
+    searchResultsFrame = ctk.CTkFrame(userMakeAppointmentFrame, fg_color='white', height=height, width=width)
+    searchResultsFrame.pack_propagate(False)
+    searchResultsHeader = ctk.CTkFrame(searchResultsFrame, height=50, fg_color=color2)
+    searchResultsHeader.pack(side='top', fill='x')
+    searchResultsHeader.pack_propagate(False)
+    searchResultsLabel = ctk.CTkLabel(searchResultsHeader, text='Search Results', font=('Bahnschrift', 20, 'bold'),
+                                      pady=10, fg_color='transparent', text_color='white')
+    searchResultsLabel.pack(side='left', padx=50)
+    searchResultsGrid = ctk.CTkScrollableFrame(searchResultsFrame, fg_color='white')
+    searchResultsGrid.pack(fill='both', expand=True)
+    show_frame("General Physician")
+    role_main_frames["User"] = userMainFrame
+    role_pages["User"] = {"dashboard": userDashboardFrame, "appointments": userAppointmentFrame,
+                          "make": userMakeAppointmentFrame}
+
+#Admin Navigation
+@metrics.timed()
+def build_admin_view():
+    global adminMainFrame, adminDashboardFrame, adminAppointmentFrame, adminAddDoctorFrame
+    global adminDoctorListFrame, doctor_count_label, admin_ongoing_label, patient_count_label
+    global adminBookingsFrame, admin_bookings, adminHistoryContent, image_label, entries, about_textbox
+    global submit_btn, adminDoctorFrame
+    adminMainFrame = ctk.CTkFrame(window, fg_color=background)
+    adminFrame = ctk.CTkFrame(adminMainFrame,height=height,width=300,fg_color=color2,corner_radius=0)
+    adminFrame.pack(side='left', fill='y')
+    adminFrame.pack_propagate(False)
+    adminDashboardButton = ctk.CTkButton(
+        adminFrame,
+        image=icons.get("home"),
+        text='Dashboard',
+        font=('Bahnschrift', 20, 'bold'),
+        compound='left',
+        anchor='w',
+        fg_color='white',
+        text_color='black',
+        corner_radius=5,
+        hover_color="#e0e0e0",
+        command=lambda: show_dashboard(None)
+    )
+    adminDashboardButton.pack(side='top', fill='x', pady=(40, 15), padx=10)
+
+    adminAppointmentButton = ctk.CTkButton(
+        adminFrame,
+        image=icons.get("calendar"),
+        text='Appointments',
+        font=('Bahnschrift', 20, 'bold'),
+        compound='left',
+        anchor='w',
+        fg_color='white',
+        text_color='black',
+        corner_radius=5,
+        hover_color="#e0e0e0",
+        command=lambda: show_appointment(None)
+    )
+    adminAppointmentButton.pack(side='top', fill='x', pady=(0, 15), padx=10)
+
+    adminMakeAppointmentButton = ctk.CTkButton(
+        adminFrame,
+        image=icons.get("add"),
+        text='Add Doctor',
+        font=('Bahnschrift', 20, 'bold'),
+        compound='left',
+        anchor='w',
+        fg_color='white',
+        text_color='black',
+        corner_radius=5,
+        hover_color="#e0e0e0",
+        command=lambda: show_make_appointment(None)
+    )
+    adminMakeAppointmentButton.pack(side='top', fill='x', pady=(0, 15), padx=10)
+
+    adminMakeAppointmentButton = ctk.CTkButton(
+        adminFrame,
+        image=icons.get("navigationDoctor"),
+        text='Doctors List',
+        font=('Bahnschrift', 20, 'bold'),
+        compound='left',
+        anchor='w',
+        fg_color='white',
+        text_color='black',
+        corner_radius=5,
+        hover_color="#e0e0e0",
+        command=lambda: show_doctors_list(None)
+    )
+    adminMakeAppointmentButton.pack(side='top', fill='x', pady=(0, 15), padx=10)
+
+    #Admin Dashboard
+    adminDashboardFrame = ctk.CTkFrame(adminMainFrame, fg_color=background)
+    adminDashboardFrame.pack(side='left', fill='both', expand=True)
+    adminStatusFrame = ctk.CTkFrame(adminDashboardFrame, fg_color=background)
+    adminStatusFrame.pack(side='top', fill='x', padx=20, pady=25)
+    adminStatusFrame.grid_columnconfigure((0, 1, 2), weight=1)
+    doctor_count_label = ctk.CTkLabel(adminStatusFrame, image=icons.get("doctor"), text='Doctors: 0', font=('Bahnschrift', 16),
+                                      compound='left', padx=15, pady=10, fg_color='white',
+                                      text_color='black', corner_radius=10)
+    doctor_count_label.grid(row=0, column=0, padx=20, pady=5, sticky='ew')
+
+    admin_ongoing_label = ctk.CTkLabel(adminStatusFrame, image=icons.get("adminAppointment"), text='Appointments: 0', font=('Bahnschrift', 16),
+                                       compound='left', padx=15, pady=10, fg_color='white',
+                                       text_color='black', corner_radius=10)
+    admin_ongoing_label.grid(row=0, column=2, padx=20, pady=5, sticky='ew')
+
+    patient_count_label = ctk.CTkLabel(adminStatusFrame, image=icons.get("adminPatients"), text='Patients: 0', font=('Bahnschrift', 16),
+                                       compound='left', padx=15, pady=10, fg_color='white',
+                                       text_color='black', corner_radius=10)
+    patient_count_label.grid(row=0, column=1, padx=20, pady=5, sticky='ew')
+
+    adminBookingMainFrame = ctk.CTkFrame(adminDashboardFrame, fg_color='white',corner_radius=7)
+    adminBookingMainFrame.pack(side='top', fill='both', expand=True, padx=20, pady=20)
+    adminBookingMainFrame.pack_propagate(True)
+    adminBookingHeader = ctk.CTkFrame(adminBookingMainFrame, height=100, fg_color=color2)
+    adminBookingHeader.pack(side='top', fill='x')
+    adminBookingHeader.pack_propagate(False)
+    ctk.CTkLabel(adminBookingHeader,image=icons.get("adminCalendar"),text='Latest Bookings',fg_color=color2,text_color='white',font=('Bahnschrift',19,'bold'),compound='left',padx=10).pack(side='left',padx=45)
+    adminBookingsFrame = ctk.CTkScrollableFrame(adminBookingMainFrame, fg_color='white',corner_radius=7)
+    adminBookingsFrame.pack(side='top', fill='both', expand=True, padx=20, pady=20)
+    adminBookingsFrame.pack_propagate(True)
+    admin_bookings = BookingPager(adminBookingsFrame, add_admin_booking_card)
+
+
+    #Admin Appointment
+    adminAppointmentFrame = ctk.CTkFrame(adminMainFrame,height=height,width=width,fg_color=background)
+    adminAppointmentLabelFrame = ctk.CTkFrame(adminAppointmentFrame, fg_color=background)
+    adminAppointmentLabelFrame.pack(side='top', fill='x', padx=20, pady=(25, 0))
+    ctk.CTkLabel(adminAppointmentLabelFrame, text='All Appointments', font=('Bahnschrift', 20, 'bold'), pady=10, fg_color=background,text_color='black').pack(side='left')
+    adminHistoryFrame = ctk.CTkFrame(adminAppointmentFrame, fg_color='white',corner_radius=7)
+    adminHistoryFrame.pack(side='top', fill='both', expand=True, padx=20, pady=(0, 20))
+    adminHistoryFrame.pack_propagate(True)
+    adminHistoryHeader = ctk.CTkFrame(adminHistoryFrame, height=40, fg_color=color2)
+    adminHistoryHeader.pack(side='top', fill='x')
+    adminHistoryHeader.pack_propagate(False)
+    adminHistoryHeader.grid_columnconfigure(0, weight=1)
+    adminHistoryHeader.grid_columnconfigure(1, weight=3)
+    adminHistoryHeader.grid_columnconfigure(2, weight=3)
+    adminHistoryHeader.grid_columnconfigure(3, weight=3)
+    adminHistoryHeader.grid_columnconfigure(4, weight=2)
+    adminHistoryHeader.grid_columnconfigure(5, weight=2)
+    ctk.CTkLabel(adminHistoryHeader, text='#', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=0, sticky='w', padx=10)
+    ctk.CTkLabel(adminHistoryHeader, text='Patient', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=1, sticky='w', padx=(30,30))
+    ctk.CTkLabel(adminHistoryHeader, text='Date & Time', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=2, sticky='w', padx=(50,10))
+    ctk.CTkLabel(adminHistoryHeader, text='Doctor', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=3, sticky='w', padx=(35,35))
+    ctk.CTkLabel(adminHistoryHeader, text='Fees', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=4, sticky='w', padx=10)
+    ctk.CTkLabel(adminHistoryHeader, text='Status', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=5, sticky='w', padx=10)
+    adminHistoryContent = HistoryTable(adminHistoryFrame, weights=[1, 3, 3, 3, 2, 2])
+    adminHistoryContent.pack(fill='both', expand=True)
+
+
+    #Admin Add Doctor
+    adminAddDoctorFrame = ctk.CTkFrame(adminMainFrame,height=height,width=width,fg_color=background)
+    adminAddDoctorLabelFrame = ctk.CTkFrame(adminAddDoctorFrame, fg_color=background)
+    adminAddDoctorLabelFrame.pack(side='top', fill='x', padx=20, pady=(25, 0))
+    ctk.CTkLabel(adminAddDoctorLabelFrame, text='Add Doctor', font=('Bahnschrift', 20, 'bold'), pady=10, fg_color=background,text_color='black').pack(side='left')
+    scrollableFrame = ctk.CTkScrollableFrame(adminAddDoctorFrame, fg_color=color2)
+    scrollableFrame.pack(padx=40, pady=30, fill='both', expand=True)
+    scrollableFrame.grid_columnconfigure(0, weight=1)
+    scrollableFrame.grid_columnconfigure(1, weight=1)
+    image_label = ctk.CTkLabel(scrollableFrame, text="Click to upload image",width=230, height=300, fg_color='#E0E0E0', corner_radius=10,text_color='gray', font=('Bahnschrift', 14))
+    image_label.pack(side='top',pady=10)
+    image_label.bind("<Button-1>", lambda e: select_image())
+    formRow = ctk.CTkFrame(scrollableFrame, fg_color=color2)
+    formRow.pack(padx=40, fill='both', expand=True)
+    leftColumn = ctk.CTkFrame(formRow, fg_color=color2)
+    leftColumn.pack(side='left', expand=True, fill='both', padx=(0, 20))
+    rightColumn = ctk.CTkFrame(formRow, fg_color=color2)
+    rightColumn.pack(side='left', expand=True, fill='both')
+    left_fields = [
+        ("Full Name", "Enter doctor's full name"),
+        ("Email", "Enter email address"),
+        ("Password", "Enter password"),
+        ("Fee", "1000")
+    ]
+    right_fields = [
+        ("Specialty", "e.g., Cardiologist"),
+        ("Address", "Enter clinic address"),
+        ("Experience", "10"),
+    ]
+    entries = {}
+    for label, placeholder in left_fields:
+        ctk.CTkLabel(leftColumn, text=label, text_color='white',font=('Bahnschrift', 15, 'bold')).pack(anchor='w', pady=(10, 5))
+        if label.lower() == "fee":
+            vcmd = leftColumn.register(is_numeric)
+            doctor_entry = ctk.CTkEntry(
+                leftColumn,
+                placeholder_text=placeholder,
+                height=40,
+                corner_radius=8,
+                font=('Bahnschrift', 14),
+                validate="key",
+                validatecommand=(vcmd, '%P'),
+                fg_color='white',
+                text_color='black'
+            )
+        else:
+            doctor_entry = ctk.CTkEntry(
+                leftColumn,
+                placeholder_text=placeholder,
+                height=40,
+                corner_radius=8,
+                font=('Bahnschrift', 14),
+                fg_color='white',
+                text_color='black'
+            )
+        doctor_entry.pack(fill='x', pady=(0, 10))
+        entries[label] = doctor_entry
+
+    for label, placeholder in right_fields:
+        ctk.CTkLabel(rightColumn, text=label, text_color='white',font=('Bahnschrift', 15, 'bold')).pack(anchor='w', pady=(10, 5))
+        if label == "Specialty":
+            doctor_entry = ctk.CTkComboBox(rightColumn,values=doctor_labels,font=('Bahnschrift', 14),height=40,corner_radius=8,state='readonly',fg_color='white',text_color='black',border_color='black')
+            doctor_entry.set("Select specialty")
+        elif label.lower() == "experience":
+            vcmd = rightColumn.register(is_numeric)
+            doctor_entry = ctk.CTkEntry(
+                rightColumn,
+                placeholder_text=placeholder,
+                height=40,
+                corner_radius=8,
+                font=('Bahnschrift', 14),
+                validate="key",
+                validatecommand=(vcmd, '%P'),
+                fg_color='white',
+                text_color='black'
+            )
+        else:
+            doctor_entry = ctk.CTkEntry(rightColumn,placeholder_text=placeholder,height=40, corner_radius=8,font=('Bahnschrift', 14),fg_color='white',text_color='black')
+        doctor_entry.pack(fill='x', pady=(0, 10))
+        entries[label] = doctor_entry
+
+    bottomSection = ctk.CTkFrame(scrollableFrame, fg_color=color2)
+    bottomSection.pack(fill='x', padx=40, pady=(0, 20))
+
+    ctk.CTkLabel(bottomSection, text="About Doctor", text_color='white',
+                 font=('Bahnschrift', 15, 'bold')).pack(anchor='w', pady=(10, 5))
+
+    about_textbox = ctk.CTkTextbox(bottomSection, height=100, corner_radius=10,
+                                   font=('Bahnschrift', 14), wrap='word', fg_color='white',text_color='black')
+    about_textbox.pack(fill='x')
+
+    submit_btn = ctk.CTkButton(bottomSection, text='Add Doctor',
+                               height=60, font=('Bahnschrift', 20, 'bold'),
+                               corner_radius=10, fg_color='white',text_color=color2,hover_color='#e0e0e0',
+                               command=save_doctor
+                               )
+    submit_btn.pack(pady=20,fill='x')
+
+    #Doctors List
+    adminDoctorListFrame = ctk.CTkFrame(adminMainFrame,height=height,width=width,fg_color=background)
+    adminDoctorHeader = ctk.CTkFrame(adminDoctorListFrame, height=50, fg_color=color2)
+    adminDoctorHeader.pack(side='top', fill='x', padx=20, pady=(20, 0))
+    adminDoctorHeader.pack_propagate(False)
+    ctk.CTkLabel(adminDoctorHeader, text='Doctors List', font=('Bahnschrift', 20, 'bold'), pady=10, fg_color='transparent', text_color='white').pack(side='left', padx=50)
+    remove_btn = ctk.CTkButton(adminDoctorHeader, text="Remove", fg_color="red", hover_color="#cc0000", width=90,
+                                font=('Bahnschrift', 14), command=remove_selected_doctor)
+    remove_btn.pack(side='right', padx=(5, 10))
+
+    unavail_btn = ctk.CTkButton(adminDoctorHeader, text="Unavailable", fg_color="orange", width=100,
+                                 font=('Bahnschrift', 14), command=lambda: update_doctor_status("Unavailable"))
+    unavail_btn.pack(side='right', padx=(5, 10))
+
+    avail_btn = ctk.CTkButton(adminDoctorHeader, text="Available", fg_color="green", width=90,
+                               font=('Bahnschrift', 14), command=lambda: update_doctor_status("Available"))
+    avail_btn.pack(side='right', padx=(5, 10))
+    adminDoctorFrame = ctk.CTkScrollableFrame(adminDoctorListFrame, width=width, height=height-60, fg_color='transparent')
+    adminDoctorFrame.pack(side='top', fill='both', expand=True, padx=20, pady=(10, 20))
+    role_main_frames["Admin"] = adminMainFrame
+    role_pages["Admin"] = {"dashboard": adminDashboardFrame, "appointments": adminAppointmentFrame,
+                           "make": adminAddDoctorFrame, "doctors": adminDoctorListFrame}
 
 #Doctor Navigation
-doctorMainFrame = ctk.CTkFrame(window, fg_color=background)
-doctorFrame = ctk.CTkFrame(doctorMainFrame,height=height,width=300,fg_color=color2,corner_radius=0)
-doctorFrame.pack(side='left', fill='y')
-doctorFrame.pack_propagate(False)
-doctorDashboardButton = ctk.CTkButton(
-    doctorFrame,
-    image=home,
-    text='Dashboard',
-    font=('Bahnschrift', 20, 'bold'),
-    compound='left',
-    anchor='w',
-    fg_color='white',
-    text_color='black',
-    corner_radius=5,
-    hover_color="#e0e0e0",
-    command=lambda: show_dashboard(None)
-)
-doctorDashboardButton.pack(side='top', fill='x', pady=(40, 15), padx=10)
-
-doctorAppointmentButton = ctk.CTkButton(
-    doctorFrame,
-    image=calendar,
-    text='Appointments',
-    font=('Bahnschrift', 20, 'bold'),
-    compound='left',
-    anchor='w',
-    fg_color='white',
-    text_color='black',
-    corner_radius=5,
-    hover_color="#e0e0e0",
-    command=lambda: show_appointment(None)
-)
-doctorAppointmentButton.pack(side='top', fill='x', pady=(0, 15), padx=10)
-
-#Doctor Dashboard
-doctorDashboardFrame = ctk.CTkFrame(doctorMainFrame, fg_color=background)
-doctorDashboardFrame.pack(side='left', fill='both', expand=True)
-doctorStatusFrame = ctk.CTkFrame(doctorDashboardFrame, fg_color=background)
-doctorStatusFrame.pack(side='top', fill='x', padx=20, pady=25)
-doctorStatusFrame.grid_columnconfigure((0, 1, 2), weight=1)
-doctor_income_label = ctk.CTkLabel(doctorStatusFrame, image=income, text='Income: 0', font=('Bahnschrift', 16),
-                                  compound='left', padx=15, pady=10, fg_color='white',
-                                  text_color='black', corner_radius=10)
-doctor_income_label.grid(row=0, column=0, padx=20, pady=5, sticky='ew')
-
-doctor_appointments_label = ctk.CTkLabel(doctorStatusFrame, image=adminAppointment, text='Appointments: 0', font=('Bahnschrift', 16),
-                                   compound='left', padx=15, pady=10, fg_color='white',
-                                   text_color='black', corner_radius=10)
-doctor_appointments_label.grid(row=0, column=2, padx=20, pady=5, sticky='ew')
+@metrics.timed()
+def build_doctor_view():
+    global doctorMainFrame, doctorDashboardFrame, doctorAppointmentFrame, doctor_income_label
+    global doctor_patient_label, doctor_appointments_label, doctorBookingsFrame, doctor_bookings
+    global doctorHistoryContent
+    doctorMainFrame = ctk.CTkFrame(window, fg_color=background)
+    doctorFrame = ctk.CTkFrame(doctorMainFrame,height=height,width=300,fg_color=color2,corner_radius=0)
+    doctorFrame.pack(side='left', fill='y')
+    doctorFrame.pack_propagate(False)
+    doctorDashboardButton = ctk.CTkButton(
+        doctorFrame,
+        image=icons.get("home"),
+        text='Dashboard',
+        font=('Bahnschrift', 20, 'bold'),
+        compound='left',
+        anchor='w',
+        fg_color='white',
+        text_color='black',
+        corner_radius=5,
+        hover_color="#e0e0e0",
+        command=lambda: show_dashboard(None)
+    )
+    doctorDashboardButton.pack(side='top', fill='x', pady=(40, 15), padx=10)
 
-doctor_patient_label = ctk.CTkLabel(doctorStatusFrame, image=adminPatients, text='Patients: 0', font=('Bahnschrift', 16),
-                                   compound='left', padx=15, pady=10, fg_color='white',
-                                   text_color='black', corner_radius=10)
-doctor_patient_label.grid(row=0, column=1, padx=20, pady=5, sticky='ew')
-doctorBookingMainFrame = ctk.CTkFrame(doctorDashboardFrame, fg_color='white',corner_radius=7)
-doctorBookingMainFrame.pack(side='top', fill='both', expand=True, padx=20, pady=20)
-doctorBookingMainFrame.pack_propagate(True)
-doctorBookingHeader = ctk.CTkFrame(doctorBookingMainFrame, height=100, fg_color=color2)
-doctorBookingHeader.pack(side='top', fill='x')
-doctorBookingHeader.pack_propagate(False)
-ctk.CTkLabel(doctorBookingHeader,image=dashDoctor,text='Latest Bookings',fg_color=color2,text_color='white',font=('Bahnschrift',19,'bold'),compound='left',padx=10).pack(side='left',padx=45)
-doctorBookingsFrame = ctk.CTkScrollableFrame(doctorBookingMainFrame, fg_color='white',corner_radius=7)
-doctorBookingsFrame.pack(side='top', fill='both', expand=True, padx=20, pady=20)
-doctorBookingsFrame.pack_propagate(True)
-
-#Doctor Appointments
-doctorAppointmentFrame = ctk.CTkFrame(doctorMainFrame,height=height,width=width,fg_color=background)
-doctorAppointmentLabelFrame = ctk.CTkFrame(doctorAppointmentFrame, fg_color=background)
-doctorAppointmentLabelFrame.pack(side='top', fill='x', padx=20, pady=(25, 0))
-ctk.CTkLabel(doctorAppointmentLabelFrame, text='All Appointments', font=('Bahnschrift', 20, 'bold'), pady=10, fg_color=background,text_color='black').pack(side='left')
-doctorHistoryFrame = ctk.CTkFrame(doctorAppointmentFrame, fg_color='white',corner_radius=7)
-doctorHistoryFrame.pack(side='top', fill='both', expand=True, padx=20, pady=(0, 20))
-doctorHistoryFrame.pack_propagate(True)
-doctorHistoryHeader = ctk.CTkFrame(doctorHistoryFrame, height=40, fg_color=color2)
-doctorHistoryHeader.pack(side='top', fill='x')
-doctorHistoryHeader.pack_propagate(False)
-doctorHistoryHeader.grid_columnconfigure(0, weight=1)
-doctorHistoryHeader.grid_columnconfigure(1, weight=3)
-doctorHistoryHeader.grid_columnconfigure(2, weight=3)
-doctorHistoryHeader.grid_columnconfigure(3, weight=2)
-doctorHistoryHeader.grid_columnconfigure(4, weight=2)
-ctk.CTkLabel(doctorHistoryHeader, text='#', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=0, sticky='w', padx=10)
-ctk.CTkLabel(doctorHistoryHeader, text='Patient', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=1, sticky='w', padx=10)
-ctk.CTkLabel(doctorHistoryHeader, text='Date & Time', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=2, sticky='w', padx=(44,10))
-ctk.CTkLabel(doctorHistoryHeader, text='Fees', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=3, sticky='w', padx=0)
-ctk.CTkLabel(doctorHistoryHeader, text='Status', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=4, sticky='w', padx=(0,10))
-doctorHistoryContent = ctk.CTkScrollableFrame(doctorHistoryFrame, fg_color='white')
-doctorHistoryContent.pack(fill='both', expand=True)
-doctorHistoryContent.grid_columnconfigure(0, weight=1)
-doctorHistoryContent.grid_columnconfigure(1, weight=3)
-doctorHistoryContent.grid_columnconfigure(2, weight=3)
-doctorHistoryContent.grid_columnconfigure(3, weight=2)
-doctorHistoryContent.grid_columnconfigure(4, weight=2)
+    doctorAppointmentButton = ctk.CTkButton(
+        doctorFrame,
+        image=icons.get("calendar"),
+        text='Appointments',
+        font=('Bahnschrift', 20, 'bold'),
+        compound='left',
+        anchor='w',
+        fg_color='white',
+        text_color='black',
+        corner_radius=5,
+        hover_color="#e0e0e0",
+        command=lambda: show_appointment(None)
+    )
+    doctorAppointmentButton.pack(side='top', fill='x', pady=(0, 15), padx=10)
+
+    #Doctor Dashboard
+    doctorDashboardFrame = ctk.CTkFrame(doctorMainFrame, fg_color=background)
+    doctorDashboardFrame.pack(side='left', fill='both', expand=True)
+    doctorStatusFrame = ctk.CTkFrame(doctorDashboardFrame, fg_color=background)
+    doctorStatusFrame.pack(side='top', fill='x', padx=20, pady=25)
+    doctorStatusFrame.grid_columnconfigure((0, 1, 2), weight=1)
+    doctor_income_label = ctk.CTkLabel(doctorStatusFrame, image=icons.get("income"), text='Income: 0', font=('Bahnschrift', 16),
+                                      compound='left', padx=15, pady=10, fg_color='white',
+                                      text_color='black', corner_radius=10)
+    doctor_income_label.grid(row=0, column=0, padx=20, pady=5, sticky='ew')
+
+    doctor_appointments_label = ctk.CTkLabel(doctorStatusFrame, image=icons.get("adminAppointment"), text='Appointments: 0', font=('Bahnschrift', 16),
+                                       compound='left', padx=15, pady=10, fg_color='white',
+                                       text_color='black', corner_radius=10)
+    doctor_appointments_label.grid(row=0, column=2, padx=20, pady=5, sticky='ew')
+
+    doctor_patient_label = ctk.CTkLabel(doctorStatusFrame, image=icons.get("adminPatients"), text='Patients: 0', font=('Bahnschrift', 16),
+                                       compound='left', padx=15, pady=10, fg_color='white',
+                                       text_color='black', corner_radius=10)
+    doctor_patient_label.grid(row=0, column=1, padx=20, pady=5, sticky='ew')
+    doctorBookingMainFrame = ctk.CTkFrame(doctorDashboardFrame, fg_color='white',corner_radius=7)
+    doctorBookingMainFrame.pack(side='top', fill='both', expand=True, padx=20, pady=20)
+    doctorBookingMainFrame.pack_propagate(True)
+    doctorBookingHeader = ctk.CTkFrame(doctorBookingMainFrame, height=100, fg_color=color2)
+    doctorBookingHeader.pack(side='top', fill='x')
+    doctorBookingHeader.pack_propagate(False)
+    ctk.CTkLabel(doctorBookingHeader,image=icons.get("dashDoctor"),text='Latest Bookings',fg_color=color2,text_color='white',font=('Bahnschrift',19,'bold'),compound='left',padx=10).pack(side='left',padx=45)
+    doctorBookingsFrame = ctk.CTkScrollableFrame(doctorBookingMainFrame, fg_color='white',corner_radius=7)
+    doctorBookingsFrame.pack(side='top', fill='both', expand=True, padx=20, pady=20)
+    doctorBookingsFrame.pack_propagate(True)
+    doctor_bookings = BookingPager(doctorBookingsFrame, add_doctor_booking_card)
+
+    #Doctor Appointments
+    doctorAppointmentFrame = ctk.CTkFrame(doctorMainFrame,height=height,width=width,fg_color=background)
+    doctorAppointmentLabelFrame = ctk.CTkFrame(doctorAppointmentFrame, fg_color=background)
+    doctorAppointmentLabelFrame.pack(side='top', fill='x', padx=20, pady=(25, 0))
+    ctk.CTkLabel(doctorAppointmentLabelFrame, text='All Appointments', font=('Bahnschrift', 20, 'bold'), pady=10, fg_color=background,text_color='black').pack(side='left')
+    doctorHistoryFrame = ctk.CTkFrame(doctorAppointmentFrame, fg_color='white',corner_radius=7)
+    doctorHistoryFrame.pack(side='top', fill='both', expand=True, padx=20, pady=(0, 20))
+    doctorHistoryFrame.pack_propagate(True)
+    doctorHistoryHeader = ctk.CTkFrame(doctorHistoryFrame, height=40, fg_color=color2)
+    doctorHistoryHeader.pack(side='top', fill='x')
+    doctorHistoryHeader.pack_propagate(False)
+    doctorHistoryHeader.grid_columnconfigure(0, weight=1)
+    doctorHistoryHeader.grid_columnconfigure(1, weight=3)
+    doctorHistoryHeader.grid_columnconfigure(2, weight=3)
+    doctorHistoryHeader.grid_columnconfigure(3, weight=2)
+    doctorHistoryHeader.grid_columnconfigure(4, weight=2)
+    ctk.CTkLabel(doctorHistoryHeader, text='#', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=0, sticky='w', padx=10)
+    ctk.CTkLabel(doctorHistoryHeader, text='Patient', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=1, sticky='w', padx=10)
+    ctk.CTkLabel(doctorHistoryHeader, text='Date & Time', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=2, sticky='w', padx=(44,10))
+    ctk.CTkLabel(doctorHistoryHeader, text='Fees', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=3, sticky='w', padx=0)
+    ctk.CTkLabel(doctorHistoryHeader, text='Status', fg_color=color2, text_color='white', font=('Bahnschrift', 15, 'bold')).grid(row=0, column=4, sticky='w', padx=(0,10))
+    doctorHistoryContent = HistoryTable(doctorHistoryFrame, weights=[1, 3, 3, 2, 2])
+    doctorHistoryContent.pack(fill='both', expand=True)
+    role_main_frames["Doctor"] = doctorMainFrame
+    role_pages["Doctor"] = {"dashboard": doctorDashboardFrame, "appointments": doctorAppointmentFrame}
+
+role_builders = {
+    "User": build_user_view,
+    "Admin": build_admin_view,
+    "Doctor": build_doctor_view
+}
+page_loaders = {
+    ("User", "make"): load_doctors_to_categories,
+    ("Admin", "doctors"): lambda: load_doctors(adminDoctorFrame, force_refresh=True)
+}
+
+start_data_open()
 
 try:
     window.mainloop()
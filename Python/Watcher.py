@@ -0,0 +1,143 @@
+import ctypes
+import ctypes.util
+import os
+import sys
+import tkinter as tk
+
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+def _load_inotify(widget):
+    if not sys.platform.startswith('linux') or not hasattr(widget.tk, 'createfilehandler'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class DataWatcher:
+    def __init__(self, widget, accounts, callback, executor, interval=2000, debounce=150, slow_interval=15000):
+        self.widget = widget
+        self.accounts = accounts
+        self.callback = callback
+        self.executor = executor
+        self.interval = interval
+        self.debounce = debounce
+        self.slow_interval = slow_interval
+        self.stamps = None
+        self.fd = None
+        self.libc = None
+        self.pending = None
+        self.timer = None
+        self.running = False
+        self.scanning = False
+        self.rescan = False
+
+    def start(self):
+        self.running = True
+        self.libc = _load_inotify(self.widget)
+
+        if self.libc is not None:
+            self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if self.fd >= 0:
+                self.widget.tk.createfilehandler(self.fd, tk.READABLE, self._on_readable)
+                self._check()
+                return
+            self.fd = None
+
+        self._poll()
+
+    def stop(self):
+        self.running = False
+        if self.pending is not None:
+            self.widget.after_cancel(self.pending)
+            self.pending = None
+        if self.timer is not None:
+            self.widget.after_cancel(self.timer)
+            self.timer = None
+        if self.fd is not None:
+            self.widget.tk.deletefilehandler(self.fd)
+            os.close(self.fd)
+            self.fd = None
+
+    def sync(self):
+        # Changes this client made itself are taken as the new baseline, not reported.
+        self.stamps = None
+        self._check()
+
+    def _add_watches(self):
+        for path in self.accounts.watch_paths():
+            self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+
+    def _scan(self):
+        # Runs on the IO executor; on a network share each stat can take milliseconds.
+        if self.fd is not None:
+            self._add_watches()
+        return self.accounts.doctor_stamps()
+
+    def _on_readable(self, fd, mask):
+        try:
+            while os.read(fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+        # Writers touch several files per change, so coalesce bursts into one diff.
+        if self.pending is None:
+            self.pending = self.widget.after(self.debounce, self._debounced)
+
+    def _debounced(self):
+        self.pending = None
+        self._check()
+
+    def _poll(self):
+        self.timer = None
+        self._check()
+
+    def _check(self):
+        if self.scanning:
+            self.rescan = True
+            return
+        self.scanning = True
+        self.executor.submit(self._scan, on_done=self._compare, on_error=self._scan_failed)
+
+    def _scan_failed(self, error):
+        print(f"Failed to scan doctor folders: {error}")
+        self._scanned()
+
+    def _scanned(self):
+        self.scanning = False
+        if self.rescan:
+            self.rescan = False
+            self._check()
+        elif self.running and self.timer is None:
+            # inotify misses writes other hosts make on NFS/SMB shares, so a slower poll keeps running beside it.
+            self.timer = self.widget.after(self.interval if self.fd is None else self.slow_interval, self._poll)
+
+    def _compare(self, stamps):
+        previous, self.stamps = self.stamps, stamps
+
+        events = []
+        if previous is not None:
+            for folder, stamp in stamps.items():
+                if folder not in previous:
+                    events.append(("added", folder))
+                elif previous[folder] != stamp:
+                    events.append(("updated", folder))
+            for folder in previous:
+                if folder not in stamps:
+                    events.append(("removed", folder))
+
+        self._scanned()
+        if events:
+            self.callback(events)
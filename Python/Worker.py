@@ -0,0 +1,62 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class IOExecutor:
+    def __init__(self, widget, max_workers=4, interval=30):
+        self.widget = widget
+        self.interval = interval
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='data-io')
+        self.results = queue.Queue()
+        self.main_thread = threading.current_thread()
+        self.outstanding = 0
+        self.pending = None
+
+    def submit(self, func, *args, on_done=None, on_error=None, **kwargs):
+        future = self.pool.submit(func, *args, **kwargs)
+        self.outstanding += 1
+        future.add_done_callback(lambda f: self.results.put((self._finish, (f, on_done, on_error))))
+        self._schedule()
+        return future
+
+    def call_soon(self, func, *args):
+        if threading.current_thread() is self.main_thread:
+            func(*args)
+        else:
+            # Tk is not thread-safe; workers only enqueue and the main loop drains.
+            self.results.put((func, args))
+
+    def shutdown(self):
+        if self.pending is not None:
+            self.widget.after_cancel(self.pending)
+            self.pending = None
+        self.pool.shutdown(wait=False)
+
+    def _schedule(self):
+        if self.pending is None and (self.outstanding or not self.results.empty()):
+            self.pending = self.widget.after(self.interval, self._drain)
+
+    def _drain(self):
+        self.pending = None
+        while True:
+            try:
+                func, args = self.results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"Background callback {getattr(func, '__name__', func)} failed: {e}")
+        self._schedule()
+
+    def _finish(self, future, on_done, on_error):
+        self.outstanding -= 1
+        error = future.exception()
+        if error is not None:
+            if on_error is None:
+                print(f"Background task failed: {error}")
+            else:
+                on_error(error)
+        elif on_done is not None:
+            on_done(future.result())
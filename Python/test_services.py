@@ -0,0 +1,285 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+import Journal
+from Events import BOOKED, CANCELLED, COMPLETED, EventBus
+from Reservations import SlotConflict
+from Services import DuplicateAccount, InvalidInput, open_services
+from Storage import StatusConflict, open_storage
+
+BACKENDS = ("json", "log", "sqlite")
+PASSWORD = "Secret1!"
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for folder in ("Users", "Admins", "Doctors", "Appointments"):
+        (tmp_path / folder).mkdir()
+    return str(tmp_path)
+
+
+def open_client(backend, data_dir, bus=None):
+    return open_services(*open_storage(backend, data_dir, bus), os.path.join(data_dir, 'Doctors'))
+
+
+def doctor_fields(name, email, fee="500", experience="5", specialty="Dentist"):
+    return {"Full Name": name, "Email": email, "Password": PASSWORD, "Experience": experience, "Fee": fee,
+            "Specialty": specialty, "Address": "N/A", "About": f"{specialty} care."}
+
+
+def tomorrow():
+    return (datetime.now() + timedelta(days=1)).date().isoformat()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_signup_and_login(backend, data_dir):
+    accounts, _, _ = open_client(backend, data_dir)
+    accounts.signup("Ana", "Ana@Example.com", "0917", PASSWORD, "User")
+
+    role, data = accounts.login("ana@example.com", PASSWORD)
+    assert role == "User"
+    assert data["Full Name"] == "Ana"
+    assert accounts.count("User") == 1
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_signup_rejects_duplicate_email(backend, data_dir):
+    accounts, _, _ = open_client(backend, data_dir)
+    accounts.signup("Ana", "ana@example.com", "0917", PASSWORD, "User")
+
+    with pytest.raises(DuplicateAccount):
+        accounts.signup("Ana Again", "ANA@example.com", "0917", PASSWORD, "Admin")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_signup_rejects_duplicate_from_other_client(backend, data_dir):
+    first, _, _ = open_client(backend, data_dir)
+    second, _, _ = open_client(backend, data_dir)
+    first.signup("Ana", "ana@example.com", "0917", PASSWORD, "User")
+
+    with pytest.raises(DuplicateAccount):
+        second.signup("Ana", "ana@example.com", "0917", PASSWORD, "User")
+    assert second.count("User") == 1
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_doctor_edit_keeps_other_clients_accounts(backend, data_dir):
+    first, doctors, _ = open_client(backend, data_dir)
+    doctors.add(doctor_fields("Dr. Eric Cruz", "eric@example.com"))
+    second, _, _ = open_client(backend, data_dir)
+    second.signup("Ben", "ben@example.com", "0917", PASSWORD, "User")
+
+    doctors.set_availability(["eric@example.com"], "Unavailable")
+    with pytest.raises(DuplicateAccount):
+        first.signup("Impostor", "ben@example.com", "0917", PASSWORD, "User")
+    fresh, _, _ = open_client(backend, data_dir)
+    with pytest.raises(DuplicateAccount):
+        fresh.signup("Impostor", "ben@example.com", "0917", PASSWORD, "User")
+    assert first.login("ben@example.com", PASSWORD)[1]["Full Name"] == "Ben"
+
+
+def test_signup_never_replaces_account_file(data_dir, monkeypatch):
+    accounts, _, _ = open_client("json", data_dir)
+    accounts.signup("Ben", "ben@example.com", "0917", PASSWORD, "User")
+
+    monkeypatch.setattr(accounts.accounts, "email_exists", lambda email: False)
+    with pytest.raises(DuplicateAccount):
+        accounts.signup("Impostor", "ben@example.com", "0917", PASSWORD, "User")
+    assert accounts.login("ben@example.com", PASSWORD)[1]["Full Name"] == "Ben"
+
+
+def test_signup_rejects_weak_password(data_dir):
+    accounts, _, _ = open_client("json", data_dir)
+    with pytest.raises(InvalidInput):
+        accounts.signup("Ana", "ana@example.com", "0917", "password", "User")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_booking_conflict(backend, data_dir):
+    _, _, appointments = open_client(backend, data_dir)
+    _, _, other = open_client(backend, data_dir)
+    profile = {"Full Name": "Dr. Cruz", "Fee": "500"}
+    day = tomorrow()
+    appointments.book(profile, "ana@example.com", day, ["9:00 AM"])
+
+    with pytest.raises(SlotConflict):
+        appointments.book(profile, "ben@example.com", day, ["9:00 AM", "10:00 AM"])
+    with pytest.raises(SlotConflict):
+        other.book(profile, "ben@example.com", day, ["9:00 AM"])
+    other.book(profile, "ben@example.com", day, ["10:00 AM"])
+
+
+def test_booking_rejects_past_date(data_dir):
+    _, _, appointments = open_client("json", data_dir)
+    yesterday = (datetime.now() - timedelta(days=1)).date().isoformat()
+    with pytest.raises(InvalidInput):
+        appointments.book({"Full Name": "Dr. Cruz"}, "ana@example.com", yesterday, ["9:00 AM"])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_cancel_frees_slot(backend, data_dir):
+    _, _, appointments = open_client(backend, data_dir)
+    profile = {"Full Name": "Dr. Cruz", "Fee": "500"}
+    day = tomorrow()
+    appointment_id = appointments.book(profile, "ana@example.com", day, ["9:00 AM"])
+
+    appointments.cancel(appointment_id)
+    assert appointments.ongoing_count() == 0
+    with pytest.raises(StatusConflict):
+        appointments.complete(appointment_id)
+    appointments.book(profile, "ben@example.com", day, ["9:00 AM"])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_complete_conflicts_with_other_client(backend, data_dir):
+    _, _, appointments = open_client(backend, data_dir)
+    profile = {"Full Name": "Dr. Cruz", "Fee": "500"}
+    appointment_id = appointments.book(profile, "ana@example.com", tomorrow(), ["9:00 AM"])
+    _, _, other = open_client(backend, data_dir)
+
+    appointments.complete(appointment_id)
+    with pytest.raises(StatusConflict):
+        other.cancel(appointment_id)
+    assert appointments.user_counts("ana@example.com") == [1, 0, 0]
+    assert appointments.doctor_totals("Dr. Cruz")[0] == 500
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_refresh_publishes_other_clients_changes(backend, data_dir):
+    events = []
+    bus = EventBus()
+    bus.subscribe(lambda event: events.append((event.kind, event.appointment_id, event.record["status"])))
+    _, _, appointments = open_client(backend, data_dir, bus)
+    _, _, other = open_client(backend, data_dir)
+    profile = {"Full Name": "Dr. Cruz", "Fee": "500"}
+    day = tomorrow()
+    first = other.book(profile, "ana@example.com", day, ["9:00 AM"])
+    second = other.book(profile, "ben@example.com", day, ["10:00 AM"])
+
+    assert set(appointments.refresh()) == {first, second}
+    other.cancel(first)
+    appointments.complete(second)
+    assert set(appointments.refresh()) == {first}
+    assert appointments.refresh() == {}
+    assert events == [(BOOKED, first, "Ongoing"), (BOOKED, second, "Ongoing"),
+                      (COMPLETED, second, "Completed"), (CANCELLED, first, "Cancelled")]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_sweep_completes_started_bookings(backend, data_dir):
+    _, _, appointments = open_client(backend, data_dir)
+    profile = {"Full Name": "Dr. Cruz", "Fee": "500"}
+    day = tomorrow()
+    early = appointments.book(profile, "ana@example.com", day, ["9:00 AM"])
+    late = appointments.book(profile, "ben@example.com", day, ["3:00 PM"])
+
+    noon = datetime.strptime(day, "%Y-%m-%d").replace(hour=12)
+    assert appointments.sweep(noon) == [early]
+    assert appointments.sweep(noon) == []
+    assert [appointment_id for appointment_id, _ in appointments.ongoing_page()] == [late]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_search_filters(backend, data_dir):
+    _, doctors, _ = open_client(backend, data_dir)
+    doctors.add(doctor_fields("Dr. Angela Reyes", "angela@example.com", fee="650", experience="5"))
+    doctors.add(doctor_fields("Dr. Eric Cruz", "eric@example.com", fee="900", experience="12",
+                              specialty="Cardiologist"))
+    doctors.add(doctor_fields("Dr. Mia Santos", "mia@example.com", fee="400", experience="3"))
+    doctors.set_availability(["mia@example.com"], "Unavailable")
+
+    listed, index = doctors.read_directory()
+    assert len(listed) == 3
+    assert index.search() == ["angela@example.com", "eric@example.com"]
+    assert index.search("dent") == ["angela@example.com"]
+    assert index.search(fee=(700, None)) == ["eric@example.com"]
+    assert index.search(experience=(None, 10)) == ["angela@example.com"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_add_doctor_rejects_duplicate(backend, data_dir):
+    _, doctors, _ = open_client(backend, data_dir)
+    doctors.add(doctor_fields("Dr. Eric Cruz", "eric@example.com"))
+
+    with pytest.raises(DuplicateAccount):
+        doctors.add(doctor_fields("Dr. Eric Cruz", "other@example.com"))
+    with pytest.raises(DuplicateAccount):
+        doctors.add(doctor_fields("Dr. Someone Else", "ERIC@example.com"))
+
+
+def test_add_doctor_reports_thumbnail_failure(data_dir, tmp_path):
+    _, doctors, _ = open_client("json", data_dir)
+    image_path = tmp_path / "portrait.png"
+    image_path.write_text("not an image")
+
+    has_image, thumbnail_error = doctors.add(doctor_fields("Dr. Eric Cruz", "eric@example.com"), str(image_path))
+    assert has_image
+    assert thumbnail_error is not None
+    assert os.path.exists(os.path.join(data_dir, "Doctors", "eric@example.com", "portrait.png"))
+
+
+@pytest.mark.parametrize("backend", ("json", "log"))
+def test_journal_recovers_committed_write(backend, data_dir, monkeypatch):
+    _, doctors, _ = open_client(backend, data_dir)
+
+    def crash(ops):
+        raise KeyboardInterrupt
+
+    # Stop after the committed record is written but before any file is moved into place.
+    with monkeypatch.context() as patch:
+        patch.setattr(Journal, "_apply", crash)
+        with pytest.raises(KeyboardInterrupt):
+            doctors.add(doctor_fields("Dr. Eric Cruz", "eric@example.com"))
+
+    journal_dir = os.path.join(data_dir, ".journal")
+    records = [os.path.join(journal_dir, name) for name in os.listdir(journal_dir)]
+    assert len(records) == 1
+    with open(records[0]) as f:
+        assert json.load(f)["state"] == "committed"
+    profile_path = os.path.join(data_dir, "Doctors", "eric@example.com", "profile.json")
+    assert not os.path.exists(profile_path)
+
+    stale = datetime.now().timestamp() - 60
+    os.utime(records[0], (stale, stale))
+    _, doctors, _ = open_client(backend, data_dir)
+    assert os.listdir(journal_dir) == []
+    assert os.path.exists(profile_path)
+    listed, _ = doctors.read_directory()
+    assert [folder for folder, _, _, _ in listed] == ["eric@example.com"]
+
+
+def test_log_survives_failed_compaction(data_dir, monkeypatch):
+    _, _, appointments = open_client("log", data_dir)
+    profile = {"Full Name": "Dr. Cruz", "Fee": "500"}
+    day = tomorrow()
+    appointments.book(profile, "ana@example.com", day, ["9:00 AM"])
+
+    def refuse(src, dst):
+        raise PermissionError(dst)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "replace", refuse)
+        appointments.store.backend.compact()
+    appointments.book(profile, "ben@example.com", day, ["10:00 AM"])
+
+    _, _, fresh = open_client("log", data_dir)
+    assert fresh.ongoing_count() == 2
+    assert not os.path.exists(os.path.join(data_dir, "appointments.jsonl.compact"))
+
+
+def test_status_change_saves_schedule_fields(data_dir):
+    legacy = {"doctor": "Dr. Cruz", "user": "ana@example.com", "date": tomorrow(), "time": ["9:00 AM"],
+              "fee": "500", "status": "Ongoing"}
+    with open(os.path.join(data_dir, "Appointments", "appointment1.json"), "w") as f:
+        json.dump(legacy, f)
+    _, _, appointments = open_client("json", data_dir)
+
+    appointments.cancel("appointment1")
+    with open(os.path.join(data_dir, "Appointments", "appointment1.json")) as f:
+        saved = json.load(f)
+    assert saved["status"] == "Cancelled"
+    assert saved["slots"] == [1]
+    assert {"day", "expires"} <= set(saved)